@@ -0,0 +1,69 @@
+"""Benchmark: bulk random-combo generation.
+
+Usage:
+    uv run python benchmarks/bench_combos.py [--combos N] [--black N] [--white N]
+
+Generates N combinations from a temporary deck with the old approach
+(random.choice/random.sample over a fully loaded deck) and with
+ComboEngine, with and without shuffle bags.
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from cah import db  # noqa: E402
+from cah.combos import ComboEngine  # noqa: E402
+from cah.models import Card, CardType  # noqa: E402
+
+
+def legacy(deck, count: int) -> int:
+    """The previous per-combo sampling over Card lists."""
+    total = 0
+    for _ in range(count):
+        black_card = random.choice(deck.black_cards)
+        white_cards = random.sample(deck.white_cards, min(black_card.pick, len(deck.white_cards)))
+        total += len(white_cards)
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--combos", type=int, default=1_000_000)
+    parser.add_argument("--black", type=int, default=2_000)
+    parser.add_argument("--white", type=int, default=10_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_PATH = Path(tmp) / "bench.db"
+        db.init_db()
+        deck_id = db.create_deck("Bench", "BENCH")
+        db.bulk_add_cards(deck_id, (
+            Card(f"Black {i} _____" + (" and _____" if i % 8 == 0 else ""),
+                 CardType.BLACK, 2 if i % 8 == 0 else 1)
+            for i in range(args.black)
+        ))
+        db.bulk_add_cards(deck_id, (Card(f"White {i}", CardType.WHITE) for i in range(args.white)))
+
+        start = time.perf_counter()
+        deck = db.get_deck(deck_id)
+        legacy(deck, args.combos)
+        print(f"{'legacy (load + sample)':<28} {time.perf_counter() - start:7.2f} s")
+
+        for label, no_repeats in (("ComboEngine (shuffle bags)", True),
+                                  ("ComboEngine (independent)", False)):
+            start = time.perf_counter()
+            engine = ComboEngine.from_db(deck_id, seed=1, no_repeats=no_repeats)
+            batch = engine.generate(args.combos)
+            print(f"{label:<28} {time.perf_counter() - start:7.2f} s ({len(batch)} combos)")
+
+        db.close_pool()
+
+
+if __name__ == "__main__":
+    main()
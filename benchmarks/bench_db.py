@@ -0,0 +1,113 @@
+"""Benchmark: per-call connections vs. the pooled connection layer.
+
+Usage:
+    uv run python benchmarks/bench_db.py [--ops N] [--bulk N] [--bulk-budget S]
+
+Runs add_card, get_card and list_decks against a temporary database,
+first with the old connect-per-call ``db_cursor`` and then with the
+pooled one, and prints ops/sec for both. Finally times a bulk import
+through bulk_add_cards (cards, full-text index and counts) against a
+budget.
+"""
+
+import argparse
+import sqlite3
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from cah import db  # noqa: E402
+from cah.models import Card, CardType  # noqa: E402
+
+pooled_cursor = db.db_cursor
+
+
+@contextmanager
+def legacy_cursor():
+    """The original db_cursor: one connection and one commit per call."""
+    conn = sqlite3.connect(db.DB_PATH)
+    conn.row_factory = sqlite3.Row
+    try:
+        cursor = conn.cursor()
+        yield cursor
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def timed(label: str, ops: int, fn) -> float:
+    start = time.perf_counter()
+    for i in range(ops):
+        fn(i)
+    elapsed = time.perf_counter() - start
+    rate = ops / elapsed
+    print(f"  {label:<12} {rate:>12,.0f} ops/sec")
+    return rate
+
+
+def run(mode: str, cursor_factory, ops: int, workdir: Path) -> dict:
+    db.close_pool()
+    db.DB_PATH = workdir / f"{mode}.db"
+    db.db_cursor = cursor_factory
+    db.init_db()
+    deck_id = db.create_deck("Bench", "BENCH")
+
+    print(f"\n{mode}:")
+    card_ids = []
+    results = {
+        "add_card": timed(
+            "add_card", ops,
+            lambda i: card_ids.append(db.add_card(deck_id, f"Card {i}", CardType.WHITE))
+        ),
+        "get_card": timed("get_card", ops, lambda i: db.get_card(card_ids[i])),
+        "list_decks": timed("list_decks", ops, lambda i: db.list_decks()),
+    }
+    db.db_cursor = pooled_cursor
+    db.close_pool()
+    return results
+
+
+def run_bulk(count: int, workdir: Path, budget: float):
+    db.DB_PATH = workdir / "bulk.db"
+    db.init_db()
+    deck_id = db.create_deck("Bulk", "BULK")
+
+    cards = (Card(text=f"Card {i}", card_type=CardType.WHITE) for i in range(count))
+    start = time.perf_counter()
+    card_ids = db.bulk_add_cards(deck_id, cards)
+    elapsed = time.perf_counter() - start
+    db.close_pool()
+
+    status = "ok" if elapsed <= budget else "OVER BUDGET"
+    print(f"\nbulk_add_cards: {len(card_ids):,} cards in {elapsed:.3f}s "
+          f"({len(card_ids) / elapsed:,.0f} cards/sec, budget {budget:.1f}s) {status}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ops", type=int, default=5000)
+    parser.add_argument("--bulk", type=int, default=50000)
+    parser.add_argument("--bulk-budget", type=float, default=1.0,
+                        help="Budget for the bulk import, in seconds")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        before = run("before (connect per call)", legacy_cursor, args.ops, Path(tmp))
+        after = run("after (pooled)", pooled_cursor, args.ops, Path(tmp))
+
+        print("\nspeedup:")
+        for name in before:
+            print(f"  {name:<12} {after[name] / before[name]:>11.1f}x")
+
+        run_bulk(args.bulk, Path(tmp), args.bulk_budget)
+
+
+if __name__ == "__main__":
+    main()
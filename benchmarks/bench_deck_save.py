@@ -0,0 +1,76 @@
+"""Benchmark: saving a large file deck after small changes.
+
+Usage:
+    uv run python benchmarks/bench_deck_save.py [--cards N] [--saves N]
+
+Builds a deck of N cards (default 100,000), then adds one card and saves
+it --saves times (default 50), once with a full rewrite (Deck.save) and
+once through the deck journal (decks.save_deck). Prints time per save,
+bytes written, and the time to load the journaled deck.
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from cah import decks  # noqa: E402
+from cah.models import Card, CardType, Deck, DeckConfig  # noqa: E402
+
+
+def make_deck(count: int) -> Deck:
+    deck = Deck(config=DeckConfig(name="Benchmark", short_name="BENCH"))
+    for i in range(count):
+        if i % 4 == 0:
+            deck.add_card(Card(f"Question {i}: what ruined _____ this time?", CardType.BLACK, pick=1 + i % 3))
+        else:
+            deck.add_card(Card(f"Answer {i}, a surprisingly long white card text", CardType.WHITE))
+    return deck
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, default=100_000)
+    parser.add_argument("--saves", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{args.cards:,} cards, {args.saves} saves of one added card each\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+
+        deck = make_deck(args.cards)
+        path = tmp / "full.json"
+        start = time.perf_counter()
+        for i in range(args.saves):
+            deck.add_card(Card(f"New card {i}", CardType.WHITE))
+            deck.save(path)
+        elapsed = time.perf_counter() - start
+        written = path.stat().st_size * args.saves
+        print(f"  full rewrite  {elapsed / args.saves * 1000:>8.1f} ms/save  {written / 1e3:>10,.0f} kB written")
+
+        deck = make_deck(args.cards)
+        path = decks.save_deck(deck, "journal", tmp)
+        start = time.perf_counter()
+        for i in range(args.saves):
+            deck.add_card(Card(f"New card {i}", CardType.WHITE))
+            decks.save_deck(deck, "journal", tmp)
+        elapsed = time.perf_counter() - start
+        decks.wait_for_compactions()
+        written = decks.journal_path(path).stat().st_size
+        print(f"  journal       {elapsed / args.saves * 1000:>8.1f} ms/save  {written / 1e3:>10,.0f} kB written")
+
+        # A new process has no saved state: load() reads and replays
+        decks._journals.clear()
+        start = time.perf_counter()
+        loaded = decks.load_deck("journal", tmp)
+        elapsed = time.perf_counter() - start
+        assert loaded.total_cards == deck.total_cards
+        print(f"  load + replay {elapsed * 1000:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Benchmark: near-duplicate search on random and templated card texts.
+
+Usage:
+    uv run python benchmarks/bench_dedupe.py [--cards N]
+
+Fills a temporary deck with N cards (default 100,000) per case and times
+find_near_duplicates. Every 100th card is a reworded copy of the one
+before it, so each case also has near duplicates to find. "templated"
+texts differ only in a number ("Card text number 123"), as generated
+packs often do, which piles most texts into the same LSH buckets.
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from cah import db  # noqa: E402
+from cah.dedupe import find_near_duplicates  # noqa: E402
+from cah.models import Card, CardType  # noqa: E402
+
+
+def random_text(rng: random.Random, i: int) -> str:
+    return " ".join("".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=rng.randint(2, 9)))
+                    for _ in range(rng.randint(4, 9)))
+
+
+def templated_text(rng: random.Random, i: int) -> str:
+    return f"Card text number {i}"
+
+
+def make_cards(count: int, make_text) -> list[Card]:
+    rng = random.Random(42)
+    texts = []
+    for i in range(count):
+        if i % 100 == 99:
+            # A near duplicate of the previous card
+            texts.append(texts[-1] + "s")
+        else:
+            texts.append(make_text(rng, i))
+    return [Card(text, CardType.WHITE) for text in texts]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_PATH = Path(tmp) / "bench.db"
+        db.init_db()
+
+        for label, make_text in (("random", random_text), ("templated", templated_text)):
+            deck_id = db.create_deck(label, "BENCH")
+            db.bulk_add_cards(deck_id, make_cards(args.cards, make_text))
+
+            start = time.perf_counter()
+            groups = find_near_duplicates(deck_id)
+            elapsed = time.perf_counter() - start
+            print(f"  {label:<10} {args.cards:>9,} cards  {elapsed:8.2f} s  {len(groups):>6,} groups")
+
+        db.close_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Benchmark: PDF export time with 1, 2, 4 and 8 worker processes.
+
+Usage:
+    uv run --extra parallel python benchmarks/bench_export.py [--cards N] [--backs]
+
+Exports a synthetic deck of N cards (default 10,000) to a temporary
+directory with each worker count and prints wall time and speedup.
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from cah.export import export_deck_to_pdf  # noqa: E402
+from cah.models import Card, CardType, Deck, DeckConfig  # noqa: E402
+
+
+def make_deck(count: int) -> Deck:
+    deck = Deck(config=DeckConfig(name="Benchmark", short_name="BENCH"))
+    for i in range(count):
+        if i % 4 == 0:
+            deck.add_card(Card(f"Question {i}: what ruined _____ this time?", CardType.BLACK, pick=1 + i % 3))
+        else:
+            deck.add_card(Card(f"Answer {i}, a surprisingly long white card text", CardType.WHITE))
+    return deck
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, default=10_000)
+    parser.add_argument("--backs", action="store_true", help="include back pages")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    deck = make_deck(args.cards)
+    print(f"{args.cards:,} cards, include_backs={args.backs}\n")
+
+    baseline = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for workers in args.workers:
+            output = Path(tmp) / f"deck-{workers}.pdf"
+            start = time.perf_counter()
+            export_deck_to_pdf(deck, output, include_backs=args.backs, workers=workers)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            size_mb = output.stat().st_size / 1e6
+            print(f"  workers={workers:<3} {elapsed:>8.2f}s  {baseline / elapsed:>5.1f}x  {size_mb:>7.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
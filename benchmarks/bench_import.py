@@ -0,0 +1,80 @@
+"""Benchmark: reading a large card file whole vs streaming it.
+
+Usage:
+    uv run python benchmarks/bench_import.py [--cards N]
+
+Writes a synthetic card pack of N cards (default 1,000,000) and a deck
+snapshot with a "counts" header, then prints wall time and peak memory
+of json.load, cardfile.read_cards and cardfile.read_header on them.
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from cah.cardfile import read_cards, read_header  # noqa: E402
+
+
+def write_pack(path: Path, count: int, counts: bool = False):
+    black = count // 4
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"config": {"name": "Benchmark", "short_name": "BENCH"}')
+        if counts:
+            f.write(f', "counts": {{"black": {black}, "white": {count - black}}}')
+        f.write(', "black_cards": [')
+        f.write(", ".join(
+            json.dumps({"text": f"Question {i}: what ruined _____ this time?", "pick": 1 + i % 3})
+            for i in range(black)
+        ))
+        f.write('], "white_cards": [')
+        f.write(", ".join(
+            json.dumps({"text": f"Answer {i}, a surprisingly long white card text"})
+            for i in range(count - black)
+        ))
+        f.write("]}")
+
+
+def measure(label: str, fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<28} {elapsed:>8.2f}s  {peak / 2**20:>8.1f} MB peak  {result}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pack, deck = Path(tmp) / "pack.json", Path(tmp) / "deck.json"
+        write_pack(pack, args.cards)
+        write_pack(deck, args.cards, counts=True)
+        print(f"{args.cards:,} cards, {pack.stat().st_size / 2**20:.1f} MB\n")
+
+        def load_whole():
+            with open(pack, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return len(data["black_cards"]) + len(data["white_cards"])
+
+        def header_counts(path: Path):
+            header = read_header(path)
+            return header["black_count"] + header["white_count"]
+
+        measure("json.load", load_whole)
+        measure("read_cards", lambda: sum(1 for _ in read_cards(pack)))
+        measure("read_header (counting)", lambda: header_counts(pack))
+        measure("read_header (counts header)", lambda: header_counts(deck))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Benchmark: sheets and export time per sheet layout.
+
+Usage:
+    uv run python benchmarks/bench_imposition.py [--cards N] [--bleed MM] [--cut-marks]
+
+Exports a synthetic deck of N cards (default 10,000) on each sheet size
+and on the automatically chosen one, and prints the grid, the number of
+sheets, wall time and time per 10k cards of each run.
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from reportlab.lib.units import mm  # noqa: E402
+
+from cah.export import SHEET_SIZES, choose_layout, export_deck_to_pdf, resolve_layout  # noqa: E402
+from cah.models import Card, CardType, Deck, DeckConfig  # noqa: E402
+
+
+def make_deck(count: int) -> Deck:
+    deck = Deck(config=DeckConfig(name="Benchmark", short_name="BENCH"))
+    for i in range(count):
+        if i % 4 == 0:
+            deck.add_card(Card(f"Question {i}: what ruined _____ this time?", CardType.BLACK, pick=1 + i % 3))
+        else:
+            deck.add_card(Card(f"Answer {i}, a surprisingly long white card text", CardType.WHITE))
+    return deck
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, default=10_000)
+    parser.add_argument("--bleed", type=float, default=0.0, help="bleed in mm")
+    parser.add_argument("--cut-marks", action="store_true")
+    args = parser.parse_args()
+
+    deck = make_deck(args.cards)
+    black, white = len(deck.black_cards), len(deck.white_cards)
+    options = {"bleed": args.bleed * mm, "cut_marks": args.cut_marks}
+    print(f"{args.cards:,} cards, bleed={args.bleed}mm, cut_marks={args.cut_marks}\n")
+    print(f"  {'sheet':<12} {'grid':>6} {'sheets':>8} {'time':>9} {'per 10k':>9}")
+
+    auto = choose_layout(black, white, **options)
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in [*SHEET_SIZES, "auto"]:
+            layout = auto if name == "auto" else resolve_layout(name, black, white, **options)
+            start = time.perf_counter()
+            export_deck_to_pdf(deck, Path(tmp) / "deck.pdf", layout=layout)
+            elapsed = time.perf_counter() - start
+            label = f"auto ({auto.name})" if name == "auto" else name
+            print(f"  {label:<12} {layout.cols}x{layout.rows:<4} {layout.sheets(black, white):>8,} "
+                  f"{elapsed:>8.2f}s {elapsed * 10_000 / args.cards:>8.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Benchmark: PDF export with per-card logo decoding vs. the LogoCache.
+
+Usage:
+    uv run python benchmarks/bench_logos.py [--cards N] [--logo-px PX]
+
+Exports a deck whose cards and backs all use a generated PNG logo, once
+with the old behaviour (open and embed the full-size image for every card)
+and once with the cached, downscaled form XObjects, and reports time and
+file size.
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from PIL import Image
+from reportlab.lib.utils import ImageReader
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from cah import export  # noqa: E402
+from cah.models import Card, CardType, Deck, DeckConfig  # noqa: E402
+
+
+class LegacyLogos(export.LogoCache):
+    """The pre-cache behaviour: decode the file on every card."""
+
+    def draw(self, c, logo_path, x, y, size):
+        if not (logo_path and Path(logo_path).exists()):
+            return False
+        try:
+            img = Image.open(logo_path)
+            c.drawImage(ImageReader(img), x, y, width=size, height=size,
+                        preserveAspectRatio=True, mask='auto')
+            return True
+        except Exception:
+            return False
+
+
+def make_logo(path: Path, px: int):
+    rng = random.Random(7)
+    img = Image.new("RGBA", (px, px), (0, 0, 0, 0))
+    pixels = img.load()
+    for x in range(0, px, 3):
+        for y in range(0, px, 3):
+            pixels[x, y] = (rng.randrange(256), rng.randrange(256), 200, 255)
+    img.save(path)
+
+
+def make_deck(count: int, logo: Path) -> Deck:
+    config = DeckConfig(
+        name="Benchmark", short_name="BENCH",
+        black_logo_path=str(logo), white_logo_path=str(logo),
+        black_back_logo_path=str(logo), white_back_logo_path=str(logo)
+    )
+    deck = Deck(config=config)
+    for i in range(count):
+        card_type = CardType.BLACK if i % 4 == 0 else CardType.WHITE
+        deck.add_card(Card(f"Card {i} with some text", card_type))
+    return deck
+
+
+def run(label: str, deck: Deck, output: Path) -> tuple[float, int]:
+    start = time.perf_counter()
+    export.export_deck_to_pdf(deck, output, include_backs=True)
+    elapsed = time.perf_counter() - start
+    size = output.stat().st_size
+    print(f"  {label:<8} {elapsed:>8.2f}s  {size / 1e6:>8.2f} MB")
+    return elapsed, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, default=1000)
+    parser.add_argument("--logo-px", type=int, default=1200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        logo = Path(tmp) / "logo.png"
+        make_logo(logo, args.logo_px)
+        deck = make_deck(args.cards, logo)
+        print(f"{args.cards:,} cards with backs, {args.logo_px}px logo\n")
+
+        cached_cls = export.LogoCache
+        export.LogoCache = LegacyLogos
+        try:
+            old_time, old_size = run("before", deck, Path(tmp) / "before.pdf")
+        finally:
+            export.LogoCache = cached_cls
+        new_time, new_size = run("after", deck, Path(tmp) / "after.pdf")
+
+    print(f"\n  time: {old_time / new_time:.1f}x faster, size: {old_size / new_size:.1f}x smaller")
+
+
+if __name__ == "__main__":
+    main()
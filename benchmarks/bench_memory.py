@@ -0,0 +1,109 @@
+"""Benchmark: memory used by loaded cards (tracemalloc).
+
+Usage:
+    uv run python benchmarks/bench_memory.py [--cards N]
+
+Builds N cards as plain dataclass objects (the old Card), slotted Card
+objects and a columnar CardStore, then loads the same cards from a
+temporary database with get_deck and get_card_store. Reports the memory
+retained by each representation next to the size of the texts alone.
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from cah import db  # noqa: E402
+from cah.models import Card, CardStore, CardType  # noqa: E402
+
+WORDS = ("cat", "dog", "grandma", "pizza", "dancing", "robot", "secret",
+         "the internet", "a small horse", "my ex", "tax fraud", "glitter")
+
+
+@dataclass
+class LegacyCard:
+    """Card as it was before slots: one __dict__ per instance."""
+    text: str
+    card_type: CardType
+    pick: int = 1
+    id: Optional[int] = None
+
+
+def make_texts(count: int) -> list[tuple[str, CardType, int]]:
+    rng = random.Random(1)
+    rows = []
+    for i in range(count):
+        words = " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 9)))
+        if i % 5 == 0:
+            rows.append((f"{words} _____ #{i}", CardType.BLACK, rng.choice((1, 1, 2))))
+        else:
+            rows.append((f"{words} #{i}", CardType.WHITE, 1))
+    return rows
+
+
+def measure(build):
+    """(retained MB, peak MB, seconds) of build()."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current / 1e6, peak / 1e6, elapsed
+
+
+def report(label: str, build):
+    current, peak, elapsed = measure(build)
+    print(f"  {label:<28} {current:8.1f} MB retained {peak:8.1f} MB peak {elapsed:7.2f} s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--cards", type=int, default=500_000)
+    args = parser.parse_args()
+
+    rows = make_texts(args.cards)
+    text_mb = sum(sys.getsizeof(text) for text, _, _ in rows) / 1e6
+    print(f"{args.cards} cards, texts alone: {text_mb:.1f} MB")
+
+    print("In memory (texts already allocated):")
+    report("dataclass Card (__dict__)", lambda: [
+        LegacyCard(text, card_type, pick, i) for i, (text, card_type, pick) in enumerate(rows)
+    ])
+    report("slotted Card", lambda: [
+        Card(text, card_type, pick, i) for i, (text, card_type, pick) in enumerate(rows)
+    ])
+
+    def build_store():
+        store = CardStore()
+        for i, (text, card_type, pick) in enumerate(rows):
+            store.append(text, card_type, pick, i)
+        store.compact()  # pack the string tables
+        return store
+
+    report("CardStore", build_store)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_PATH = Path(tmp) / "bench.db"
+        db.init_db()
+        deck_id = db.create_deck("Bench", "BENCH")
+        db.bulk_add_cards(deck_id, (Card(text, card_type, pick) for text, card_type, pick in rows))
+        del rows
+
+        print("Loaded from SQLite (texts included):")
+        report("get_deck", lambda: db.get_deck(deck_id))
+        report("get_card_store", lambda: db.get_card_store(deck_id))
+        db.close_pool()
+
+
+if __name__ == "__main__":
+    main()
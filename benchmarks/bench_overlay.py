@@ -0,0 +1,85 @@
+"""Benchmark: reading a duplicated deck vs. the deck it was made from.
+
+Usage:
+    uv run python benchmarks/bench_overlay.py [--cards N] [--extra N]
+
+Fills a deck with N cards (default 100,000) and duplicates it. The
+duplicate adds --extra cards of its own (default 50,000) and edits and
+deletes 1% of the cards it inherits. Prints the median latency of a
+first and a late page, a search page, a ranked search and get_card in
+both decks, and of update_card in the original, which has to push the
+old version of the card down into the duplicate.
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from cah import db  # noqa: E402
+from cah.models import Card, CardType  # noqa: E402
+
+
+def make_cards(count: int, label: str):
+    for i in range(count):
+        text = f"{label} card {i} about nothing much"
+        if i % 500 == 0:
+            text += " and a secret"
+        card_type = CardType.BLACK if i % 4 == 0 else CardType.WHITE
+        yield Card(text=text, card_type=card_type)
+
+
+def median_ms(fn, repeat: int = 15) -> float:
+    samples = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        fn(i)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, default=100_000)
+    parser.add_argument("--extra", type=int, default=50_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_PATH = Path(tmp) / "overlay.db"
+        db.init_db()
+        original = db.create_deck("Original", "ORIG")
+        card_ids = db.bulk_add_cards(original, make_cards(args.cards, "original"))
+        duplicate = db.duplicate_deck(original, "Duplicate")
+        extra_ids = db.bulk_add_cards(duplicate, make_cards(args.extra, "duplicate"))
+        for card_id in card_ids[::100]:
+            db.update_card(card_id, "edited card and a secret", deck_id=duplicate)
+        for card_id in card_ids[50::100]:
+            db.delete_card(card_id, deck_id=duplicate)
+
+        late_id = (extra_ids or card_ids)[-100]
+        print(f"{args.cards:,} cards, duplicate with {args.extra:,} more; median latency (ms)\n")
+        print(f"  {'':<14}{'original':>10}{'duplicate':>11}")
+        cases = [
+            ("first page", lambda deck, i: db.get_cards_page(deck, limit=30)),
+            ("late page", lambda deck, i: db.get_cards_page(deck, "white", after_id=late_id,
+                                                             limit=30)),
+            ("search page", lambda deck, i: db.get_cards_page(deck, search="secret", limit=30)),
+            ("ranked search", lambda deck, i: db.search_cards_ranked(deck, "secret")),
+            ("get_card", lambda deck, i: db.get_card(card_ids[i * 7 + 1], deck))
+        ]
+        for label, fn in cases:
+            plain = median_ms(lambda i: fn(original, i))
+            layered = median_ms(lambda i: fn(duplicate, i))
+            print(f"  {label:<14}{plain:>10.2f}{layered:>11.2f}")
+
+        update = median_ms(lambda i: db.update_card(card_ids[i * 7 + 3], f"changed {i}"))
+        print(f"\n  update_card in the original: {update:.2f} ms")
+        db.close_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Benchmark: re-export with the page cache.
+
+Usage:
+    uv run python benchmarks/bench_page_cache.py [--cards N] [--backs]
+
+Exports a synthetic deck of N cards (default 10,000) without a cache,
+into an empty cache, again unchanged and after editing one card, and
+prints wall time and cache hit rate of each run.
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from cah.export import PageCache, export_deck_to_pdf  # noqa: E402
+from cah.models import Card, CardType, Deck, DeckConfig  # noqa: E402
+
+
+def make_deck(count: int) -> Deck:
+    deck = Deck(config=DeckConfig(name="Benchmark", short_name="BENCH"))
+    for i in range(count):
+        if i % 4 == 0:
+            deck.add_card(Card(f"Question {i}: what ruined _____ this time?", CardType.BLACK, pick=1 + i % 3))
+        else:
+            deck.add_card(Card(f"Answer {i}, a surprisingly long white card text", CardType.WHITE))
+    return deck
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, default=10_000)
+    parser.add_argument("--backs", action="store_true", help="include back pages")
+    args = parser.parse_args()
+
+    deck = make_deck(args.cards)
+    print(f"{args.cards:,} cards, include_backs={args.backs}\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = Path(tmp) / "cache"
+
+        def run(label: str, cache: PageCache | None):
+            start = time.perf_counter()
+            export_deck_to_pdf(deck, Path(tmp) / "deck.pdf", include_backs=args.backs, cache=cache)
+            elapsed = time.perf_counter() - start
+            rate = f"{cache.hit_rate:>6.1%} hits" if cache else ""
+            print(f"  {label:<16} {elapsed:>8.2f}s  {rate}")
+
+        run("no cache", None)
+        run("cold cache", PageCache(cache_dir))
+        run("unchanged", PageCache(cache_dir))
+        deck.white_cards[len(deck.white_cards) // 2].text = "An edited card"
+        run("one card edited", PageCache(cache_dir))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Benchmark: card images and sprite sheets with 1/2/4 worker processes.
+
+Usage:
+    uv run python benchmarks/bench_raster.py [--cards N] [--format png|webp] [--no-card-files]
+
+Renders a synthetic deck of N cards (default 2,000) to images and prints
+wall time, cards per second and peak memory of the parent process for
+each worker count.
+"""
+
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from cah.models import Card, CardType, Deck, DeckConfig  # noqa: E402
+from cah.raster import RasterOptions, export_deck_images  # noqa: E402
+
+
+def make_deck(count: int) -> Deck:
+    deck = Deck(config=DeckConfig(name="Benchmark", short_name="BENCH"))
+    for i in range(count):
+        if i % 4 == 0:
+            deck.add_card(Card(f"Question {i}: what ruined _____ this time?", CardType.BLACK, pick=1 + i % 3))
+        else:
+            deck.add_card(Card(f"Answer {i}, a surprisingly long white card text", CardType.WHITE))
+    return deck
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, default=2_000)
+    parser.add_argument("--format", default="png", choices=["png", "webp"])
+    parser.add_argument("--no-card-files", action="store_true", help="sprite sheets only")
+    args = parser.parse_args()
+
+    deck = make_deck(args.cards)
+    options = RasterOptions(image_format=args.format, card_files=not args.no_card_files)
+    print(f"{args.cards:,} cards, {args.format}, {options.per_sheet} per sheet, "
+          f"{os.cpu_count()} CPUs\n")
+
+    for workers in (1, 2, 4):
+        with tempfile.TemporaryDirectory() as tmp:
+            start = time.perf_counter()
+            index = export_deck_images(deck, Path(tmp), options=options, workers=workers)
+            elapsed = time.perf_counter() - start
+        peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        print(f"  {workers} workers  {elapsed:>7.2f}s  {args.cards / elapsed:>7.0f} cards/s  "
+              f"{len(index['sheets'])} sheets  parent peak {peak_mb:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Benchmark: card search latency, LIKE scan vs. FTS5 index.
+
+Usage:
+    uv run python benchmarks/bench_search.py [--cards N]
+
+Builds a temporary database with N cards (default 200,000) and reports
+the median latency of a few typical queries for the old ``LIKE '%q%'``
+scan, search_cards and search_cards_ranked.
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from cah import db  # noqa: E402
+from cah.models import Card, CardType  # noqa: E402
+
+SYLLABLES = "ba ko ri mu te sa lo pi ne gu da vi ze fo ha ju ly".split()
+
+QUERIES = ["pizza", "pine", "\"secret happiness\"", "robot par", "zzz"]
+SEEDED_WORDS = ["pizza", "pineapple", "secret", "happiness", "robot", "party"]
+
+
+def make_vocabulary(rng: random.Random, size: int = 20_000) -> list[str]:
+    words = {"".join(rng.choices(SYLLABLES, k=rng.randint(2, 4))) for _ in range(size)}
+    return sorted(words) + SEEDED_WORDS
+
+
+def make_cards(count: int, rng: random.Random):
+    vocabulary = make_vocabulary(rng)
+    # Zipf-like weights: a few common words, a long tail of rare ones
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    rng.shuffle(weights)
+    for i in range(count):
+        text = " ".join(rng.choices(vocabulary, weights, k=rng.randint(3, 12)))
+        if i % 500 == 0:
+            text += " the secret happiness"
+        card_type = CardType.BLACK if i % 4 == 0 else CardType.WHITE
+        yield Card(text=text, card_type=card_type)
+
+
+def like_scan(deck_id: int, query: str) -> list:
+    with db.db_cursor() as cursor:
+        cursor.execute(
+            "SELECT * FROM cards WHERE deck_id = ? AND text LIKE ? ORDER BY id",
+            (deck_id, f"%{query.strip('\"')}%")
+        )
+        return cursor.fetchall()
+
+
+def median_ms(fn, repeat: int = 15) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, default=200_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_PATH = Path(tmp) / "search.db"
+        db.init_db()
+        deck_id = db.create_deck("Search", "SRCH")
+        db.bulk_add_cards(deck_id, make_cards(args.cards, random.Random(42)))
+
+        print(f"{args.cards:,} cards, median latency (ms)\n")
+        print(f"  {'query':<22}{'LIKE':>10}{'search':>10}{'ranked':>10}{'hits':>10}")
+        for query in QUERIES:
+            like = median_ms(lambda: like_scan(deck_id, query))
+            full = median_ms(lambda: db.search_cards(deck_id, query))
+            ranked = median_ms(lambda: db.search_cards_ranked(deck_id, query, limit=30))
+            hits = len(db.search_cards(deck_id, query))
+            print(f"  {query:<22}{like:>10.2f}{full:>10.2f}{ranked:>10.2f}{hits:>10,}")
+
+        db.close_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Benchmark: startup time of the CLI and GUI entry points, against a budget.
+
+Usage:
+    uv run python benchmarks/bench_startup.py [--runs N] [--cli-budget MS] [--gui-budget MS]
+
+Runs ``main.py --cli`` with ``python -X importtime`` (stdin closed, so the
+menu exits as soon as it asks for input) and a GUI process that exits once
+CAHApp has painted its first frame. Reports the best wall time of each,
+the total import time and the slowest top-level imports, and exits with
+status 1 when a best time is over its budget. The GUI run is skipped when
+no display is available.
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+# -X importtime lines: "import time: self [us] | cumulative | imported package"
+_IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+GUI_SNIPPET = """
+from cah.gui import CAHApp
+app = CAHApp()
+app.update()
+app.destroy()
+"""
+
+
+def run_timed(args: list[str]) -> tuple[float, str, int]:
+    """Run a Python process; return (wall ms, stderr, exit code)."""
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=ROOT,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True
+    )
+    return (time.perf_counter() - start) * 1000, proc.stderr, proc.returncode
+
+
+def top_level_imports(stderr: str) -> list[tuple[str, float]]:
+    """Top-level modules and their cumulative import time in ms."""
+    imports = []
+    for line in stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if match and len(match.group(3)) == 1:
+            imports.append((match.group(4), int(match.group(2)) / 1000))
+    return imports
+
+
+def bench(label: str, args: list[str], runs: int, budget: float,
+          show: int) -> bool:
+    """Time one entry point; return True when within budget."""
+    results = [run_timed(args) for _ in range(runs)]
+    wall, stderr, _ = min(results)
+
+    imports = top_level_imports(stderr)
+    total = sum(ms for _, ms in imports)
+
+    status = "ok" if wall <= budget else "OVER BUDGET"
+    print(f"{label}: {wall:.0f} ms (budget {budget:.0f} ms, imports {total:.0f} ms) {status}")
+    for name, ms in sorted(imports, key=lambda item: item[1], reverse=True)[:show]:
+        print(f"  {ms:8.1f} ms  {name}")
+    return wall <= budget
+
+
+def has_display() -> bool:
+    """Whether Tk can open a window in this session."""
+    if sys.platform.startswith("linux") and not (
+        os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY")
+    ):
+        return False
+    probe = subprocess.run(
+        [sys.executable, "-c", "import tkinter; tkinter.Tk().destroy()"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    return probe.returncode == 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--cli-budget", type=float, default=200,
+                        help="Budget for main.py --cli, in ms")
+    parser.add_argument("--gui-budget", type=float, default=1000,
+                        help="Budget for the GUI first frame, in ms")
+    parser.add_argument("--show", type=int, default=8,
+                        help="Number of slowest imports to list")
+    args = parser.parse_args()
+
+    ok = bench("main.py --cli", ["main.py", "--cli"], args.runs,
+               args.cli_budget, args.show)
+
+    if has_display():
+        ok = bench("GUI first frame", ["-c", GUI_SNIPPET], args.runs,
+                   args.gui_budget, args.show) and ok
+    else:
+        print("GUI first frame: skipped (no display)")
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+"""Streaming reader for deck and card files.
+
+Deck files and card packs (such as data/cards.json) are one JSON object
+holding "black_cards" and "white_cards" lists next to small members like
+"config". CardFileReader reads such a file a chunk at a time and hands
+out the cards one by one, so memory stays flat however large the file
+is. Members other than the card lists are decoded whole.
+
+Deck snapshots written by decks.py store a "counts" member before their
+card lists. read_header() stops there, so listing decks never reads a
+card. For other files it counts the cards as it reads them, a buffer at
+a time.
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Iterator, TextIO
+
+from .models import Card, CardType, Deck, DeckConfig
+
+CARD_LISTS = {"black_cards": CardType.BLACK, "white_cards": CardType.WHITE}
+CHUNK_SIZE = 1 << 20  # Characters read at a time
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# What may be left of a number cut off at the end of the buffer
+_NUMBER_TAIL = re.compile(r"[0-9eE+\-.]*\Z")
+# Attempts at decoding a batch before falling back to one item at a time
+BATCH_ATTEMPTS = 3
+
+
+class CardFileReader:
+    """Pull parser for the top level of a deck or card file.
+
+    Args:
+        f: File opened in text mode
+        chunk_size: Characters read at a time
+    """
+
+    def __init__(self, f: TextIO, chunk_size: int = CHUNK_SIZE):
+        self._f = f
+        self._chunk_size = chunk_size
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _error(self, message: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(message, self._buf, self._pos)
+
+    def _fill(self) -> bool:
+        """Append a chunk to the unread part of the buffer; False at the end."""
+        if self._eof:
+            return False
+        chunk = self._f.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _peek(self) -> str:
+        """Skip whitespace; the next character, or "" at the end of the file."""
+        while True:
+            self._pos = _WHITESPACE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, chars: str) -> str:
+        """Consume the next character, which must be one of chars."""
+        char = self._peek()
+        if not char or char not in chars:
+            raise self._error(f"Expecting one of {chars!r}")
+        self._pos += 1
+        return char
+
+    def _decode(self):
+        """Decode the value at the current position."""
+        self._peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue  # value cut off at the end of the buffer
+                raise
+            # A number at the end of the buffer may go on in the next chunk
+            if _NUMBER_TAIL.match(self._buf, end) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def _decode_items(self) -> list:
+        """Decode array items from the current position (at an item) up to
+        the last one that is whole in the buffer.
+
+        Items are cut at the last comma followed by the character the
+        first item starts with (items of a card list all look alike) and
+        decoded in one call. A cut inside a string or a nested value can
+        only fail to decode, never decode to something else, so a wrong
+        guess costs a retry at the comma before; a cut past the end of the
+        list decodes up to the list's own "]". Leaves the position at the
+        "," or "]" after the last item.
+        """
+        if len(self._buf) - self._pos < self._chunk_size:
+            self._fill()
+        if self._pos >= len(self._buf):
+            raise self._error("Unterminated array")
+        buf, start = self._buf, self._pos
+        first = buf[start]
+        end = len(buf)
+
+        for _ in range(BATCH_ATTEMPTS):
+            cut = buf.rfind(first, start + 1, end)
+            while cut > start:
+                before = cut - 1
+                while buf[before] in " \t\n\r":
+                    before -= 1
+                if buf[before] == ",":
+                    break
+                cut = buf.rfind(first, start + 1, before)
+            if cut <= start:
+                break
+            try:
+                items, end_list = _DECODER.raw_decode("[" + buf[start:before] + "]")
+            except json.JSONDecodeError:
+                end = before
+                continue
+            if end_list == before - start + 2:
+                self._pos = before  # closed by the "]" added above
+            else:
+                self._pos = start + end_list - 2  # at the list's "]"
+            return items
+
+        return [self._decode()]
+
+    def members(self) -> Iterator[tuple[str, object]]:
+        """Top-level (key, value) pairs, in file order.
+
+        The value of a card list is a CardListItems iterator over its raw
+        items (dicts or strings). Items left unread are skipped when the
+        next member is requested.
+        """
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            return
+
+        while True:
+            key = self._decode()
+            if not isinstance(key, str):
+                raise self._error("Expecting property name")
+            self._expect(":")
+
+            if key in CARD_LISTS and self._peek() == "[":
+                items = CardListItems(self)
+                yield key, items
+                items.skip()
+            else:
+                yield key, self._decode()
+
+            if self._expect(",}") == "}":
+                return
+
+
+class CardListItems:
+    """Lazy items of a card list (see CardFileReader.members).
+
+    Items are decoded a buffer at a time, so at most a chunk's worth of
+    them is held.
+    """
+
+    def __init__(self, reader: CardFileReader):
+        self._reader = reader
+        self._batch: list = []
+        self._index = 0
+        self._started = False
+        self._done = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._index < len(self._batch):
+            item = self._batch[self._index]
+            self._index += 1
+            return item
+
+        batch = self._next_batch()
+        if not batch:
+            raise StopIteration
+        self._batch, self._index = batch, 1
+        return batch[0]
+
+    def _next_batch(self) -> list:
+        reader = self._reader
+        if self._done:
+            return []
+        if not self._started:
+            self._started = True
+            reader._expect("[")
+            if reader._peek() == "]":
+                reader._pos += 1
+                self._done = True
+                return []
+        elif reader._expect(",]") == "]":
+            self._done = True
+            return []
+        reader._peek()
+        return reader._decode_items()
+
+    def skip(self) -> int:
+        """Skip the items not read yet; returns how many there were."""
+        count = len(self._batch) - self._index
+        self._batch, self._index = [], 0
+        while batch := self._next_batch():
+            count += len(batch)
+        return count
+
+
+def card_from_item(item, card_type: CardType) -> Card:
+    """Card of a card list item: {"text", "pick"} or a plain string."""
+    if isinstance(item, str):
+        return Card(text=item, card_type=card_type)
+    return Card(text=item["text"], card_type=card_type,
+                pick=item.get("pick", 1) if card_type == CardType.BLACK else 1)
+
+
+def read_cards(path: Path) -> Iterator[Card]:
+    """Cards of a deck or card file, one at a time, in file order."""
+    with open(path, "r", encoding="utf-8") as f:
+        for key, value in CardFileReader(f).members():
+            if key in CARD_LISTS:
+                card_type = CARD_LISTS[key]
+                for item in value:
+                    yield card_from_item(item, card_type)
+
+
+def read_header(path: Path) -> dict:
+    """Members of a deck or card file other than the card lists, plus
+    "black_count" and "white_count".
+
+    A "counts" member ({"black": n, "white": n}) before the card lists is
+    trusted and reading stops at the first list. Otherwise the lists are
+    read through and counted.
+    """
+    header = {}
+    counts = {CardType.BLACK: 0, CardType.WHITE: 0}
+
+    with open(path, "r", encoding="utf-8") as f:
+        for key, value in CardFileReader(f).members():
+            if key not in CARD_LISTS:
+                header[key] = value
+            elif isinstance(header.get("counts"), dict):
+                break
+            else:
+                counts[CARD_LISTS[key]] += value.skip()
+
+    stored = header.get("counts")
+    if isinstance(stored, dict):
+        header["black_count"] = stored.get("black", 0)
+        header["white_count"] = stored.get("white", 0)
+    else:
+        header["black_count"] = counts[CardType.BLACK]
+        header["white_count"] = counts[CardType.WHITE]
+    return header
+
+
+def read_deck(path: Path) -> Deck:
+    """Load a deck file without building its whole JSON tree first."""
+    deck = None
+    black_cards, white_cards = [], []
+
+    with open(path, "r", encoding="utf-8") as f:
+        for key, value in CardFileReader(f).members():
+            if key == "config":
+                deck = Deck(config=DeckConfig.from_dict(value))
+            elif key in CARD_LISTS:
+                target = black_cards if key == "black_cards" else white_cards
+                # Items of a saved deck carry their type; it wins over the list
+                target.extend(
+                    Card.from_dict(item) if isinstance(item, dict) and "card_type" in item
+                    else card_from_item(item, CARD_LISTS[key])
+                    for item in value
+                )
+
+    if deck is None:
+        raise KeyError("config")
+    deck.black_cards = black_cards
+    deck.white_cards = white_cards
+    return deck
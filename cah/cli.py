@@ -1,24 +1,22 @@
-"""Interactive CLI for the card generator."""
+"""Interactive CLI and batch commands for the card generator."""
 
-import typer
 from rich.console import Console
-from rich.table import Table
 from rich.panel import Panel
 from rich.prompt import Prompt, Confirm, IntPrompt
-from rich import print as rprint
 from pathlib import Path
-import random
+import json
+import sys
 
+from . import db
 from .models import CardType, DeckConfig
-from .database import create_default_deck, get_cards_count
-from .decks import (
-    list_saved_decks, save_deck, load_deck, delete_deck,
-    create_empty_deck, add_card_to_deck
-)
-from .export import export_deck_to_pdf
-
-app = typer.Typer(help="Cards Against Humanity generator")
+from .database import create_default_deck, default_card_rows, get_cards_count
+from .decks import create_empty_deck, add_card_to_deck
+from .storage import FileDeckStore
+
+# reportlab/Pillow (export), rich.table and typer are imported where they are
+# first needed so the menu comes up without loading them
 console = Console()
+store = FileDeckStore()
 
 EXPORTS_DIR = Path(__file__).parent.parent / "exports"
 
@@ -28,7 +26,6 @@ def ensure_exports_dir():
     EXPORTS_DIR.mkdir(exist_ok=True)
 
 
-@app.command()
 def menu():
     """Launch the main interactive menu."""
     while True:
@@ -96,6 +93,8 @@ def explore_cards():
 
 def show_cards_list(cards: list, title: str):
     """Show a paginated card list."""
+    from rich.table import Table
+
     page_size = 10
     total_pages = (len(cards) + page_size - 1) // page_size
     current_page = 0
@@ -187,7 +186,7 @@ def create_custom_deck():
 
         if choice == "0":
             if deck.total_cards > 0 and Confirm.ask("Save before exiting?"):
-                filename = save_deck(deck)
+                filename = store.save_deck(deck)
                 console.print(f"[green]Saved to {filename}[/]")
             break
         elif choice == "1":
@@ -200,16 +199,18 @@ def create_custom_deck():
             add_card_to_deck(deck, text, CardType.WHITE)
             console.print("[green]Card added![/]")
         elif choice == "3":
-            filename = save_deck(deck)
+            filename = store.save_deck(deck)
             console.print(f"[green]Saved to {filename}[/]")
             break
 
 
 def manage_decks():
     """Manage saved decks."""
+    from rich.table import Table
+
     while True:
         console.clear()
-        decks = list_saved_decks()
+        decks = store.list_decks()
 
         console.print(Panel.fit("[bold]Saved decks[/]", border_style="magenta"))
 
@@ -242,18 +243,18 @@ def manage_decks():
         elif choice.lower() == "v" and decks:
             idx = IntPrompt.ask("Deck number", default=1) - 1
             if 0 <= idx < len(decks):
-                view_deck(decks[idx]["filename"])
+                view_deck(decks[idx]["key"])
         elif choice.lower() == "e" and decks:
             idx = IntPrompt.ask("Deck number to delete", default=1) - 1
             if 0 <= idx < len(decks):
                 if Confirm.ask(f"Delete '{decks[idx]['name']}'?"):
-                    delete_deck(decks[idx]["filename"])
+                    store.delete_deck(decks[idx]["key"])
                     console.print("[green]Deleted![/]")
 
 
-def view_deck(filename: str):
+def view_deck(key: str):
     """View deck details."""
-    deck = load_deck(filename)
+    deck = store.get_deck(key)
 
     console.clear()
     console.print(Panel.fit(
@@ -304,7 +305,7 @@ def export_menu():
         config = DeckConfig(name=name, short_name=short_name, logo_path=logo_path)
         deck = create_default_deck(config)
     else:
-        decks = list_saved_decks()
+        decks = store.list_decks()
         if not decks:
             console.print("[yellow]No saved decks[/]")
             Prompt.ask("[dim]Press Enter[/]")
@@ -317,7 +318,7 @@ def export_menu():
         if not (0 <= idx < len(decks)):
             return
 
-        deck = load_deck(decks[idx]["filename"])
+        deck = store.get_deck(decks[idx]["key"])
 
     # Card type to export
     console.print("\n[bold]Which cards to export?[/]")
@@ -333,6 +334,8 @@ def export_menu():
     filename = f"{deck.config.short_name.lower()}_{cards_type}.pdf"
     output_path = EXPORTS_DIR / filename
 
+    from .export import export_deck_to_pdf
+
     with console.status("[bold green]Generating PDF..."):
         export_deck_to_pdf(deck, output_path, cards_type)
 
@@ -341,38 +344,398 @@ def export_menu():
 
 
 def random_combo():
-    """Generate a random card combination."""
-    deck = create_default_deck()
+    """Generate random card combinations."""
+    from .combos import ComboEngine, fill_blanks
 
-    console.clear()
-    console.print(Panel.fit("[bold]Random combination[/]", border_style="red"))
+    # Sample row positions from the cached default cards
+    black_rows, white_rows = default_card_rows()
+    engine = ComboEngine.from_picks([pick for _, pick in black_rows], len(white_rows))
+
+    while True:
+        console.clear()
+        console.print(Panel.fit("[bold]Random combination[/]", border_style="red"))
+
+        black_index, white_indexes = engine.draw()
+        black_text = black_rows[black_index][0]
+        white_texts = [white_rows[i][0] for i in white_indexes]
+
+        console.print("\n[white on black] QUESTION [/]")
+        console.print(f"\n  {black_text}\n")
+
+        console.print("[black on white] ANSWER [/]")
+        for text in white_texts:
+            console.print(f"\n  {text}")
 
-    black_card = random.choice(deck.black_cards)
-    white_cards = random.sample(deck.white_cards, min(black_card.pick, len(deck.white_cards)))
+        # Show combined result
+        result = fill_blanks(black_text, white_texts, "[bold red]{}[/]")
 
-    console.print("\n[white on black] QUESTION [/]")
-    console.print(f"\n  {black_card.text}\n")
+        console.print("\n" + "─" * 40)
+        console.print(f"\n[italic]{result}[/]")
 
-    console.print("[black on white] ANSWER [/]")
-    for card in white_cards:
-        console.print(f"\n  {card.text}")
+        console.print("\n")
+        if not Confirm.ask("Another combination?", default=True):
+            break
+
+
+# === BATCH COMMANDS ===
+#
+# Non-interactive subcommands for scripts and build pipelines. They work on
+# the SQLite decks shared with the GUI, print their result as JSON on
+# stdout, report progress on stderr and exit with status 1 on errors.
+
+CARD_TYPES = ("all", "black", "white")
+
+
+def _emit(data):
+    """Print a command result as JSON."""
+    print(json.dumps(data, ensure_ascii=False, indent=2))
 
-    # Show combined result
-    result = black_card.text
-    for wc in white_cards:
-        result = result.replace("_____", f"[bold red]{wc.text}[/]", 1)
 
-    console.print("\n" + "─" * 40)
-    console.print(f"\n[italic]{result}[/]")
+def _fail(message: str, code: int = 1):
+    """Report an error on stderr and exit with the given status."""
+    import typer
 
-    console.print("\n")
-    if Confirm.ask("Another combination?", default=True):
-        random_combo()
+    print(json.dumps({"error": message}, ensure_ascii=False), file=sys.stderr)
+    raise typer.Exit(code)
+
+
+def _progress(label: str):
+    """Progress callback writing "label: done/total" to stderr.
+
+    On a terminal the line is rewritten in place; otherwise (logs, CI) a
+    line is written every 10%.
+    """
+    interactive = sys.stderr.isatty()
+    last_step = -1
+
+    def report(done: int, total: int):
+        nonlocal last_step
+        if interactive:
+            end = "\n" if done >= total else ""
+            print(f"\r{label}: {done}/{total}", end=end, file=sys.stderr, flush=True)
+            return
+        step = done * 10 // total if total else 10
+        if step != last_step:
+            last_step = step
+            print(f"{label}: {done}/{total}", file=sys.stderr, flush=True)
+
+    return report
+
+
+def _require_deck(deck_id: int):
+    """Open the database and return a deck's metadata, or exit."""
+    db.ensure_db()
+    deck = db.get_deck(deck_id, include_cards=False)
+    if deck is None:
+        _fail(f"Deck {deck_id} not found")
+    return deck
+
+
+def _check_card_type(card_type: str):
+    if card_type not in CARD_TYPES:
+        _fail(f"Invalid card type '{card_type}' (expected one of: {', '.join(CARD_TYPES)})", 2)
+
+
+def import_cards(file: Path, deck: int = 0, name: str = "", short_name: str = "",
+                 skip_duplicates: bool = False):
+    """Import cards from a JSON deck or card file.
+
+    The file holds "black_cards" and "white_cards" lists (as saved decks and
+    data/cards.json do). Cards go into a new deck unless --deck is given.
+    --skip-duplicates leaves out cards whose text the deck already has.
+
+    The file is streamed: its cards go into the database as they are read,
+    so a file of any size imports in constant memory. A saved deck with
+    unsaved journal changes (see decks.DeckJournal) is loaded whole instead.
+    """
+    from . import decks
+    from .cardfile import read_cards, read_header
+
+    file = Path(file)
+    journaled = decks.journal_path(file).exists()
+    try:
+        header = decks.read_deck_summary(file) if journaled else read_header(file)
+    except (OSError, json.JSONDecodeError) as e:
+        _fail(f"Cannot read {file}: {e}")
+
+    db.ensure_db()
+    total = header["black_count"] + header["white_count"]
+
+    if deck:
+        _require_deck(deck)
+
+    report = _progress("Importing")
+    counts = {"black": 0, "white": 0}
+
+    def counted(cards):
+        for card in cards:
+            counts[card.card_type.value] += 1
+            done = counts["black"] + counts["white"]
+            if done % db.BULK_CHUNK_SIZE == 0 or done == total:
+                report(done, total)
+            yield card
+
+    def cards():
+        if journaled:
+            saved = decks.deck_journal(file).load()
+            yield from saved.black_cards
+            yield from saved.white_cards
+        else:
+            yield from read_cards(file)
+
+    # A new deck is rolled back with its cards if the import fails
+    try:
+        with db.db_cursor():
+            if deck:
+                deck_id = deck
+            else:
+                config = header.get("config", {})
+                deck_id = db.create_deck(name or config.get("name") or file.stem,
+                                         short_name or config.get("short_name") or "CAH")
+            card_ids = db.bulk_add_cards(deck_id, counted(cards()),
+                                         skip_duplicates=skip_duplicates)
+    except (OSError, KeyError, TypeError, ValueError) as e:
+        _fail(f"Invalid card in {file}: {e}")
+
+    total = counts["black"] + counts["white"]
+    _emit({"deck_id": deck_id, **counts, "total": total,
+           "skipped": total - len(card_ids)})
+
+
+def export_pdf(deck: int, output: Path, card_type: str = "all",
+               backs: bool = False, workers: int = 1, cache: bool = True,
+               sheet: str = "a4", bleed: float = 0.0, cut_marks: bool = False,
+               gang_run: bool = True):
+    """Export a deck to PDF.
+
+    Cards are streamed from the database page by page. With --workers
+    above 1 (and pypdf installed) runs of pages are rendered in parallel,
+    each worker streaming its own run; the result reports the number of
+    workers actually used.
+    Pages drawn by earlier exports are reused unless --no-cache.
+
+    --sheet is a4, a3, sra3 or auto (the size needing the fewest sheets),
+    filled with as many cards as fit. --bleed (in mm) extends card
+    backgrounds past the cut line; with --no-gang-run black and white
+    cards go on separate sheets.
+    """
+    from reportlab.lib.units import mm
+
+    from .export import PageCache, export_deck_id_to_pdf, parallel_workers, resolve_layout
+
+    _check_card_type(card_type)
+    config = _require_deck(deck).config
+    output = Path(output)
+    page_cache = PageCache() if cache else None
+
+    counts = {t: (n if card_type in ("all", t) else 0)
+              for t, n in db.count_cards(deck).items()}
+    try:
+        layout = resolve_layout(sheet.lower(), counts["black"], counts["white"],
+                                bleed=bleed * mm, cut_marks=cut_marks, gang_run=gang_run)
+    except ValueError as e:
+        _fail(str(e))
+
+    pages = layout.sheets(counts["black"], counts["white"])
+    workers = parallel_workers(workers, pages)
+
+    try:
+        export_deck_id_to_pdf(deck, output, card_type, include_backs=backs, config=config,
+                              progress=_progress("Exporting pages"), cache=page_cache,
+                              layout=layout, workers=workers)
+    except ValueError as e:
+        _fail(str(e))
+
+    _emit({
+        "deck_id": deck,
+        "output": str(output),
+        "cards": counts["black"] + counts["white"],
+        "sheet": {"name": layout.name, "cols": layout.cols, "rows": layout.rows},
+        "pages": pages * (2 if backs else 1),
+        "workers": workers,
+        "page_cache": page_cache.stats() if page_cache else None
+    })
+
+
+def export_images(deck: int, output_dir: Path, card_type: str = "all",
+                  image_format: str = "png", dpi: int = 150, sheet_size: int = 4096,
+                  card_files: bool = True, backs: bool = False, workers: int = 0):
+    """Export a deck as images: sprite sheets with an index.json, one
+    image per card (unless --no-card-files) and the card backs (--backs).
+
+    --image-format is png or webp; --sheet-size is the largest sprite sheet
+    side in pixels. Cards are rendered by --workers processes (default: one
+    per CPU).
+    """
+    from .raster import RasterOptions, export_deck_id_images
+
+    _check_card_type(card_type)
+    config = _require_deck(deck).config
+    counts = db.count_cards(deck)
+    total = sum(n for t, n in counts.items() if card_type in ("all", t))
+    options = RasterOptions(dpi=dpi, image_format=image_format.lower(),
+                            sheet_max_size=sheet_size, card_files=card_files)
+    report = _progress("Rendering cards")
+
+    try:
+        index = export_deck_id_images(deck, Path(output_dir), card_type, config=config,
+                                      options=options, include_backs=backs,
+                                      workers=workers or None,
+                                      progress=lambda done: report(done, total))
+    except ValueError as e:
+        _fail(str(e))
+
+    _emit({
+        "deck_id": deck,
+        "output": str(output_dir),
+        "cards": len(index["cards"]),
+        "sheets": len(index["sheets"]),
+        "card_size": index["card_size"],
+        "index": str(Path(output_dir) / "index.json")
+    })
+
+
+def search(deck: int, query: str, card_type: str = "all", limit: int = 50):
+    """Full-text search a deck, best matches first."""
+    _check_card_type(card_type)
+    _require_deck(deck)
+    cards = db.search_cards_ranked(deck, query, None if card_type == "all" else card_type,
+                                   limit=limit)
+    _emit([
+        {"id": card.id, "card_type": card.card_type.value, "pick": card.pick, "text": card.text}
+        for card in cards
+    ])
+
+
+def stats(deck: int = 0):
+    """Card counts for one deck, or for every deck."""
+    if deck:
+        config = _require_deck(deck).config
+        counts = db.count_cards(deck)
+        _emit({"deck_id": deck, "name": config.name, **counts,
+               "total": counts["black"] + counts["white"]})
+        return
+
+    db.ensure_db()
+    _emit({**db.get_stats(), "decks": db.list_decks()})
+
+
+def verify_stats(rebuild: bool = False):
+    """Check the stored per-deck card counts against the cards.
+
+    Exits with status 1 when counts are wrong, unless --rebuild corrected
+    them.
+    """
+    db.ensure_db()
+    mismatches = db.verify_deck_stats(repair=rebuild)
+    _emit({"mismatches": mismatches, "rebuilt": rebuild and bool(mismatches)})
+    if mismatches and not rebuild:
+        import typer
+
+        raise typer.Exit(1)
+
+
+def dedupe(deck: int = 0, threshold: float = 0.8, exact: bool = False,
+           apply: bool = False):
+    """Report duplicate and near-duplicate cards in one deck or all decks.
+
+    Exact duplicates have the same text ignoring case, accents, punctuation
+    and spacing. Near duplicates have similar texts: --threshold is the
+    minimum Jaccard similarity (0-1) of their character shingles; --exact
+    skips them. With --apply, exact duplicates within a deck are deleted,
+    keeping the oldest card; near duplicates are only reported.
+    """
+    from .dedupe import find_exact_duplicates, find_near_duplicates, remove_duplicates
+
+    if not 0 < threshold <= 1:
+        _fail(f"Invalid threshold {threshold} (expected a value in (0, 1])", 2)
+    if deck:
+        _require_deck(deck)
+    else:
+        db.ensure_db()
+
+    deck_id = deck or None
+    exact_groups = find_exact_duplicates(deck_id)
+    near_groups = [] if exact else find_near_duplicates(deck_id, threshold)
+    duplicates = sum(len(group.redundant()) for group in exact_groups)
+
+    _emit({
+        "deck_id": deck_id,
+        "exact": [group.to_dict() for group in exact_groups],
+        "near": [group.to_dict() for group in near_groups],
+        "duplicates": duplicates,
+        "removed": remove_duplicates(exact_groups) if apply else 0
+    })
+
+
+def combos(deck: int, count: int = 10, seed: int | None = None, pick: int = 0,
+           repeats: bool = False, ids: bool = False):
+    """Generate random black/white card combinations.
+
+    No card repeats until all cards of its color were used (unless
+    --repeats). --pick limits black cards to one pick count; --ids prints
+    card IDs instead of texts, which is much faster for large batches.
+    """
+    from .combos import ComboEngine, fill_blanks
+
+    _require_deck(deck)
+    engine = ComboEngine.from_db(deck, seed, no_repeats=not repeats)
+    try:
+        batch = engine.generate(count, pick or None)
+    except ValueError as e:
+        _fail(f"Deck {deck}: {e}")
+
+    if ids:
+        _emit([{"black": black_id, "white": list(white_ids)} for black_id, white_ids in batch])
+        return
+
+    # Fetch each distinct card once
+    wanted = sorted(set(batch.black_ids) | set(batch.white_ids))
+    texts = {card.id: card.text for card in db.get_cards_by_ids(wanted, deck)}
+
+    _emit([
+        {
+            "black": texts[black_id],
+            "white": [texts[i] for i in white_ids],
+            "text": fill_blanks(texts[black_id], [texts[i] for i in white_ids])
+        }
+        for black_id, white_ids in batch
+    ])
+
+
+def build_app():
+    """Build the typer application.
+
+    Without a subcommand it runs the interactive menu.
+    """
+    import typer
+
+    app = typer.Typer(help="Cards Against Humanity generator")
+
+    @app.callback(invoke_without_command=True)
+    def default(ctx: typer.Context):
+        if ctx.invoked_subcommand is None:
+            menu()
+
+    app.command()(menu)
+    app.command("import")(import_cards)
+    app.command("export-pdf")(export_pdf)
+    app.command("export-images")(export_images)
+    app.command()(search)
+    app.command()(stats)
+    app.command("verify-stats")(verify_stats)
+    app.command()(dedupe)
+    app.command()(combos)
+    return app
 
 
 def main():
     """Main entry point."""
-    app()
+    if len(sys.argv) == 1:
+        # Plain interactive start: skip loading typer
+        menu()
+        return
+    build_app()()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,201 @@
+"""Random black/white card combinations."""
+
+import random
+from array import array
+from typing import Iterator, Sequence
+
+from . import db
+
+# Blank placeholder in black card texts
+BLANK = "_____"
+
+
+class ShuffleBag:
+    """Random draws without repeats until every item has been drawn.
+
+    The items are shuffled, handed out in order and reshuffled once the
+    bag is exhausted.
+    """
+
+    def __init__(self, items: Sequence[int], rng: random.Random):
+        self._items = list(items)
+        self._rng = rng
+        self._pos = len(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def draw(self) -> int:
+        if self._pos >= len(self._items):
+            self._rng.shuffle(self._items)
+            self._pos = 0
+        item = self._items[self._pos]
+        self._pos += 1
+        return item
+
+    def draw_many(self, count: int) -> list[int]:
+        """Up to count distinct items.
+
+        An item that comes up twice across a reshuffle is skipped, so one
+        draw never holds the same item twice.
+        """
+        count = min(count, len(self._items))
+        drawn: list[int] = []
+        while len(drawn) < count:
+            item = self.draw()
+            if item not in drawn:
+                drawn.append(item)
+        return drawn
+
+
+class ComboBatch:
+    """Many combinations stored as flat ID arrays.
+
+    Combination i is black_ids[i] with white_ids[offsets[i]:offsets[i + 1]].
+    """
+
+    def __init__(self):
+        self.black_ids = array("q")
+        self.white_ids = array("q")
+        self.offsets = array("q", [0])
+
+    def __len__(self) -> int:
+        return len(self.black_ids)
+
+    def __getitem__(self, index: int) -> tuple[int, tuple[int, ...]]:
+        if index < 0:
+            index += len(self.black_ids)
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return self.black_ids[index], tuple(self.white_ids[start:end])
+
+    def __iter__(self) -> Iterator[tuple[int, tuple[int, ...]]]:
+        for index in range(len(self.black_ids)):
+            yield self[index]
+
+
+class ComboEngine:
+    """Draws combinations as card IDs: one black card and as many white
+    cards as it picks.
+
+    Black IDs are grouped in buckets by pick count, so combinations can be
+    limited to one pick count. With no_repeats (the default) cards come
+    out of shuffle bags: no card repeats until every card of its kind has
+    been used. Pass a seed for reproducible sequences.
+
+    Args:
+        buckets: Black card IDs by pick count
+        white_ids: White card IDs
+        seed: Random seed (None for a random one)
+        no_repeats: Draw from shuffle bags instead of independent samples
+    """
+
+    def __init__(self, buckets: dict[int, Sequence[int]], white_ids: Sequence[int],
+                 seed: int | None = None, no_repeats: bool = True):
+        self.rng = random.Random(seed)
+        self.no_repeats = no_repeats
+        self.buckets = {pick: array("q", ids) for pick, ids in buckets.items() if ids}
+        self.black_ids = array("q", sorted(i for ids in self.buckets.values() for i in ids))
+        self.white_ids = array("q", white_ids)
+        self._picks = {i: pick for pick, ids in self.buckets.items() for i in ids}
+        self._black_bags: dict[int | None, ShuffleBag] = {}
+        self._white_bag = ShuffleBag(self.white_ids, self.rng)
+
+    @classmethod
+    def from_db(cls, deck_id: int, seed: int | None = None,
+                no_repeats: bool = True) -> "ComboEngine":
+        """Engine over a stored deck, reading only card IDs and picks."""
+        return cls(db.get_pick_buckets(deck_id), db.get_card_ids(deck_id, "white"),
+                   seed, no_repeats)
+
+    @classmethod
+    def from_picks(cls, picks: Sequence[int], white_count: int,
+                   seed: int | None = None, no_repeats: bool = True) -> "ComboEngine":
+        """Engine over cards identified by list position (e.g. cached rows)."""
+        buckets: dict[int, list[int]] = {}
+        for index, pick in enumerate(picks):
+            buckets.setdefault(pick, []).append(index)
+        return cls(buckets, range(white_count), seed, no_repeats)
+
+    @property
+    def can_draw(self) -> bool:
+        return bool(self.black_ids) and bool(self.white_ids)
+
+    def _black_source(self, pick: int | None) -> Sequence[int]:
+        if pick is None:
+            return self.black_ids
+        if pick not in self.buckets:
+            raise ValueError(f"No black cards with pick {pick}")
+        return self.buckets[pick]
+
+    def _black_bag(self, pick: int | None) -> ShuffleBag:
+        bag = self._black_bags.get(pick)
+        if bag is None:
+            bag = self._black_bags[pick] = ShuffleBag(self._black_source(pick), self.rng)
+        return bag
+
+    def draw(self, pick: int | None = None) -> tuple[int, tuple[int, ...]]:
+        """One combination: (black ID, white IDs)."""
+        if not self.can_draw:
+            raise ValueError("Need black and white cards to draw combinations")
+
+        if self.no_repeats:
+            black_id = self._black_bag(pick).draw()
+            white = self._white_bag.draw_many(self._picks[black_id])
+        else:
+            black_id = self.rng.choice(self._black_source(pick))
+            count = min(self._picks[black_id], len(self.white_ids))
+            white = self.rng.sample(self.white_ids, count)
+        return black_id, tuple(white)
+
+    def generate(self, count: int, pick: int | None = None) -> ComboBatch:
+        """count combinations at once, in compact arrays."""
+        if not self.can_draw:
+            raise ValueError("Need black and white cards to draw combinations")
+
+        batch = ComboBatch()
+        black_out, white_out, offsets = batch.black_ids, batch.white_ids, batch.offsets
+        picks = self._picks
+        white_total = len(self.white_ids)
+
+        if self.no_repeats:
+            draw_black = self._black_bag(pick).draw
+            draw_white = self._white_bag.draw
+            draw_whites = self._white_bag.draw_many
+            for _ in range(count):
+                black_id = draw_black()
+                black_out.append(black_id)
+                if picks[black_id] == 1:
+                    # Common case without the duplicate check
+                    white_out.append(draw_white())
+                else:
+                    white_out.extend(draw_whites(picks[black_id]))
+                offsets.append(len(white_out))
+        else:
+            source = self._black_source(pick)
+            whites = self.white_ids
+            choice, sample = self.rng.choice, self.rng.sample
+            for _ in range(count):
+                black_id = choice(source)
+                black_out.append(black_id)
+                if picks[black_id] == 1:
+                    white_out.append(choice(whites))
+                else:
+                    white_out.extend(sample(whites, min(picks[black_id], white_total)))
+                offsets.append(len(white_out))
+
+        return batch
+
+
+def fill_blanks(text: str, answers: Sequence[str], fmt: str = "{}") -> str:
+    """Put answers into the blanks of a black card text.
+
+    Each answer is formatted with fmt; answers without a blank left are
+    appended at the end.
+    """
+    for answer in answers:
+        answer = fmt.format(answer)
+        if BLANK in text:
+            text = text.replace(BLANK, answer, 1)
+        else:
+            text += f" {answer}"
+    return text
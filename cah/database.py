@@ -1,7 +1,8 @@
 """Default cards database management."""
 
-import json
+import threading
 from pathlib import Path
+from .cardfile import read_cards
 from .models import Card, CardType, Deck, DeckConfig
 
 
@@ -9,31 +10,73 @@ DATA_DIR = Path(__file__).parent.parent / "data"
 CARDS_FILE = DATA_DIR / "cards.json"
 
 
+# Parsed card files: path -> ((mtime_ns, size), black rows, white rows).
+# Rows are (text, pick) tuples; Card objects are built per call because
+# callers own (and may modify) the cards they get.
+_cache: dict[Path, tuple[tuple[int, int], tuple, tuple]] = {}
+_cache_lock = threading.Lock()
+
+
+def invalidate_cache(path: Path | None = None):
+    """Forget parsed card files (all of them, or only path)."""
+    with _cache_lock:
+        if path is None:
+            _cache.clear()
+        else:
+            _cache.pop(Path(path), None)
+
+
+def _load_rows(path: Path | None = None) -> tuple[tuple, tuple]:
+    """(black rows, white rows) of a card file (default CARDS_FILE).
+
+    The file is parsed once; the cached copy is used while its mtime and
+    size are unchanged.
+    """
+    path = Path(path or CARDS_FILE)
+    stat = path.stat()
+    signature = (stat.st_mtime_ns, stat.st_size)
+
+    with _cache_lock:
+        cached = _cache.get(path)
+    if cached and cached[0] == signature:
+        return cached[1], cached[2]
+
+    # Streamed, so a large pack never exists as a JSON tree next to the rows
+    black_rows, white_rows = [], []
+    for card in read_cards(path):
+        rows = black_rows if card.card_type == CardType.BLACK else white_rows
+        rows.append((card.text, card.pick))
+    black_rows, white_rows = tuple(black_rows), tuple(white_rows)
+
+    with _cache_lock:
+        _cache[path] = (signature, black_rows, white_rows)
+    return black_rows, white_rows
+
+
+def default_card_rows() -> tuple[tuple, tuple]:
+    """Default cards as (black rows, white rows) of (text, pick) tuples.
+
+    Served from the cache without building Card objects.
+    """
+    return _load_rows()
+
+
 def load_default_cards() -> tuple[list[Card], list[Card]]:
     """Load default cards from database.
 
     Returns:
         Tuple with (black_cards, white_cards)
     """
-    with open(CARDS_FILE, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    black_rows, white_rows = _load_rows()
 
     black_cards = [
-        Card(
-            text=c["text"],
-            card_type=CardType.BLACK,
-            pick=c.get("pick", 1)
-        )
-        for c in data.get("black_cards", [])
+        Card(text=text, card_type=CardType.BLACK, pick=pick)
+        for text, pick in black_rows
     ]
 
     white_cards = [
-        Card(
-            text=c["text"],
-            card_type=CardType.WHITE,
-            pick=1
-        )
-        for c in data.get("white_cards", [])
+        Card(text=text, card_type=CardType.WHITE, pick=pick)
+        for text, pick in white_rows
     ]
 
     return black_cards, white_cards
@@ -61,9 +104,9 @@ def create_default_deck(config: DeckConfig | None = None) -> Deck:
 
 def get_cards_count() -> dict:
     """Return the card count in the database."""
-    black_cards, white_cards = load_default_cards()
+    black_rows, white_rows = _load_rows()
     return {
-        "black": len(black_cards),
-        "white": len(white_cards),
-        "total": len(black_cards) + len(white_cards)
+        "black": len(black_rows),
+        "white": len(white_rows),
+        "total": len(black_rows) + len(white_rows)
     }
@@ -1,39 +1,278 @@
 """SQLite database for data persistence."""
 
+import hashlib
+import os
+import re
 import sqlite3
+import threading
+import unicodedata
 from pathlib import Path
 from contextlib import contextmanager
-from typing import Optional
-import json
+from itertools import islice
+from typing import Iterable, Iterator, Optional
 
-from .models import Card, CardType, Deck, DeckConfig
+from .models import Card, CardStore, CardType, Deck, DeckConfig
 
 # Database path
 DATA_DIR = Path(__file__).parent.parent / "data"
-DATA_DIR.mkdir(exist_ok=True)
 DB_PATH = DATA_DIR / "cah.db"
 
-
-def get_connection() -> sqlite3.Connection:
-    """Get a database connection."""
-    conn = sqlite3.connect(DB_PATH)
+# Connection tuning (applied once per pooled connection)
+POOL_SIZE = 4
+CACHE_SIZE_KB = 16 * 1024
+BUSY_TIMEOUT_MS = 5000
+
+# Rows per executemany() call in bulk inserts
+BULK_CHUNK_SIZE = 1000
+
+# Full-text search: word characters as the unicode61 tokenizer sees them
+# (letters and digits; "_" is a separator) and "quoted phrases"
+_FTS_TOKEN_RE = re.compile(r"[^\W_]+")
+_FTS_PHRASE_RE = re.compile(r'"([^"]*)"')
+
+# Keeps the full-text index current as cards are added (bulk_add_cards
+# drops it for the length of its transaction and indexes whole chunks)
+_FTS_INSERT_TRIGGER = """AFTER INSERT ON cards BEGIN
+    INSERT INTO cards_fts(rowid, text) VALUES (new.id, new.text);
+END"""
+
+# Card text normalisation for duplicate detection (see normalize_text)
+_NORM_MARKS_RE = re.compile(r"[\u0300-\u036f'\u2019]+")
+_NORM_BLANK_RE = re.compile(r"_+")
+_NORM_PUNCT_RE = re.compile(r"[^\w\s]+")
+
+
+def _ascii_norm_table() -> bytes:
+    """bytes.translate() table doing normalize_text's work on ASCII text."""
+    table = bytearray(range(256))
+    for code in range(128):
+        char = chr(code)
+        if char.isspace() or not (char.isalnum() or char == "_"):
+            table[code] = ord(" ")
+        else:
+            table[code] = ord(char.lower())
+    return bytes(table)
+
+
+_NORM_ASCII_TABLE = _ascii_norm_table()
+_NORM_ASCII_BLANK_RE = re.compile(rb"_+")
+# The same, keeping NUL as a separator between texts normalised together
+_NORM_ASCII_JOINED_TABLE = b"\x00" + _NORM_ASCII_TABLE[1:]
+
+
+def normalize_text(text: str) -> str:
+    """Card text reduced to what matters when comparing cards.
+
+    Case, accents, punctuation and whitespace are ignored and any run of
+    underscores counts as one blank, so "What's  that _____?" and
+    "whats that ___" normalise to the same text.
+    """
+    if text.isascii():
+        # Same result in half the time (text_key runs on every insert)
+        data = text.encode("ascii").translate(_NORM_ASCII_TABLE, b"'")
+        if b"_" in data:
+            data = _NORM_ASCII_BLANK_RE.sub(b" _ ", data)
+        return b" ".join(data.split()).decode("ascii")
+
+    text = unicodedata.normalize("NFKD", text).casefold()
+    text = _NORM_MARKS_RE.sub("", text)
+    text = _NORM_BLANK_RE.sub(" _ ", text)
+    text = _NORM_PUNCT_RE.sub(" ", text)
+    return " ".join(text.split())
+
+
+def text_key(text: str) -> int:
+    """64-bit hash of a card's normalised text.
+
+    Stable across processes and platforms: it is stored in the cards'
+    text_key column, which every insert and text update fills in.
+    """
+    return _hash_key(normalize_text(text).encode("utf-8"))
+
+
+def text_keys(texts: list[str]) -> list[int]:
+    """text_key of each of texts; several times faster for plain ASCII."""
+    joined = "\x00".join(texts)
+    if not joined.isascii() or joined.count("\x00") != len(texts) - 1:
+        return [text_key(text) for text in texts]
+
+    # normalize_text's ASCII path, run over all texts in one go
+    data = joined.encode("ascii").translate(_NORM_ASCII_JOINED_TABLE, b"'")
+    if b"_" in data:
+        data = _NORM_ASCII_BLANK_RE.sub(b" _ ", data)
+    return [_hash_key(b" ".join(text.split())) for text in data.split(b"\x00")]
+
+
+def _hash_key(normalized: bytes) -> int:
+    """text_key of an already normalised, UTF-8 encoded text."""
+    digest = hashlib.blake2b(normalized, digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+def _open_connection(path: Path, check_same_thread: bool = True) -> sqlite3.Connection:
+    """Open a connection and apply the per-connection pragmas."""
+    # Created on first use rather than at import time
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(
+        path,
+        timeout=BUSY_TIMEOUT_MS / 1000,
+        check_same_thread=check_same_thread
+    )
     conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute(f"PRAGMA cache_size = -{CACHE_SIZE_KB}")
     return conn
 
 
+class ConnectionPool:
+    """Thread-aware pool of long-lived SQLite connections.
+
+    Each thread borrows at most one connection at a time: nested
+    ``acquire`` calls from the same thread get the connection it already
+    holds, so an outer ``db_cursor`` block can group several operations
+    into a single transaction. Idle connections are kept for reuse instead
+    of being closed.
+    """
+
+    def __init__(self, path: Path, size: int = POOL_SIZE):
+        self.path = Path(path)
+        self.size = size
+        self._idle: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @property
+    def depth(self) -> int:
+        """Nesting depth of the current thread's checkout (0 = none)."""
+        return getattr(self._local, "depth", 0)
+
+    def acquire(self) -> sqlite3.Connection:
+        """Borrow a connection for the current thread."""
+        if self.depth:
+            self._local.depth += 1
+            return self._local.conn
+
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+        if conn is None:
+            conn = _open_connection(self.path, check_same_thread=False)
+
+        self._local.conn = conn
+        self._local.depth = 1
+        return conn
+
+    def release(self):
+        """Return the current thread's connection once its outermost checkout ends."""
+        self._local.depth -= 1
+        if self._local.depth:
+            return
+
+        conn = self._local.conn
+        self._local.conn = None
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def close(self):
+        """Close all idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def _forget_pool():
+    """Drop the connections a forked child inherits (SQLite connections
+    must not cross fork()); the child opens its own."""
+    global _pool, _pool_lock
+    _pool = None
+    _pool_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_forget_pool)
+
+
+def get_pool() -> ConnectionPool:
+    """Get the connection pool for the current DB_PATH."""
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool.path != Path(DB_PATH):
+            if _pool is not None:
+                _pool.close()
+            _pool = ConnectionPool(DB_PATH)
+        return _pool
+
+
+def close_pool():
+    """Close all pooled connections (e.g. before deleting the database file)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+
+# Commits that changed rows, in this process (see data_version)
+_writes = 0
+_writes_lock = threading.Lock()
+
+
+def data_version() -> tuple:
+    """Token that changes whenever the database contents may have changed.
+
+    Combines a counter of this process's writing commits with the size and
+    mtime of the database and WAL files, which other processes' writes
+    change. Use it to validate cached query results.
+    """
+    files = []
+    for path in (Path(DB_PATH), Path(f"{DB_PATH}-wal")):
+        try:
+            stat = path.stat()
+            files.append((stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            files.append(None)
+    return (_writes, *files)
+
+
+def get_connection() -> sqlite3.Connection:
+    """Get a new, unpooled database connection (caller closes it)."""
+    return _open_connection(DB_PATH)
+
+
 @contextmanager
 def db_cursor():
-    """Context manager for database operations."""
-    conn = get_connection()
+    """Context manager for database operations.
+
+    Borrows a pooled connection. Only the outermost block of a thread
+    commits or rolls back, so nested blocks share one transaction.
+    """
+    global _writes
+    pool = get_pool()
+    conn = pool.acquire()
+    outermost = pool.depth == 1
+    changes = conn.total_changes
     try:
         cursor = conn.cursor()
         yield cursor
-        conn.commit()
+        if outermost:
+            conn.commit()
+            if conn.total_changes != changes:
+                with _writes_lock:
+                    _writes += 1
     except Exception:
-        conn.rollback()
+        if outermost:
+            conn.rollback()
         raise
     finally:
-        conn.close()
+        pool.release()
 
 
 def init_db():
@@ -50,7 +289,9 @@ def init_db():
                 primary_color TEXT DEFAULT '#000000',
                 secondary_color TEXT DEFAULT '#FFFFFF',
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                parent_id INTEGER REFERENCES decks(id),
+                parent_max_id INTEGER
             )
         """)
 
@@ -71,13 +312,78 @@ def init_db():
                 card_type TEXT NOT NULL CHECK(card_type IN ('black', 'white')),
                 pick INTEGER DEFAULT 1,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                origin_id INTEGER,
+                deleted INTEGER NOT NULL DEFAULT 0,
+                text_key INTEGER,
                 FOREIGN KEY (deck_id) REFERENCES decks(id) ON DELETE CASCADE
             )
         """)
 
+        # Migration: deck overlays (see duplicate_deck)
+        cursor.execute("PRAGMA table_info(decks)")
+        if "parent_id" not in [col[1] for col in cursor.fetchall()]:
+            cursor.execute("ALTER TABLE decks ADD COLUMN parent_id INTEGER REFERENCES decks(id)")
+            cursor.execute("ALTER TABLE decks ADD COLUMN parent_max_id INTEGER")
+        cursor.execute("PRAGMA table_info(cards)")
+        if "origin_id" not in [col[1] for col in cursor.fetchall()]:
+            cursor.execute("ALTER TABLE cards ADD COLUMN origin_id INTEGER")
+            cursor.execute("ALTER TABLE cards ADD COLUMN deleted INTEGER NOT NULL DEFAULT 0")
+        # Migration: duplicate keys in a column instead of an index on a
+        # Python function, which connections without it could not write past
+        cursor.execute("PRAGMA table_info(cards)")
+        if "text_key" not in [col[1] for col in cursor.fetchall()]:
+            cursor.execute("DROP INDEX IF EXISTS idx_cards_key")
+            cursor.execute("ALTER TABLE cards ADD COLUMN text_key INTEGER")
+
         # Indexes
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_cards_deck ON cards(deck_id)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_cards_type ON cards(card_type)")
+        # Covers per-type counts and keyset pages ordered by (card_type, id)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_cards_deck_type ON cards(deck_id, card_type)")
+        # Overlay lookups: a deck's children and its overrides of inherited cards
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_decks_parent ON decks(parent_id)")
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_cards_origin ON cards(origin_id, deck_id)
+            WHERE origin_id IS NOT NULL
+        """)
+        # Normalised-text hash for duplicate lookups, within a deck or across
+        # all decks. Not UNIQUE: decks may hold duplicates (copies, imports),
+        # so rejecting them is left to the skip_duplicates guard on insert.
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_cards_key ON cards(text_key, card_type, deck_id)
+        """)
+        _fill_text_keys(cursor)
+
+        # Full-text index over card text, kept in sync by triggers
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'cards_fts'")
+        fts_exists = cursor.fetchone() is not None
+
+        cursor.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS cards_fts USING fts5(
+                text,
+                content='cards',
+                content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2'
+            )
+        """)
+        cursor.execute(f"CREATE TRIGGER IF NOT EXISTS cards_fts_insert {_FTS_INSERT_TRIGGER}")
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS cards_fts_delete AFTER DELETE ON cards BEGIN
+                INSERT INTO cards_fts(cards_fts, rowid, text) VALUES ('delete', old.id, old.text);
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS cards_fts_update AFTER UPDATE OF text ON cards BEGIN
+                INSERT INTO cards_fts(cards_fts, rowid, text) VALUES ('delete', old.id, old.text);
+                INSERT INTO cards_fts(rowid, text) VALUES (new.id, new.text);
+            END
+        """)
+
+        # Migration: index cards that predate the full-text table
+        if not fts_exists:
+            cursor.execute("INSERT INTO cards_fts(cards_fts) VALUES ('rebuild')")
+
+        _create_deck_stats(cursor)
 
         # Migration: rename logo_path to black_logo_path if old schema exists
         cursor.execute("PRAGMA table_info(decks)")
@@ -87,25 +393,169 @@ def init_db():
             cursor.execute("ALTER TABLE decks ADD COLUMN white_logo_path TEXT")
 
 
+def _fill_text_keys(cursor: sqlite3.Cursor):
+    """Key the cards written without a text_key (older databases, other tools)."""
+    while True:
+        cursor.execute("""
+            SELECT id, text FROM cards WHERE text_key IS NULL LIMIT ?
+        """, (BULK_CHUNK_SIZE,))
+        rows = cursor.fetchall()
+        if not rows:
+            return
+        keys = text_keys([text for _, text in rows])
+        cursor.executemany("UPDATE cards SET text_key = ? WHERE id = ?",
+                           [(key, card_id) for key, (card_id, _) in zip(keys, rows)])
+
+
+# What a card row adds to its deck's count: +1 for a live card of the
+# deck's own, -1 for a tombstone hiding an inherited card and 0 for an
+# edited copy of one (the inherited card was already counted)
+def _stats_delta(row: str) -> str:
+    return f"""(CASE WHEN {row}.origin_id IS NULL THEN {row}.deleted = 0
+                ELSE -({row}.deleted != 0) END)"""
+
+
+def _stats_update(row: str, sign: str) -> str:
+    delta = _stats_delta(row)
+    return f"""
+        UPDATE deck_stats SET
+            black_count = black_count {sign} CASE WHEN {row}.card_type = 'black' THEN {delta} ELSE 0 END,
+            white_count = white_count {sign} CASE WHEN {row}.card_type = 'white' THEN {delta} ELSE 0 END
+        WHERE deck_id = {row}.deck_id;
+    """
+
+
+# Counts new cards (bulk_add_cards drops it like cards_fts_insert)
+_STATS_INSERT_TRIGGER = f"""AFTER INSERT ON cards BEGIN
+    {_stats_update("new", "+")}
+END"""
+
+# Per-row triggers that bulk_add_cards replaces with per-chunk statements
+_BULK_INSERT_TRIGGERS = {
+    "cards_fts_insert": _FTS_INSERT_TRIGGER,
+    "deck_stats_card_insert": _STATS_INSERT_TRIGGER
+}
+
+
+def _create_deck_stats(cursor: sqlite3.Cursor):
+    """Per-deck card counts, kept current by triggers on decks and cards.
+
+    A new deck starts with its parent's counts (a duplicate has all its
+    parent's cards), after which only the deck's own rows change them, so
+    duplicated decks are counted correctly without merging their layers.
+    """
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'deck_stats'")
+    stats_exist = cursor.fetchone() is not None
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS deck_stats (
+            deck_id INTEGER PRIMARY KEY REFERENCES decks(id) ON DELETE CASCADE,
+            black_count INTEGER NOT NULL DEFAULT 0,
+            white_count INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS deck_stats_deck_insert AFTER INSERT ON decks BEGIN
+            INSERT INTO deck_stats (deck_id, black_count, white_count)
+            SELECT new.id, COALESCE(SUM(black_count), 0), COALESCE(SUM(white_count), 0)
+            FROM deck_stats WHERE deck_id = new.parent_id;
+        END
+    """)
+    cursor.execute(f"CREATE TRIGGER IF NOT EXISTS deck_stats_card_insert {_STATS_INSERT_TRIGGER}")
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS deck_stats_card_delete AFTER DELETE ON cards BEGIN
+            {_stats_update("old", "-")}
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS deck_stats_card_update
+        AFTER UPDATE OF deck_id, card_type, origin_id, deleted ON cards BEGIN
+            {_stats_update("old", "-")}
+            {_stats_update("new", "+")}
+        END
+    """)
+
+    # Migration: count decks that predate the table
+    if not stats_exist:
+        cursor.execute("INSERT INTO deck_stats (deck_id) SELECT id FROM decks")
+        _check_deck_stats(cursor, repair=True)
+
+
+def _check_deck_stats(cursor: sqlite3.Cursor, repair: bool) -> list[dict]:
+    """Compare deck_stats with counts of the cards themselves (see verify_deck_stats)."""
+    cursor.execute("""
+        SELECT d.id, d.parent_id, s.black_count, s.white_count
+        FROM decks d LEFT JOIN deck_stats s ON s.deck_id = d.id
+    """)
+    decks = cursor.fetchall()
+
+    # Plain decks in one pass over the deck/type index
+    cursor.execute("""
+        SELECT deck_id, card_type, COUNT(*) FROM cards WHERE deleted = 0
+        GROUP BY deck_id, card_type
+    """)
+    stored: dict[int, dict] = {}
+    for deck_id, card_type, count in cursor.fetchall():
+        stored.setdefault(deck_id, {"black": 0, "white": 0})[card_type] = count
+
+    mismatches = []
+    for deck_id, parent_id, black_count, white_count in decks:
+        if parent_id is None:
+            actual = stored.get(deck_id, {"black": 0, "white": 0})
+        else:
+            actual = _count_source(cursor, deck_id)
+        recorded = None if black_count is None else {"black": black_count, "white": white_count}
+        if recorded == actual:
+            continue
+        mismatches.append({"deck_id": deck_id, "recorded": recorded, "actual": actual})
+        if repair:
+            cursor.execute("""
+                INSERT OR REPLACE INTO deck_stats (deck_id, black_count, white_count)
+                VALUES (?, ?, ?)
+            """, (deck_id, actual["black"], actual["white"]))
+    return mismatches
+
+
+def verify_deck_stats(repair: bool = False) -> list[dict]:
+    """Check the stored per-deck card counts against the cards.
+
+    Args:
+        repair: Overwrite wrong counts with the actual ones
+
+    Returns:
+        One entry per deck whose counts were wrong, with deck_id,
+        recorded and actual ({"black": n, "white": n}; recorded is None
+        when the deck had no counts at all)
+    """
+    with db_cursor() as cursor:
+        return _check_deck_stats(cursor, repair)
+
+
+def _recount_deck(cursor: sqlite3.Cursor, deck_id: int):
+    """Reset the counts of a deck that no longer inherits cards."""
+    cursor.execute("""
+        UPDATE deck_stats SET
+            black_count = (SELECT COUNT(*) FROM cards
+                           WHERE deck_id = ?1 AND card_type = 'black' AND deleted = 0),
+            white_count = (SELECT COUNT(*) FROM cards
+                           WHERE deck_id = ?1 AND card_type = 'white' AND deleted = 0)
+        WHERE deck_id = ?1
+    """, (deck_id,))
+
+
 def _seed_default_cards():
     """Load default cards from JSON into database."""
     json_path = DATA_DIR / "cards.json"
     if not json_path.exists():
         return
 
-    with open(json_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    from .cardfile import read_cards
 
     # Create default deck
     deck_id = create_deck("Cards Against Humanity", "CAH")
 
-    # Insert black cards
-    for card_data in data.get("black_cards", []):
-        add_card(deck_id, card_data["text"], CardType.BLACK, card_data.get("pick", 1))
-
-    # Insert white cards
-    for card_data in data.get("white_cards", []):
-        add_card(deck_id, card_data["text"], CardType.WHITE, 1)
+    # Cards stream from the file into the insert
+    bulk_add_cards(deck_id, read_cards(json_path))
 
 
 def ensure_db():
@@ -117,6 +567,288 @@ def ensure_db():
         _seed_default_cards()
 
 
+# === DECK OVERLAYS ===
+#
+# A duplicated deck does not copy its parent's cards. It stores only its
+# own additions, edited copies of inherited cards (origin_id = the ID of
+# the card they replace) and tombstones for inherited cards it deleted
+# (deleted = 1). Its cards are the layers of its ancestor chain merged
+# with index lookups: for every card ID the nearest layer wins.
+# parent_max_id is the last card ID that existed when the deck was
+# duplicated, which hides cards the parent gains later, and before a card
+# that duplicates can see changes in its parent the old version is pushed
+# down into them, so a duplicate keeps the cards it was made with.
+#
+# A deck's own cards are all added after it was made, so their IDs are
+# above its parent_max_id: the layers hold ID ranges that do not overlap,
+# ascending from the root deck, and a deck's cards can be paged through a
+# layer at a time. A card deleted from a deck that has duplicates is only
+# marked deleted, so every card of a merged deck keeps its row in the
+# layer that added it.
+
+def _deck_layers(cursor: sqlite3.Cursor, deck_id: int) -> list[tuple[int, Optional[int]]]:
+    """A deck's layers, nearest first, as (deck ID, highest card ID shown).
+
+    An ancestor shows cards up to the parent_max_id of the layer before
+    it; the deck itself has no bound. A deck that is not a duplicate is
+    its only layer.
+    """
+    layers = []
+    max_id = None
+    while deck_id is not None:
+        layers.append((deck_id, max_id))
+        cursor.execute("SELECT parent_id, parent_max_id FROM decks WHERE id = ?", (deck_id,))
+        row = cursor.fetchone()
+        if row is None:
+            break
+        deck_id, max_id = row
+    return layers
+
+
+def _layer_depth(layers: list[tuple[int, Optional[int]]], column: str) -> str:
+    """SQL for the depth (0 = the deck itself) of the layer named in column."""
+    whens = " ".join(f"WHEN {layer} THEN {depth}" for depth, (layer, _) in enumerate(layers))
+    return f"CASE {column} {whens} END"
+
+
+def _overlay_cards(layers: list[tuple[int, Optional[int]]], card_filter: str = "") -> str:
+    """Table expression over the card rows a duplicated deck shows.
+
+    A row is shown if no nearer layer has a row for the same card (an
+    index lookup on idx_cards_origin), so the query planner can start
+    from any index on cards: the full-text index, idx_cards_key or IDs.
+    Deck IDs and bounds are integers from the decks table and are
+    written into the SQL; card_filter is a condition on the rows r.
+    """
+    deck_id = layers[0][0]
+    decks = ", ".join(str(layer) for layer, _ in layers)
+    bounds = " ".join(f"WHEN {layer} THEN {max_id}" for layer, max_id in layers[1:])
+    return f"""(
+        SELECT COALESCE(r.origin_id, r.id) AS id, {deck_id} AS deck_id, r.text, r.card_type,
+               r.pick, r.created_at, r.text_key, r.id AS row_id
+        FROM cards r
+        WHERE r.deck_id IN ({decks}) AND r.deleted = 0
+          AND (r.origin_id IS NOT NULL OR r.id <= CASE r.deck_id {bounds} ELSE r.id END)
+          AND (r.deck_id = {deck_id} OR NOT EXISTS (
+              SELECT 1 FROM cards o
+              WHERE o.origin_id = COALESCE(r.origin_id, r.id) AND o.deck_id IN ({decks})
+                AND {_layer_depth(layers, "o.deck_id")} < {_layer_depth(layers, "r.deck_id")}
+          ))
+          {card_filter}
+    )"""
+
+
+def _layer_cards(layers: list[tuple[int, Optional[int]]], depth: int) -> str:
+    """Table expression over the cards a duplicated deck shows from one layer.
+
+    Reads the layer's own card rows by ID and looks up each one's nearest
+    edited copy or tombstone, so a query in ID order with a LIMIT reads
+    about that many rows (see get_cards_page).
+    """
+    layer, max_id = layers[depth]
+    bound = "" if max_id is None else f"AND b.id <= {max_id}"
+    nearer = [
+        f"(SELECT id FROM cards WHERE origin_id = b.id AND deck_id = {deck})"
+        for deck, _ in layers[:depth]
+    ]
+    if not nearer:
+        override = "NULL"
+    elif len(nearer) == 1:
+        override = nearer[0]
+    else:
+        override = f"COALESCE({', '.join(nearer)})"
+    return f"""(
+        SELECT b.id, {layers[0][0]} AS deck_id, COALESCE(o.text, b.text) AS text, b.card_type,
+               COALESCE(o.pick, b.pick) AS pick, COALESCE(o.created_at, b.created_at) AS created_at,
+               COALESCE(o.text_key, b.text_key) AS text_key, COALESCE(o.id, b.id) AS row_id
+        FROM cards b LEFT JOIN cards o ON o.id = {override}
+        WHERE b.deck_id = {layer} AND b.origin_id IS NULL {bound}
+          AND COALESCE(o.deleted, b.deleted) = 0
+    )"""
+
+
+def card_source(cursor: sqlite3.Cursor, deck_id: int,
+                card_ids: Optional[list[int]] = None) -> tuple[str, list, str]:
+    """Table expression over a deck's cards, used as ``FROM {source} AS cards``.
+
+    A plain deck reads the cards table itself (and its indexes). For a
+    duplicated deck it is the merged view of its layers, with the columns
+    queries use (id, deck_id, text, card_type, pick, created_at, text_key)
+    plus row_id, the row holding each card's current version.
+
+    Args:
+        cursor: Cursor of the calling transaction
+        deck_id: Deck ID
+        card_ids: Only merge these cards (lets lookups by ID use the index)
+
+    Returns:
+        (source, parameters to pass before the query's own, row ID column)
+    """
+    layers = _deck_layers(cursor, deck_id)
+    if len(layers) == 1:
+        return "(SELECT * FROM cards WHERE deleted = 0)", [], "id"
+
+    if card_ids is None:
+        return _overlay_cards(layers), [], "row_id"
+    placeholders = ", ".join("?" * len(card_ids))
+    card_filter = f"AND (r.id IN ({placeholders}) OR r.origin_id IN ({placeholders}))"
+    return _overlay_cards(layers, card_filter), [*card_ids, *card_ids], "row_id"
+
+
+def _has_duplicates(cursor: sqlite3.Cursor, deck_id: int) -> bool:
+    """Whether any deck was duplicated from this one."""
+    cursor.execute("SELECT 1 FROM decks WHERE parent_id = ? LIMIT 1", (deck_id,))
+    return cursor.fetchone() is not None
+
+
+def _push_down(cursor: sqlite3.Cursor, deck_id: int, card_id: int):
+    """Give a deck's duplicates their own copy of a card about to change."""
+    cursor.execute("SELECT id, parent_max_id FROM decks WHERE parent_id = ?", (deck_id,))
+    children = cursor.fetchall()
+    if not children:
+        return
+
+    source, params, row_column = card_source(cursor, deck_id, [card_id])
+    cursor.execute(f"""
+        SELECT *, {row_column} AS current_row FROM {source} AS cards
+        WHERE deck_id = ? AND id = ?
+    """, [*params, deck_id, card_id])
+    card = cursor.fetchone()
+    if card is None:
+        return
+
+    for child_id, max_id in children:
+        if card["current_row"] == card_id and card_id > max_id:
+            continue  # added after the duplicate was made
+        cursor.execute("""
+            SELECT 1 FROM cards WHERE deck_id = ? AND origin_id = ?
+        """, (child_id, card_id))
+        if cursor.fetchone() is None:
+            cursor.execute("""
+                INSERT INTO cards (deck_id, text, card_type, pick, origin_id, text_key)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (child_id, card["text"], card["card_type"], card["pick"], card_id,
+                  card["text_key"]))
+
+
+def _own_row(cursor: sqlite3.Cursor, deck_id: int, card_id: int) -> Optional[sqlite3.Row]:
+    """The row of a deck's own layer for a card: the card, an edited copy or a tombstone."""
+    # Two lookups (by ID and on idx_cards_origin): with an OR the planner
+    # would scan the whole deck
+    cursor.execute("""
+        SELECT * FROM cards WHERE id = ?1 AND deck_id = ?2 AND origin_id IS NULL
+        UNION ALL
+        SELECT * FROM cards WHERE origin_id = ?1 AND deck_id = ?2
+    """, (card_id, deck_id))
+    return cursor.fetchone()
+
+
+def _purge_deleted(cursor: sqlite3.Cursor, deck_id: Optional[int]):
+    """Drop a deck's deleted cards once no duplicate of it needs them."""
+    if deck_id is None or _has_duplicates(cursor, deck_id):
+        return
+    cursor.execute("""
+        DELETE FROM cards WHERE deck_id = ? AND origin_id IS NULL AND deleted = 1
+    """, (deck_id,))
+
+
+def materialize_deck(deck_id: int):
+    """Give a duplicated deck its own copy of every card it inherits.
+
+    The deck then no longer depends on its parent. All its cards get new
+    IDs, numbered in their current order so the deck keeps its card
+    order, and the deck's own duplicates are materialized first.
+    """
+    with db_cursor() as cursor:
+        cursor.execute("SELECT parent_id FROM decks WHERE id = ?", (deck_id,))
+        row = cursor.fetchone()
+        if row is None or row[0] is None:
+            return
+        parent_id = row[0]
+
+        cursor.execute("SELECT id FROM decks WHERE parent_id = ?", (deck_id,))
+        for (child_id,) in cursor.fetchall():
+            materialize_deck(child_id)
+
+        cursor.execute("SELECT COALESCE(MAX(seq), 0) FROM sqlite_sequence WHERE name = 'cards'")
+        last_old_id = cursor.fetchone()[0]
+        source, params, _ = card_source(cursor, deck_id)
+        cursor.execute(f"""
+            INSERT INTO cards (deck_id, text, card_type, pick, created_at, text_key)
+            SELECT ?, text, card_type, pick, created_at, text_key FROM {source} AS cards
+            ORDER BY id
+        """, [deck_id, *params])
+        cursor.execute("DELETE FROM cards WHERE deck_id = ? AND id <= ?", (deck_id, last_old_id))
+        cursor.execute("""
+            UPDATE decks SET parent_id = NULL, parent_max_id = NULL WHERE id = ?
+        """, (deck_id,))
+        _recount_deck(cursor, deck_id)
+        _purge_deleted(cursor, parent_id)
+
+
+def _absorb_parent(cursor: sqlite3.Cursor, deck_id: int, parent_id: int):
+    """Move a parent's layer into one of its duplicates, keeping card IDs.
+
+    The duplicate takes the parent's place on top of the parent's own
+    parent, if any: the parent's cards it shows become its own rows, with
+    its edited copies and tombstones of them applied, and the parent's
+    edited copies and tombstones it has not replaced move over as they
+    are. What the deck shows, and its duplicates, do not change.
+    """
+    cursor.execute("""
+        SELECT d.parent_max_id, p.parent_id, p.parent_max_id, s.black_count, s.white_count
+        FROM decks d JOIN decks p ON p.id = d.parent_id
+        LEFT JOIN deck_stats s ON s.deck_id = d.id
+        WHERE d.id = ?
+    """, (deck_id,))
+    max_id, grand_id, grand_max_id, black_count, white_count = cursor.fetchone()
+
+    cursor.execute("""
+        SELECT o.id, o.origin_id, o.text, o.pick, o.text_key, o.deleted
+        FROM cards o JOIN cards b ON b.id = o.origin_id
+        WHERE o.deck_id = ? AND b.deck_id = ? AND b.origin_id IS NULL
+    """, (deck_id, parent_id))
+    overrides = cursor.fetchall()
+    cursor.executemany("""
+        UPDATE cards SET text = ?, pick = ?, text_key = ?, deleted = ? WHERE id = ?
+    """, [(row["text"], row["pick"], row["text_key"], row["deleted"], row["origin_id"])
+          for row in overrides])
+    cursor.executemany("DELETE FROM cards WHERE id = ?", [(row["id"],) for row in overrides])
+
+    cursor.execute("""
+        UPDATE cards SET deck_id = ?1
+        WHERE deck_id = ?2 AND (
+            origin_id IS NULL AND id <= ?3
+            OR origin_id IS NOT NULL AND origin_id NOT IN (
+                SELECT origin_id FROM cards WHERE deck_id = ?1 AND origin_id IS NOT NULL
+            )
+        )
+    """, (deck_id, parent_id, max_id))
+    cursor.execute("""
+        UPDATE decks SET parent_id = ?, parent_max_id = ? WHERE id = ?
+    """, (grand_id, grand_max_id, deck_id))
+    # Row moves went through the count triggers, but the cards shown did not change
+    if black_count is not None:
+        cursor.execute("""
+            UPDATE deck_stats SET black_count = ?, white_count = ? WHERE deck_id = ?
+        """, (black_count, white_count, deck_id))
+    _purge_deleted(cursor, deck_id)
+
+
+def _materialize_children(cursor: sqlite3.Cursor, deck_id: int):
+    """Detach the duplicates of a deck whose cards are about to go away.
+
+    The first duplicate takes over the deck's cards with their IDs (see
+    _absorb_parent); any others are materialized.
+    """
+    cursor.execute("SELECT id FROM decks WHERE parent_id = ? ORDER BY id", (deck_id,))
+    children = [child_id for (child_id,) in cursor.fetchall()]
+    for child_id in children[1:]:
+        materialize_deck(child_id)
+    if children:
+        _absorb_parent(cursor, children[0], deck_id)
+
+
 # === DECK OPERATIONS ===
 
 def create_deck(
@@ -134,8 +866,12 @@ def create_deck(
         return cursor.lastrowid
 
 
-def get_deck(deck_id: int) -> Optional[Deck]:
-    """Get a deck by ID."""
+def get_deck(deck_id: int, include_cards: bool = True) -> Optional[Deck]:
+    """Get a deck by ID.
+
+    With include_cards=False only the configuration is loaded and the card
+    lists stay empty; use get_cards_page and count_cards to read cards.
+    """
     with db_cursor() as cursor:
         cursor.execute("SELECT * FROM decks WHERE id = ?", (deck_id,))
         row = cursor.fetchone()
@@ -155,10 +891,14 @@ def get_deck(deck_id: int) -> Optional[Deck]:
         deck = Deck(config=config)
         deck.id = row["id"]
 
+        if not include_cards:
+            return deck
+
         # Load cards
-        cursor.execute("""
-            SELECT * FROM cards WHERE deck_id = ? ORDER BY id
-        """, (deck_id,))
+        source, params, _ = card_source(cursor, deck_id)
+        cursor.execute(f"""
+            SELECT * FROM {source} AS cards WHERE deck_id = ? ORDER BY id
+        """, [*params, deck_id])
 
         for card_row in cursor.fetchall():
             card = Card(
@@ -177,18 +917,21 @@ def get_deck(deck_id: int) -> Optional[Deck]:
 
 
 def list_decks() -> list[dict]:
-    """List all decks."""
+    """List all decks.
+
+    Each entry has the deck's id, name, short_name, parent_id (the deck it
+    was duplicated from) and black_count/white_count, read from deck_stats
+    rather than counted.
+    """
     with db_cursor() as cursor:
         cursor.execute("""
-            SELECT d.id, d.name, d.short_name,
-                   COUNT(CASE WHEN c.card_type = 'black' THEN 1 END) as black_count,
-                   COUNT(CASE WHEN c.card_type = 'white' THEN 1 END) as white_count
+            SELECT d.id, d.name, d.short_name, d.parent_id,
+                   COALESCE(s.black_count, 0) AS black_count,
+                   COALESCE(s.white_count, 0) AS white_count
             FROM decks d
-            LEFT JOIN cards c ON d.id = c.deck_id
-            GROUP BY d.id
+            LEFT JOIN deck_stats s ON s.deck_id = d.id
             ORDER BY d.updated_at DESC
         """)
-
         return [dict(row) for row in cursor.fetchall()]
 
 
@@ -210,42 +953,75 @@ def update_deck(
 
 
 def delete_deck(deck_id: int):
-    """Delete a deck and all its cards."""
+    """Delete a deck and all its cards.
+
+    Decks duplicated from it keep its cards, with their IDs and order.
+    """
     with db_cursor() as cursor:
+        _materialize_children(cursor, deck_id)
+        cursor.execute("SELECT parent_id FROM decks WHERE id = ?", (deck_id,))
+        row = cursor.fetchone()
         cursor.execute("DELETE FROM decks WHERE id = ?", (deck_id,))
+        _purge_deleted(cursor, row[0] if row else None)
 
 
 def duplicate_deck(deck_id: int, new_name: str) -> int:
-    """Duplicate a deck with a new name."""
-    deck = get_deck(deck_id)
-    if not deck:
-        raise ValueError(f"Deck {deck_id} not found")
-
-    new_deck_id = create_deck(
-        new_name,
-        deck.config.short_name,
-        deck.config.black_logo_path,
-        deck.config.white_logo_path
-    )
+    """Duplicate a deck with a new name.
 
+    No cards are copied: the new deck is an overlay on the original (see
+    DECK OVERLAYS above), so this takes the same time for any deck size.
+    """
     with db_cursor() as cursor:
-        cursor.execute("""
-            INSERT INTO cards (deck_id, text, card_type, pick)
-            SELECT ?, text, card_type, pick FROM cards WHERE deck_id = ?
-        """, (new_deck_id, deck_id))
+        cursor.execute("SELECT * FROM decks WHERE id = ?", (deck_id,))
+        row = cursor.fetchone()
+        if not row:
+            raise ValueError(f"Deck {deck_id} not found")
 
-    return new_deck_id
+        cursor.execute("""
+            INSERT INTO decks (name, short_name, black_logo_path, white_logo_path,
+                               primary_color, secondary_color, parent_id, parent_max_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?,
+                    (SELECT COALESCE(MAX(seq), 0) FROM sqlite_sequence WHERE name = 'cards'))
+        """, (new_name, row["short_name"], row["black_logo_path"], row["white_logo_path"],
+              row["primary_color"], row["secondary_color"], deck_id))
+        return cursor.lastrowid
 
 
 # === CARD OPERATIONS ===
 
-def add_card(deck_id: int, text: str, card_type: CardType, pick: int = 1) -> int:
-    """Add a card to a deck and return its ID."""
+def _existing_keys(cursor, deck_id: int, card_type: str, keys: list[int]) -> set[int]:
+    """The keys among keys that a deck already has cards for."""
+    source, params, _ = card_source(cursor, deck_id)
+    found: set[int] = set()
+    # Stay well below SQLite's bound-parameter limit
+    for start in range(0, len(keys), 500):
+        batch = keys[start:start + 500]
+        placeholders = ", ".join("?" * len(batch))
+        cursor.execute(f"""
+            SELECT DISTINCT text_key FROM {source} AS cards
+            WHERE text_key IN ({placeholders})
+              AND card_type = ? AND deck_id = ?
+        """, (*params, *batch, card_type, deck_id))
+        found.update(row[0] for row in cursor.fetchall())
+    return found
+
+
+def add_card(deck_id: int, text: str, card_type: CardType, pick: int = 1,
+             skip_duplicates: bool = False) -> Optional[int]:
+    """Add a card to a deck and return its ID.
+
+    With skip_duplicates, nothing is added (and None returned) if the deck
+    already has a card of the same type with the same normalised text.
+    """
+    key = text_key(text)
     with db_cursor() as cursor:
+        if skip_duplicates and _existing_keys(cursor, deck_id, card_type.value, [key]):
+            return None
+
         cursor.execute("""
-            INSERT INTO cards (deck_id, text, card_type, pick)
-            VALUES (?, ?, ?, ?)
-        """, (deck_id, text, card_type.value, pick))
+            INSERT INTO cards (deck_id, text, card_type, pick, text_key)
+            VALUES (?, ?, ?, ?, ?)
+        """, (deck_id, text, card_type.value, pick, key))
 
         # Update deck timestamp
         cursor.execute("""
@@ -255,36 +1031,224 @@ def add_card(deck_id: int, text: str, card_type: CardType, pick: int = 1) -> int
         return cursor.lastrowid
 
 
-def update_card(card_id: int, text: str, pick: int = 1):
-    """Update a card."""
+def _register_new_cards(cursor: sqlite3.Cursor, after_id: int) -> int:
+    """Add the cards after after_id to the full-text index and deck counts.
+
+    Returns:
+        The last card ID, to pass as after_id next time
+    """
+    cursor.execute("""
+        INSERT INTO cards_fts(rowid, text) SELECT id, text FROM cards WHERE id > ?
+    """, (after_id,))
+    delta = _stats_delta("cards")
+    cursor.execute(f"""
+        SELECT SUM(CASE WHEN card_type = 'black' THEN {delta} ELSE 0 END),
+               SUM(CASE WHEN card_type = 'white' THEN {delta} ELSE 0 END), deck_id
+        FROM cards WHERE id > ? GROUP BY deck_id
+    """, (after_id,))
+    cursor.executemany("""
+        UPDATE deck_stats SET black_count = black_count + ?, white_count = white_count + ?
+        WHERE deck_id = ?
+    """, cursor.fetchall())
+    cursor.execute("SELECT COALESCE(MAX(id), ?) FROM cards", (after_id,))
+    return cursor.fetchone()[0]
+
+
+def _insert_rows(deck_id: int, cards: Iterable[Card]) -> Iterator[tuple]:
+    """Insert rows for cards, keyed a chunk at a time (see text_keys)."""
+    cards = iter(cards)
+    while chunk := list(islice(cards, BULK_CHUNK_SIZE)):
+        keys = text_keys([card.text for card in chunk])
+        for card, key in zip(chunk, keys):
+            yield deck_id, card.text, card.card_type.value, card.pick, key
+
+
+def _skip_duplicates(cursor, deck_id: int, rows: Iterable[tuple]) -> Iterator[tuple]:
+    """Drop insert rows whose text the deck (or an earlier row) already has."""
+    seen: set[tuple[str, int]] = set()
+    while chunk := list(islice(rows, BULK_CHUNK_SIZE)):
+        for card_type in {row[2] for row in chunk}:
+            keys = [row[4] for row in chunk if row[2] == card_type]
+            seen.update((card_type, key) for key in
+                        _existing_keys(cursor, deck_id, card_type, keys))
+        for row in chunk:
+            if (row[2], row[4]) not in seen:
+                seen.add((row[2], row[4]))
+                yield row
+
+
+def bulk_add_cards(deck_id: int, cards: Iterable[Card],
+                   chunk_size: int = BULK_CHUNK_SIZE,
+                   skip_duplicates: bool = False) -> list[int]:
+    """Add many cards to a deck in a single transaction.
+
+    Cards are consumed lazily (any iterable or generator works) and
+    inserted with executemany() in chunks of ``chunk_size``. The deck
+    timestamp is touched once at the end, and each chunk goes into the
+    full-text index and deck counts with one statement each instead of
+    triggers per card.
+    With skip_duplicates, cards whose normalised text the deck already
+    has (or that repeat an earlier card of the batch) are left out.
+
+    Returns:
+        IDs of the new cards, in input order (skipped cards have none)
+    """
+    rows = _insert_rows(deck_id, cards)
+    card_ids: list[int] = []
+
+    with db_cursor() as cursor:
+        if skip_duplicates:
+            rows = _skip_duplicates(cursor, deck_id, rows)
+
+        # Per-row index and count upkeep costs more than the inserts
+        # themselves. Like the inserts, dropping the triggers only takes
+        # effect on commit, and they are back by then, so other connections
+        # always have them. (sqlite3 opens no transaction for DDL, so open
+        # it here.)
+        if not cursor.connection.in_transaction:
+            cursor.execute("BEGIN")
+        for name in _BULK_INSERT_TRIGGERS:
+            cursor.execute(f"DROP TRIGGER {name}")
+        registered_id = cursor.execute("SELECT COALESCE(MAX(id), 0) FROM cards").fetchone()[0]
+        try:
+            while chunk := list(islice(rows, chunk_size)):
+                cursor.executemany("""
+                    INSERT INTO cards (deck_id, text, card_type, pick, text_key)
+                    VALUES (?, ?, ?, ?, ?)
+                """, chunk)
+                # Rows of one chunk get consecutive IDs: the transaction holds
+                # the write lock and cards.id is AUTOINCREMENT
+                last_id = cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+                card_ids.extend(range(last_id - len(chunk) + 1, last_id + 1))
+                registered_id = _register_new_cards(cursor, registered_id)
+        finally:
+            # Also covers a chunk cut short by an error the caller handles
+            _register_new_cards(cursor, registered_id)
+            for name, trigger in _BULK_INSERT_TRIGGERS.items():
+                cursor.execute(f"CREATE TRIGGER {name} {trigger}")
+
+        if card_ids:
+            cursor.execute("""
+                UPDATE decks SET updated_at = CURRENT_TIMESTAMP WHERE id = ?
+            """, (deck_id,))
+
+    return card_ids
+
+
+def replace_cards(deck_id: int, cards: Iterable[Card]) -> list[int]:
+    """Replace all cards of a deck in a single transaction.
+
+    Decks duplicated from it keep their cards, and a duplicated deck stops
+    inheriting from its parent.
+
+    Returns:
+        IDs of the new cards, in input order
+    """
     with db_cursor() as cursor:
+        _materialize_children(cursor, deck_id)
         cursor.execute("""
-            UPDATE cards SET text = ?, pick = ? WHERE id = ?
-        """, (text, pick, card_id))
+            UPDATE decks SET parent_id = NULL, parent_max_id = NULL WHERE id = ?
+        """, (deck_id,))
+        cursor.execute("DELETE FROM cards WHERE deck_id = ?", (deck_id,))
+        _recount_deck(cursor, deck_id)
+        return bulk_add_cards(deck_id, cards)
+
+
+def _card_deck(cursor: sqlite3.Cursor, card_id: int) -> Optional[int]:
+    """Deck of the row with a card's ID."""
+    cursor.execute("SELECT deck_id FROM cards WHERE id = ?", (card_id,))
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def update_card(card_id: int, text: str, pick: int = 1, deck_id: Optional[int] = None):
+    """Update a card.
+
+    Pass the deck being edited as deck_id: in a duplicated deck, editing
+    an inherited card stores an edited copy instead of changing the
+    original. Without it the card is changed in the deck that stores it.
+    """
+    with db_cursor() as cursor:
+        if deck_id is None:
+            deck_id = _card_deck(cursor, card_id)
+            if deck_id is None:
+                return
+
+        _push_down(cursor, deck_id, card_id)
+        own = _own_row(cursor, deck_id, card_id)
+        if own is not None:
+            if own["deleted"]:
+                return
+            cursor.execute("""
+                UPDATE cards SET text = ?, pick = ?, text_key = ? WHERE id = ?
+            """, (text, pick, text_key(text), own["id"]))
+        else:
+            card = get_card(card_id, deck_id)
+            if card is None:
+                return
+            cursor.execute("""
+                INSERT INTO cards (deck_id, text, card_type, pick, origin_id, text_key)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (deck_id, text, card.card_type.value, pick, card_id, text_key(text)))
 
         # Update deck timestamp
         cursor.execute("""
-            UPDATE decks SET updated_at = CURRENT_TIMESTAMP
-            WHERE id = (SELECT deck_id FROM cards WHERE id = ?)
-        """, (card_id,))
+            UPDATE decks SET updated_at = CURRENT_TIMESTAMP WHERE id = ?
+        """, (deck_id,))
 
 
-def delete_card(card_id: int):
-    """Delete a card."""
+def delete_card(card_id: int, deck_id: Optional[int] = None):
+    """Delete a card.
+
+    As with update_card, pass the deck being edited: deleting an inherited
+    card from a duplicated deck leaves a tombstone that hides it there.
+    """
     with db_cursor() as cursor:
-        # Update deck timestamp before deleting
+        if deck_id is None:
+            deck_id = _card_deck(cursor, card_id)
+            if deck_id is None:
+                return
+
+        _push_down(cursor, deck_id, card_id)
+        own = _own_row(cursor, deck_id, card_id)
+        if own is not None and own["deleted"]:
+            return
+        if own is not None and own["origin_id"] is None and not _has_duplicates(cursor, deck_id):
+            cursor.execute("DELETE FROM cards WHERE id = ?", (card_id,))
+        elif own is not None:
+            # An edited copy (the original would show again) or a card the
+            # copies pushed down to duplicates replace (see DECK OVERLAYS)
+            cursor.execute("UPDATE cards SET deleted = 1 WHERE id = ?", (own["id"],))
+        else:
+            card = get_card(card_id, deck_id)
+            if card is None:
+                return
+            cursor.execute("""
+                INSERT INTO cards (deck_id, text, card_type, pick, origin_id, deleted, text_key)
+                VALUES (?, ?, ?, ?, ?, 1, ?)
+            """, (deck_id, card.text, card.card_type.value, card.pick, card_id,
+                  text_key(card.text)))
+
+        # Update deck timestamp
         cursor.execute("""
-            UPDATE decks SET updated_at = CURRENT_TIMESTAMP
-            WHERE id = (SELECT deck_id FROM cards WHERE id = ?)
-        """, (card_id,))
+            UPDATE decks SET updated_at = CURRENT_TIMESTAMP WHERE id = ?
+        """, (deck_id,))
 
-        cursor.execute("DELETE FROM cards WHERE id = ?", (card_id,))
 
+def get_card(card_id: int, deck_id: Optional[int] = None) -> Optional[Card]:
+    """Get a card by ID.
 
-def get_card(card_id: int) -> Optional[Card]:
-    """Get a card by ID."""
+    With deck_id, the card as that deck sees it (None if it has no such
+    card), which differs from the stored row for duplicated decks.
+    """
     with db_cursor() as cursor:
-        cursor.execute("SELECT * FROM cards WHERE id = ?", (card_id,))
+        if deck_id is None:
+            cursor.execute("SELECT * FROM cards WHERE id = ? AND deleted = 0", (card_id,))
+        else:
+            source, params, _ = card_source(cursor, deck_id, [card_id])
+            cursor.execute(f"""
+                SELECT * FROM {source} AS cards WHERE deck_id = ? AND id = ?
+            """, [*params, deck_id, card_id])
         row = cursor.fetchone()
 
         if not row:
@@ -299,11 +1263,86 @@ def get_card(card_id: int) -> Optional[Card]:
         return card
 
 
+def _row_to_card(row: sqlite3.Row) -> Card:
+    """Build a Card from a cards table row."""
+    return Card(
+        text=row["text"],
+        card_type=CardType(row["card_type"]),
+        pick=row["pick"],
+        id=row["id"]
+    )
+
+
+def build_fts_query(query: str) -> Optional[str]:
+    """Translate user input into an FTS5 MATCH expression.
+
+    Text in double quotes becomes a phrase query; every other word is a
+    prefix query, so "hap mon" finds "Happy Monday". All terms must match.
+
+    Returns:
+        The MATCH expression, or None if the input has no searchable words
+    """
+    terms = []
+    for phrase in _FTS_PHRASE_RE.findall(query):
+        words = _FTS_TOKEN_RE.findall(phrase)
+        if words:
+            terms.append('"' + " ".join(words) + '"')
+
+    for word in _FTS_TOKEN_RE.findall(_FTS_PHRASE_RE.sub(" ", query)):
+        terms.append(f'"{word}"*')
+
+    return " ".join(terms) or None
+
+
+def search_cards_ranked(deck_id: int, query: str, card_type: Optional[str] = None,
+                        limit: int = 50) -> list[Card]:
+    """Full-text search in a deck, best matches first (bm25 ranking).
+
+    Supports prefix matching on every word and "quoted phrases".
+    """
+    match = build_fts_query(query)
+    if match is None:
+        return []
+
+    with db_cursor() as cursor:
+        source, params, row_column = card_source(cursor, deck_id)
+        sql = f"""
+            SELECT c.* FROM cards_fts
+            JOIN {source} c ON c.{row_column} = cards_fts.rowid
+            WHERE cards_fts MATCH ? AND c.deck_id = ?
+        """
+        params += [match, deck_id]
+
+        if card_type:
+            sql += " AND c.card_type = ?"
+            params.append(card_type)
+
+        sql += " ORDER BY bm25(cards_fts) LIMIT ?"
+        params.append(limit)
+        cursor.execute(sql, params)
+
+        return [_row_to_card(row) for row in cursor.fetchall()]
+
+
+def _search_filter(query: str, row_column: str = "id") -> tuple[str, list]:
+    """SQL condition (on the row ID column and text) matching a search query.
+
+    Uses the full-text index; input without searchable words (e.g. only
+    "_____") falls back to a substring scan.
+    """
+    match = build_fts_query(query)
+    if match is None:
+        return "text LIKE ?", [f"%{query}%"]
+    return f"{row_column} IN (SELECT rowid FROM cards_fts WHERE cards_fts MATCH ?)", [match]
+
+
 def search_cards(deck_id: int, query: str, card_type: Optional[str] = None) -> list[Card]:
-    """Search cards in a deck."""
+    """Search cards in a deck, in deck order."""
     with db_cursor() as cursor:
-        sql = "SELECT * FROM cards WHERE deck_id = ? AND text LIKE ?"
-        params = [deck_id, f"%{query}%"]
+        source, params, row_column = card_source(cursor, deck_id)
+        condition, search_params = _search_filter(query, row_column)
+        sql = f"SELECT * FROM {source} AS cards WHERE deck_id = ? AND {condition}"
+        params += [deck_id, *search_params]
 
         if card_type:
             sql += " AND card_type = ?"
@@ -312,18 +1351,255 @@ def search_cards(deck_id: int, query: str, card_type: Optional[str] = None) -> l
         sql += " ORDER BY id"
         cursor.execute(sql, params)
 
-        cards = []
-        for row in cursor.fetchall():
-            card = Card(
-                text=row["text"],
-                card_type=CardType(row["card_type"]),
-                pick=row["pick"]
-            )
-            card.id = row["id"]
-            cards.append(card)
+        return [_row_to_card(row) for row in cursor.fetchall()]
+
+
+def get_cards_page(
+    deck_id: int,
+    card_type: Optional[str] = None,
+    search: Optional[str] = None,
+    after_id: Optional[int] = None,
+    limit: int = 30,
+    after_type: Optional[str] = None
+) -> list[Card]:
+    """Get one page of a deck's cards using keyset pagination.
+
+    Cards are ordered black before white, then by ID. Pass the last card of
+    the previous page as after_id (and, when card_type is None, its type as
+    after_type) to get the next page. The cost of a page does not depend on
+    how far into the deck it is.
+
+    Args:
+        deck_id: Deck ID
+        card_type: "black", "white" or None for both
+        search: Optional search query (see build_fts_query)
+        after_id: ID of the last card of the previous page
+        limit: Page size
+        after_type: Type of the after_id card (looked up if omitted)
+
+    Returns:
+        Up to ``limit`` cards
+    """
+    if card_type is None:
+        # Walk the black segment, then the white one: each is a plain
+        # index range scan on (deck_id, card_type, id)
+        if after_id is not None and after_type is None:
+            after_card = get_card(after_id, deck_id)
+            after_type = after_card.card_type.value if after_card else CardType.WHITE.value
 
+        cards = []
+        if after_id is None or after_type == CardType.BLACK.value:
+            cards = get_cards_page(deck_id, CardType.BLACK.value, search, after_id, limit)
+            after_id = None
+        if len(cards) < limit:
+            cards += get_cards_page(deck_id, CardType.WHITE.value, search, after_id,
+                                    limit - len(cards))
         return cards
 
+    with db_cursor() as cursor:
+        layers = _deck_layers(cursor, deck_id)
+        if len(layers) > 1 and not search:
+            rows = _layered_page(cursor, layers, card_type, after_id, limit)
+            return [_row_to_card(row) for row in rows]
+
+        source, params, row_column = card_source(cursor, deck_id)
+        sql = f"SELECT * FROM {source} AS cards WHERE deck_id = ? AND card_type = ?"
+        params += [deck_id, card_type]
+
+        if search:
+            condition, search_params = _search_filter(search, row_column)
+            sql += f" AND {condition}"
+            params.extend(search_params)
+
+        if after_id is not None:
+            sql += " AND id > ?"
+            params.append(after_id)
+
+        sql += " ORDER BY id LIMIT ?"
+        params.append(limit)
+
+        cursor.execute(sql, params)
+        return [_row_to_card(row) for row in cursor.fetchall()]
+
+
+def _layered_page(cursor: sqlite3.Cursor, layers: list[tuple[int, Optional[int]]],
+                  card_type: str, after_id: Optional[int], limit: int) -> list[sqlite3.Row]:
+    """A get_cards_page page of a duplicated deck, read a layer at a time.
+
+    Layers hold ascending ID ranges from the root deck up (see DECK
+    OVERLAYS), so the page continues in the first layer whose range ends
+    after after_id and each layer is an index range scan.
+    """
+    rows: list[sqlite3.Row] = []
+    for depth in reversed(range(len(layers))):
+        max_id = layers[depth][1]
+        if after_id is not None and max_id is not None and after_id >= max_id:
+            continue
+        cursor.execute(f"""
+            SELECT * FROM {_layer_cards(layers, depth)} AS cards
+            WHERE card_type = ? AND id > ? ORDER BY id LIMIT ?
+        """, (card_type, after_id or 0, limit - len(rows)))
+        rows += cursor.fetchall()
+        if len(rows) == limit:
+            break
+    return rows
+
+
+def iter_cards(deck_id: int, card_type: Optional[str] = None,
+               chunk_size: int = BULK_CHUNK_SIZE, after_id: Optional[int] = None,
+               after_type: Optional[str] = None) -> Iterator[Card]:
+    """Iterate over a deck's cards without loading the whole deck.
+
+    Cards come in the get_cards_page order (black before white, then by
+    ID), fetched ``chunk_size`` at a time, starting after the after_id
+    card if given (see get_cards_page). No connection is held between
+    chunks, so the consumer may take as long as it likes over each card.
+    """
+    while True:
+        cards = get_cards_page(deck_id, card_type, after_id=after_id,
+                               limit=chunk_size, after_type=after_type)
+        yield from cards
+        if len(cards) < chunk_size:
+            return
+        after_id = cards[-1].id
+        after_type = cards[-1].card_type.value
+
+
+def get_card_store(deck_id: int, card_type: Optional[str] = None) -> CardStore:
+    """Load a deck's cards into a columnar CardStore.
+
+    Rows go straight into the store's arrays and string tables without
+    creating Card objects; cards are ordered black before white, then by ID.
+    """
+    types = {t.value: t for t in CardType}
+    store = CardStore()
+
+    with db_cursor() as cursor:
+        source, params, _ = card_source(cursor, deck_id)
+        sql = f"SELECT id, text, card_type, pick FROM {source} AS cards WHERE deck_id = ?"
+        params.append(deck_id)
+        if card_type:
+            sql += " AND card_type = ?"
+            params.append(card_type)
+        sql += " ORDER BY card_type, id"
+
+        cursor.execute(sql, params)
+        for card_id, text, type_value, pick in cursor:
+            store.append(text, types[type_value], pick, card_id)
+
+    store.compact()
+    return store
+
+
+def get_card_ids(deck_id: int, card_type: Optional[str] = None,
+                 search: Optional[str] = None) -> list[int]:
+    """Get the IDs of a deck's cards in page order (black first, then by ID).
+
+    Much cheaper than loading the cards themselves; used to scroll through
+    a whole deck while only fetching the visible cards with get_cards_by_ids.
+    """
+    with db_cursor() as cursor:
+        source, params, row_column = card_source(cursor, deck_id)
+        sql = f"SELECT id FROM {source} AS cards WHERE deck_id = ?"
+        params.append(deck_id)
+
+        if card_type:
+            sql += " AND card_type = ?"
+            params.append(card_type)
+
+        if search:
+            condition, search_params = _search_filter(search, row_column)
+            sql += f" AND {condition}"
+            params.extend(search_params)
+
+        sql += " ORDER BY card_type, id"
+
+        cursor.execute(sql, params)
+        return [row[0] for row in cursor.fetchall()]
+
+
+def get_pick_buckets(deck_id: int) -> dict[int, list[int]]:
+    """IDs of a deck's black cards grouped by pick count."""
+    buckets: dict[int, list[int]] = {}
+    with db_cursor() as cursor:
+        source, params, _ = card_source(cursor, deck_id)
+        cursor.execute(f"""
+            SELECT pick, id FROM {source} AS cards
+            WHERE deck_id = ? AND card_type = ?
+            ORDER BY pick, id
+        """, [*params, deck_id, CardType.BLACK.value])
+        for pick, card_id in cursor:
+            buckets.setdefault(pick, []).append(card_id)
+    return buckets
+
+
+def get_cards_by_ids(card_ids: list[int], deck_id: Optional[int] = None) -> list[Card]:
+    """Get cards by ID, in the order given (missing IDs are skipped).
+
+    With deck_id, the cards as that deck sees them (see get_card).
+    """
+    found: dict[int, Card] = {}
+
+    with db_cursor() as cursor:
+        # Stay well below SQLite's bound-parameter limit
+        for start in range(0, len(card_ids), 250):
+            chunk = card_ids[start:start + 250]
+            placeholders = ", ".join("?" * len(chunk))
+            if deck_id is None:
+                cursor.execute(f"""
+                    SELECT * FROM cards WHERE id IN ({placeholders}) AND deleted = 0
+                """, chunk)
+            else:
+                source, params, _ = card_source(cursor, deck_id, chunk)
+                cursor.execute(f"""
+                    SELECT * FROM {source} AS cards
+                    WHERE deck_id = ? AND id IN ({placeholders})
+                """, [*params, deck_id, *chunk])
+            for row in cursor.fetchall():
+                found[row["id"]] = _row_to_card(row)
+
+    return [found[card_id] for card_id in card_ids if card_id in found]
+
+
+def _count_source(cursor: sqlite3.Cursor, deck_id: int, search: Optional[str] = None) -> dict:
+    """Count a deck's cards per type from the cards themselves."""
+    source, params, row_column = card_source(cursor, deck_id)
+    sql = f"SELECT card_type, COUNT(*) AS count FROM {source} AS cards WHERE deck_id = ?"
+    params.append(deck_id)
+
+    if search:
+        condition, search_params = _search_filter(search, row_column)
+        sql += f" AND {condition}"
+        params.extend(search_params)
+
+    sql += " GROUP BY card_type"
+
+    cursor.execute(sql, params)
+    counts = {"black": 0, "white": 0}
+    counts.update({row["card_type"]: row["count"] for row in cursor.fetchall()})
+    return counts
+
+
+def count_cards(deck_id: int, search: Optional[str] = None) -> dict:
+    """Count a deck's cards per type, optionally only those matching a search.
+
+    Without a search the counts come from deck_stats.
+
+    Returns:
+        Dictionary with "black" and "white" counts
+    """
+    with db_cursor() as cursor:
+        if search:
+            return _count_source(cursor, deck_id, search)
+
+        cursor.execute("""
+            SELECT black_count, white_count FROM deck_stats WHERE deck_id = ?
+        """, (deck_id,))
+        row = cursor.fetchone()
+        if row is None:
+            return {"black": 0, "white": 0}
+        return {"black": row["black_count"], "white": row["white_count"]}
+
 
 # === UTILITIES ===
 
@@ -356,15 +1632,17 @@ def set_default_deck_id(deck_id: int):
 
 
 def get_stats() -> dict:
-    """Get global statistics."""
+    """Get global statistics.
+
+    Card counts are summed per deck, so cards a duplicated deck inherits
+    count once for every deck that has them.
+    """
     with db_cursor() as cursor:
         cursor.execute("""
-            SELECT
-                COUNT(DISTINCT d.id) as deck_count,
-                COUNT(CASE WHEN c.card_type = 'black' THEN 1 END) as black_count,
-                COUNT(CASE WHEN c.card_type = 'white' THEN 1 END) as white_count
+            SELECT COUNT(*) AS deck_count,
+                   COALESCE(SUM(s.black_count), 0) AS black_count,
+                   COALESCE(SUM(s.white_count), 0) AS white_count
             FROM decks d
-            LEFT JOIN cards c ON d.id = c.deck_id
+            LEFT JOIN deck_stats s ON s.deck_id = d.id
         """)
-        row = cursor.fetchone()
-        return dict(row)
+        return dict(cursor.fetchone())
@@ -0,0 +1,137 @@
+"""Observable model of the deck being edited."""
+
+from typing import Callable, Iterable
+
+from . import db
+from .models import Card, CardType, Deck, DeckConfig
+
+# Event kinds passed to listeners
+ADDED = "add"
+UPDATED = "update"
+DELETED = "delete"
+
+Listener = Callable[[str, Card], None]
+
+
+class DeckModel:
+    """One deck's configuration, card counts and the cards seen so far.
+
+    Edits go through the model, which writes them to the database, keeps
+    its id-indexed cards and counts current and notifies listeners with
+    (kind, card). A listener can then patch just what the change affects
+    instead of reloading the deck. Cards are not loaded up front: views
+    register the pages they fetch with remember().
+    """
+
+    def __init__(self, deck: Deck, counts: dict | None = None):
+        self.deck = deck
+        self.counts = dict(counts) if counts is not None else db.count_cards(deck.id)
+        self._cards: dict[int, Card] = {}
+        self._listeners: list[Listener] = []
+
+    @classmethod
+    def load(cls, deck_id: int, counts: dict | None = None) -> "DeckModel | None":
+        """Model of a stored deck (its cards stay in the database)."""
+        deck = db.get_deck(deck_id, include_cards=False)
+        if deck is None:
+            return None
+        return cls(deck, counts)
+
+    @classmethod
+    def create(cls, config: DeckConfig, cards: Iterable[Card] = ()) -> "DeckModel":
+        """Create a deck, optionally with cards, without reading it back."""
+        config.short_name = config.short_name[:5].upper()
+        counts = {"black": 0, "white": 0}
+
+        def counted(cards):
+            for card in cards:
+                counts[card.card_type.value] += 1
+                yield card
+
+        with db.db_cursor():
+            deck_id = db.create_deck(config.name, config.short_name,
+                                     config.black_logo_path, config.white_logo_path)
+            db.bulk_add_cards(deck_id, counted(cards))
+
+        return cls(Deck(config=config, id=deck_id), counts)
+
+    @property
+    def id(self) -> int:
+        return self.deck.id
+
+    @property
+    def config(self) -> DeckConfig:
+        return self.deck.config
+
+    def subscribe(self, listener: Listener) -> Listener:
+        self._listeners.append(listener)
+        return listener
+
+    def unsubscribe(self, listener: Listener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _emit(self, kind: str, card: Card):
+        for listener in list(self._listeners):
+            listener(kind, card)
+
+    def remember(self, cards: list[Card]) -> list[Card]:
+        """Index fetched cards; returns them with already known cards reused.
+
+        Reusing the indexed objects means an edited card is the same object
+        in every view that shows it.
+        """
+        known = []
+        for card in cards:
+            known.append(self._cards.setdefault(card.id, card))
+        return known
+
+    def get(self, card_id: int) -> Card | None:
+        """A card by ID (from the index, else from the database)."""
+        card = self._cards.get(card_id)
+        if card is None:
+            card = db.get_card(card_id, self.id)
+            if card is not None:
+                self._cards[card_id] = card
+        return card
+
+    def add_card(self, text: str, card_type: CardType, pick: int = 1) -> Card:
+        card_id = db.add_card(self.id, text, card_type, pick)
+        card = Card(text=text, card_type=card_type, pick=pick, id=card_id)
+        self._cards[card_id] = card
+        self.counts[card_type.value] += 1
+        self._emit(ADDED, card)
+        return card
+
+    def add_cards(self, cards: list[Card]) -> list[Card]:
+        """Bulk-insert cards (one transaction), then emit one event per card."""
+        card_ids = db.bulk_add_cards(self.id, cards)
+        added = []
+        for card, card_id in zip(cards, card_ids):
+            card = Card(text=card.text, card_type=card.card_type, pick=card.pick, id=card_id)
+            self._cards[card_id] = card
+            self.counts[card.card_type.value] += 1
+            added.append(card)
+        for card in added:
+            self._emit(ADDED, card)
+        return added
+
+    def update_card(self, card_id: int, text: str, pick: int = 1) -> Card | None:
+        card = self.get(card_id)
+        if card is None:
+            return None
+        db.update_card(card_id, text, pick, self.id)
+        card.text = text
+        card.pick = pick
+        self._emit(UPDATED, card)
+        return card
+
+    def delete_card(self, card_id: int) -> Card | None:
+        card = self.get(card_id)
+        if card is None:
+            return None
+        db.delete_card(card_id, self.id)
+        del self._cards[card_id]
+        self.counts[card.card_type.value] -= 1
+        self._emit(DELETED, card)
+        return card
@@ -1,57 +1,446 @@
-"""Custom deck management."""
-
+"""Custom deck management.
+
+Deck files are written incrementally. A deck's JSON file is a snapshot,
+and changes saved since then are appended to a journal next to it
+(deck.json.journal) as one JSON line per change. Loading a deck replays
+the journal over the snapshot. Once the journal outgrows a share of the
+snapshot it is compacted in the background: the snapshot is rewritten
+to a temporary file and renamed over the old one.
+
+The snapshot names its journal ("journal": {"id", "seq"}), and journal
+lines carry the same id and a sequence number, so a crash at any point
+leaves a consistent deck. Lines the snapshot already contains are
+skipped, and a journal left over from another snapshot is ignored.
+Snapshots stay plain deck files for anything that reads them with
+Deck.load.
+"""
+
+import atexit
 import json
+import os
+import tempfile
+import threading
+import uuid
 from pathlib import Path
+from .cardfile import CARD_LISTS, CardFileReader, read_header
 from .models import Deck, DeckConfig, Card, CardType
 
 
 DECKS_DIR = Path(__file__).parent.parent / "decks"
 
+JOURNAL_SUFFIX = ".journal"
+# Compact once the journal is larger than this share of the snapshot...
+COMPACT_RATIO = 0.5
+# ...and at least this large, so small decks are not rewritten on every save
+COMPACT_MIN_BYTES = 64 * 1024
+
 
 def ensure_decks_dir():
     """Ensure the decks directory exists."""
     DECKS_DIR.mkdir(exist_ok=True)
 
 
-def list_saved_decks() -> list[dict]:
-    """List all saved decks.
+def deck_filename(filename: str) -> str:
+    """Deck file name with the .json extension."""
+    if not filename.endswith(".json"):
+        filename += ".json"
+    return filename
+
+
+def journal_path(path: Path) -> Path:
+    """Journal file of a deck file."""
+    return path.with_name(path.name + JOURNAL_SUFFIX)
+
+
+def _splice(old: list, new: list) -> tuple[int, int, list] | None:
+    """Smallest single replacement turning old into new.
 
     Returns:
-        List of dictionaries with deck info
+        (start, number of items removed, items inserted), or None if the
+        lists are equal
     """
-    ensure_decks_dir()
-    decks = []
+    limit = min(len(old), len(new))
+    start = 0
+    while start < limit and old[start] == new[start]:
+        start += 1
+    if start == len(old) == len(new):
+        return None
+
+    end = 0
+    while end < limit - start and old[-1 - end] == new[-1 - end]:
+        end += 1
+    return start, len(old) - start - end, new[start:len(new) - end]
+
+
+def _read_journal(path: Path, journal_id: str | None, seq: int) -> tuple[list[dict], int, int]:
+    """Entries of a journal newer than seq.
+
+    Lines of another snapshot's journal are skipped, and reading stops at
+    a torn last line.
+
+    Returns:
+        (entries, size of the whole lines, file size)
+    """
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return [], 0, 0
+
+    entries = []
+    with f:
+        valid = 0
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                break  # torn write at the end
+            valid += len(line)
+            if journal_id is None or entry.get("id") != journal_id:
+                continue  # journal of another snapshot
+            if entry["seq"] > seq:
+                entries.append(entry)
+        size = f.seek(0, os.SEEK_END)
+    return entries, valid, size
+
+
+def read_deck_summary(path: Path) -> dict:
+    """Config and card counts of a deck file, without reading its cards.
+
+    The counts come from the snapshot's header (see cardfile.read_header)
+    and the journal's changes to them.
+
+    Returns:
+        Dictionary with "config", "black_count" and "white_count"
+    """
+    header = read_header(path)
+    config = header.get("config", {})
+    counts = {"black": header["black_count"], "white": header["white_count"]}
+    journal = header.get("journal") or {}
+
+    entries, _, _ = _read_journal(journal_path(path), journal.get("id"), journal.get("seq", 0))
+    for entry in entries:
+        if entry["op"] == "config":
+            config = entry["config"]
+        elif entry["op"] == "splice":
+            counts[entry["card_type"]] += len(entry["cards"]) - entry["delete"]
+
+    return {"config": config, "black_count": counts["black"], "white_count": counts["white"]}
 
-    for deck_file in DECKS_DIR.glob("*.json"):
+
+class DeckJournal:
+    """A deck file and its journal of changes.
+
+    Keeps the deck's last saved cards as (text, pick) pairs, so a save
+    only has to append what differs from them. If the files were changed
+    by someone else since, they are read again first.
+
+    Args:
+        path: Deck file (the snapshot)
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.journal_path = journal_path(self.path)
+        self._lock = threading.RLock()
+        self._compactor: threading.Thread | None = None
+        self._stamp = None
+        self.config: dict = {}
+        self.cards: dict[str, list[tuple[str, int]]] = {"black": [], "white": []}
+        self.journal_id: str | None = None
+        self.seq = 0
+        self.snapshot_size = 0
+        self.journal_size = 0
+
+    def _file_stamp(self) -> tuple:
+        stamps = []
+        for path in (self.path, self.journal_path):
+            try:
+                stat = path.stat()
+                stamps.append((stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                stamps.append(None)
+        return tuple(stamps)
+
+    def _refresh(self):
+        """Read the files again if they changed since this journal last did."""
+        stamp = self._file_stamp()
+        if stamp != self._stamp:
+            self._read()
+            self._stamp = self._file_stamp()
+
+    def _read(self):
+        config, header = None, {}
+        cards = {"black": [], "white": []}
+        # Streamed: the cards go straight into rows, no JSON tree of the deck
+        with open(self.path, "r", encoding="utf-8") as f:
+            for key, value in CardFileReader(f).members():
+                if key in CARD_LISTS:
+                    cards[CARD_LISTS[key].value] = [(c["text"], c.get("pick", 1)) for c in value]
+                elif key == "config":
+                    config = value
+                elif key == "journal":
+                    header = value or {}
+        if config is None:
+            raise KeyError("config")
+
+        self.config, self.cards = config, cards
+        self.journal_id = header.get("id")
+        self.seq = header.get("seq", 0)
+        self.snapshot_size = self.path.stat().st_size
+
+        entries, valid, size = _read_journal(self.journal_path, self.journal_id, self.seq)
+        for entry in entries:
+            self._apply(entry)
+            self.seq = entry["seq"]
+
+        if valid < size:
+            # Drop the torn line so appends start on a line of their own
+            os.truncate(self.journal_path, valid)
+        self.journal_size = valid
+
+    def _apply(self, entry: dict):
+        if entry["op"] == "config":
+            self.config = entry["config"]
+        elif entry["op"] == "splice":
+            start, delete = entry["start"], entry["delete"]
+            self.cards[entry["card_type"]][start:start + delete] = [
+                (c["text"], c.get("pick", 1)) for c in entry["cards"]
+            ]
+
+    def load(self) -> Deck:
+        """The deck as saved: the snapshot with the journal replayed."""
+        with self._lock:
+            self._refresh()
+            deck = Deck(config=DeckConfig.from_dict(self.config))
+            deck.black_cards = [Card(text, CardType.BLACK, pick) for text, pick in self.cards["black"]]
+            deck.white_cards = [Card(text, CardType.WHITE, pick) for text, pick in self.cards["white"]]
+            return deck
+
+    def save(self, deck: Deck):
+        """Save a deck, appending its changes to the journal.
+
+        The snapshot is written instead when there is none yet (or it was
+        not written by a journal), or when the changes amount to rewriting
+        most of the deck anyway.
+        """
+        with self._lock:
+            if self.path.exists():
+                try:
+                    self._refresh()
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    self.journal_id = None  # unreadable: overwrite it
+            else:
+                self.journal_id = None
+
+            config = deck.config.to_dict()
+            cards = {
+                "black": [(c.text, c.pick) for c in deck.black_cards],
+                "white": [(c.text, c.pick) for c in deck.white_cards]
+            }
+            if self.journal_id is None:
+                self._write_snapshot(config, cards)
+                return
+
+            entries = []
+            if config != self.config:
+                entries.append({"op": "config", "config": config})
+            changed = 0
+            for card_type, new in cards.items():
+                splice = _splice(self.cards[card_type], new)
+                if splice is None:
+                    continue
+                start, delete, inserted = splice
+                changed += delete + len(inserted)
+                entries.append({
+                    "op": "splice", "card_type": card_type, "start": start, "delete": delete,
+                    "cards": [{"text": text, "pick": pick} for text, pick in inserted]
+                })
+
+            if not entries:
+                return
+            if changed > (len(cards["black"]) + len(cards["white"])) // 2:
+                self._write_snapshot(config, cards)
+                return
+
+            lines = []
+            for entry in entries:
+                self.seq += 1
+                lines.append(json.dumps({"id": self.journal_id, "seq": self.seq, **entry},
+                                        ensure_ascii=False) + "\n")
+            data = "".join(lines).encode("utf-8")
+            with open(self.journal_path, "ab") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+
+            self.config, self.cards = config, cards
+            self.journal_size += len(data)
+            self._stamp = self._file_stamp()
+
+            if self.journal_size > max(COMPACT_MIN_BYTES, self.snapshot_size * COMPACT_RATIO):
+                self.compact_in_background()
+
+    def _snapshot(self, config: dict, cards: dict, journal_id: str, seq: int) -> dict:
+        # Counts and journal come before the card lists, so that listing
+        # decks stops reading there (see cardfile.read_header)
+        return {
+            "config": config,
+            "counts": {card_type: len(cards[card_type]) for card_type in ("black", "white")},
+            "journal": {"id": journal_id, "seq": seq},
+            **{
+                f"{card_type}_cards": [
+                    {"text": text, "card_type": card_type, "pick": pick}
+                    for text, pick in cards[card_type]
+                ]
+                for card_type in ("black", "white")
+            }
+        }
+
+    def _write_temp(self, data: dict) -> str:
+        """Write a snapshot to a temporary file next to the deck file."""
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=".tmp-", suffix=".json")
         try:
-            with open(deck_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        return tmp
+
+    def _write_snapshot(self, config: dict, cards: dict):
+        """Replace the deck file with a new snapshot and start a new journal."""
+        journal_id = uuid.uuid4().hex
+        tmp = self._write_temp(self._snapshot(config, cards, journal_id, 0))
+        os.replace(tmp, self.path)
+        # The old journal belongs to the old snapshot; removing it is tidying up
+        self.journal_path.unlink(missing_ok=True)
+
+        self.config, self.cards = config, cards
+        self.journal_id, self.seq = journal_id, 0
+        self.snapshot_size = self.path.stat().st_size
+        self.journal_size = 0
+        self._stamp = self._file_stamp()
+
+    def compact(self):
+        """Fold the journal into the snapshot.
+
+        The snapshot is written outside the lock, so saves can go on
+        appending meanwhile; their lines are kept in the new journal.
+        """
+        with self._lock:
+            if self.journal_id is None or not self.journal_size:
+                return
+            journal_id, seq = self.journal_id, self.seq
+            data = self._snapshot(self.config, {t: list(c) for t, c in self.cards.items()},
+                                  journal_id, seq)
+            stamp = self._stamp
+
+        tmp = self._write_temp(data)
+
+        with self._lock:
+            if self.journal_id != journal_id or self._file_stamp() != self._stamp:
+                os.unlink(tmp)  # rewritten, changed or deleted meanwhile
+                return
+            os.replace(tmp, self.path)
+            self.snapshot_size = self.path.stat().st_size
+
+            if self._stamp == stamp:
+                self.journal_path.unlink(missing_ok=True)
+                self.journal_size = 0
+            else:
+                # Keep the lines appended while the snapshot was written
+                with open(self.journal_path, "rb") as f:
+                    lines = [line for line in f if json.loads(line)["seq"] > seq]
+                fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=".tmp-",
+                                           suffix=JOURNAL_SUFFIX)
+                with os.fdopen(fd, "wb") as f:
+                    f.writelines(lines)
+                os.replace(tmp, self.journal_path)
+                self.journal_size = sum(len(line) for line in lines)
+            self._stamp = self._file_stamp()
+
+    def compact_in_background(self):
+        """Start compact() on a thread unless one is already running."""
+        with self._lock:
+            if self._compactor is not None and self._compactor.is_alive():
+                return
+            self._compactor = threading.Thread(target=self.compact, daemon=True,
+                                               name=f"compact-{self.path.name}")
+            self._compactor.start()
+
+    def wait(self):
+        """Wait for a running compaction to finish."""
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+
+    def delete(self) -> bool:
+        """Delete the deck file and its journal, once a running compaction
+        is done. Returns False if there was no deck file."""
+        self.wait()
+        with self._lock:
+            self.journal_path.unlink(missing_ok=True)
+            self.journal_id, self._stamp = None, None
+            try:
+                self.path.unlink()
+            except FileNotFoundError:
+                return False
+            return True
+
+
+_journals: dict[Path, DeckJournal] = {}
+_journals_lock = threading.Lock()
+
+
+def deck_journal(path: Path) -> DeckJournal:
+    """The DeckJournal of a deck file (one per file and process)."""
+    path = Path(path).resolve()
+    with _journals_lock:
+        journal = _journals.get(path)
+        if journal is None:
+            journal = _journals[path] = DeckJournal(path)
+        return journal
+
+
+@atexit.register
+def wait_for_compactions():
+    """Wait for background compactions (run at exit, so none is cut short)."""
+    with _journals_lock:
+        journals = list(_journals.values())
+    for journal in journals:
+        journal.wait()
+
+
+def list_saved_decks() -> list[dict]:
+    """List all saved decks.
+
+    Summaries come from the FileDeckStore index, so only decks that changed
+    since they were last listed are parsed.
 
-            decks.append({
-                "filename": deck_file.name,
-                "path": deck_file,
-                "name": data.get("config", {}).get("name", "Unnamed"),
-                "short_name": data.get("config", {}).get("short_name", "???"),
-                "black_count": len(data.get("black_cards", [])),
-                "white_count": len(data.get("white_cards", []))
-            })
-        except (json.JSONDecodeError, KeyError):
-            continue
+    Returns:
+        List of dictionaries with deck info
+    """
+    from .storage import FileDeckStore
 
-    return decks
+    return FileDeckStore(DECKS_DIR).list_decks()
 
 
-def save_deck(deck: Deck, filename: str | None = None) -> Path:
+def save_deck(deck: Deck, filename: str | None = None,
+              directory: Path | None = None) -> Path:
     """Save a deck to file.
 
     Args:
         deck: The deck to save
         filename: Optional filename (default: deck_name.json)
+        directory: Deck directory (default: DECKS_DIR)
 
     Returns:
         Path of saved file
     """
-    ensure_decks_dir()
+    directory = directory or DECKS_DIR
+    directory.mkdir(exist_ok=True)
 
     if filename is None:
         # Generate filename from deck name
@@ -60,50 +449,44 @@ def save_deck(deck: Deck, filename: str | None = None) -> Path:
         safe_name = safe_name.strip().replace(" ", "_").lower()
         filename = f"{safe_name}.json"
 
-    if not filename.endswith(".json"):
-        filename += ".json"
-
-    path = DECKS_DIR / filename
-    deck.save(path)
+    path = directory / deck_filename(filename)
+    deck_journal(path).save(deck)
     return path
 
 
-def load_deck(filename: str) -> Deck:
+def load_deck(filename: str, directory: Path | None = None) -> Deck:
     """Load a deck from file.
 
     Args:
         filename: Deck filename
+        directory: Deck directory (default: DECKS_DIR)
 
     Returns:
         The loaded deck
     """
-    if not filename.endswith(".json"):
-        filename += ".json"
+    filename = deck_filename(filename)
 
-    path = DECKS_DIR / filename
+    path = (directory or DECKS_DIR) / filename
     if not path.exists():
         raise FileNotFoundError(f"Deck not found: {filename}")
 
-    return Deck.load(path)
+    return deck_journal(path).load()
 
 
-def delete_deck(filename: str) -> bool:
+def delete_deck(filename: str, directory: Path | None = None) -> bool:
     """Delete a saved deck.
 
     Args:
         filename: Filename to delete
+        directory: Deck directory (default: DECKS_DIR)
 
     Returns:
         True if deleted, False otherwise
     """
-    if not filename.endswith(".json"):
-        filename += ".json"
-
-    path = DECKS_DIR / filename
-    if path.exists():
-        path.unlink()
-        return True
-    return False
+    path = ((directory or DECKS_DIR) / deck_filename(filename)).resolve()
+    with _journals_lock:
+        journal = _journals.pop(path, None)
+    return (journal or DeckJournal(path)).delete()
 
 
 def create_empty_deck(name: str, short_name: str,
@@ -0,0 +1,323 @@
+"""Duplicate and near-duplicate card detection.
+
+Exact duplicates are cards of the same type whose normalised texts are
+equal (see db.normalize_text); they are found with the idx_cards_key
+index without reading card texts into Python.
+
+Near duplicates ("What's the worst thing about _____?" and "What is the
+worst thing about ____") are found with MinHash and locality-sensitive
+hashing: each distinct normalised text gets a signature of minimum
+character-shingle hashes, signatures are cut into bands and only texts
+sharing a band are compared. Work grows roughly linearly with the number
+of cards instead of comparing every pair.
+"""
+
+import operator
+import zlib
+from array import array
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Iterable, Optional
+
+from . import db
+
+# Character n-gram size for shingles
+SHINGLE_SIZE = 4
+
+# Signature layout: BANDS bands of ROWS values. A pair with Jaccard
+# similarity s becomes a candidate with probability 1 - (1 - s**ROWS)**BANDS:
+# about 0.9998 at s = 0.8 and 0.64 at s = 0.5.
+BANDS = 16
+ROWS = 4
+SIGNATURE_SIZE = BANDS * ROWS
+
+# Default Jaccard similarity for near duplicates
+DEFAULT_THRESHOLD = 0.8
+
+# Buckets larger than this are split on the rows of the following bands,
+# up to SPLIT_BANDS of them; what is still larger is compared as a chain
+# of neighbours (templated texts can fill one bucket with most of a deck)
+MAX_PAIRWISE_BUCKET = 16
+SPLIT_BANDS = 3
+
+# Stored cards of all decks: duplicated decks contribute only the cards
+# they store themselves, under the IDs they have in the deck
+_ALL_CARDS = """(
+    SELECT COALESCE(origin_id, id) AS id, deck_id, text, card_type, text_key FROM cards
+    WHERE deleted = 0
+)"""
+
+# Candidates whose signatures estimate a similarity this far below the
+# threshold are dropped without computing the exact similarity
+ESTIMATE_MARGIN = 0.15
+
+_BIN_BITS = SIGNATURE_SIZE.bit_length() - 1
+_BIN_MASK = SIGNATURE_SIZE - 1
+_EMPTY = 0xFFFFFFFF  # above any bin value
+
+
+@dataclass
+class DuplicateGroup:
+    """Cards that are (nearly) the same card.
+
+    card_ids and deck_ids are parallel: deck_ids[i] is the deck of
+    card_ids[i]. similarity is the lowest Jaccard similarity that joined
+    the group (1.0 for exact duplicates).
+    """
+    card_type: str
+    card_ids: list[int] = field(default_factory=list)
+    deck_ids: list[int] = field(default_factory=list)
+    texts: list[str] = field(default_factory=list)
+    similarity: float = 1.0
+    _text_set: set[str] = field(default_factory=set, repr=False, compare=False)
+
+    def add(self, card_id: int, deck_id: int, text: str):
+        self.card_ids.append(card_id)
+        self.deck_ids.append(deck_id)
+        if text not in self._text_set:
+            self._text_set.add(text)
+            self.texts.append(text)
+
+    def redundant(self) -> list[tuple[int, int]]:
+        """(card ID, deck ID) of all but the oldest card of each deck in the group."""
+        kept: set[int] = set()
+        redundant = []
+        for card_id, deck_id in sorted(zip(self.card_ids, self.deck_ids)):
+            if deck_id in kept:
+                redundant.append((card_id, deck_id))
+            else:
+                kept.add(deck_id)
+        return redundant
+
+    def to_dict(self) -> dict:
+        return {
+            "card_type": self.card_type,
+            "similarity": round(self.similarity, 3),
+            "texts": self.texts,
+            "cards": [{"id": card_id, "deck_id": deck_id}
+                      for card_id, deck_id in zip(self.card_ids, self.deck_ids)]
+        }
+
+
+def find_exact_duplicates(deck_id: Optional[int] = None) -> list[DuplicateGroup]:
+    """Groups of cards with equal normalised text, in one deck or all decks."""
+    groups: dict[tuple, DuplicateGroup] = {}
+
+    with db.db_cursor() as cursor:
+        source, params = _ALL_CARDS, []
+        where = card_where = ""
+        if deck_id is not None:
+            source, params, _ = db.card_source(cursor, deck_id)
+            where, card_where = "WHERE deck_id = ?", "WHERE c.deck_id = ?"
+            params = [*params, deck_id, *params, deck_id]
+
+        cursor.execute(f"""
+            WITH dup AS (
+                SELECT text_key AS key, card_type FROM {source} AS cards {where}
+                GROUP BY key, card_type HAVING COUNT(*) > 1
+            )
+            SELECT c.id, c.deck_id, c.card_type, c.text, dup.key
+            FROM {source} c JOIN dup
+              ON c.text_key = dup.key AND c.card_type = dup.card_type
+            {card_where}
+            ORDER BY dup.key, c.card_type, c.id
+        """, params)
+        for card_id, card_deck, card_type, text, key in cursor:
+            group = groups.get((key, card_type))
+            if group is None:
+                group = groups[key, card_type] = DuplicateGroup(card_type)
+            group.add(card_id, card_deck, text)
+
+    return sorted(groups.values(), key=lambda g: (-len(g.card_ids), g.card_ids[0]))
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set[int]:
+    """CRC32 hashes of a normalised text's character n-grams."""
+    if len(text) <= size:
+        return {zlib.crc32(text.encode("utf-8"))} if text else set()
+    data = text.encode("utf-8")
+    return {zlib.crc32(data[i:i + size]) for i in range(len(data) - size + 1)}
+
+
+def signature(hashes: Iterable[int]) -> list[int]:
+    """MinHash signature of SIGNATURE_SIZE values from shingle hashes.
+
+    Uses one-permutation hashing: each hash lands in one bin (its low
+    bits) and a bin keeps its smallest value, so a signature costs one
+    pass over the shingles instead of one per value. Empty bins (short
+    texts) borrow the next filled bin's value, offset by the distance, so
+    that similar texts still agree on them.
+    """
+    bins = [_EMPTY] * SIGNATURE_SIZE
+    for h in hashes:
+        # Multiplicative mixing spreads CRC32's low bits across the bins
+        h = (h * 0x9E3779B1) & 0xFFFFFFFF
+        index, value = h & _BIN_MASK, h >> _BIN_BITS
+        if value < bins[index]:
+            bins[index] = value
+
+    if _EMPTY in bins and any(value != _EMPTY for value in bins):
+        # Right to left, starting from the first filled bin so that the
+        # last bins wrap around to it
+        first = next(i for i, value in enumerate(bins) if value != _EMPTY)
+        nearest, distance = bins[first], first + 1
+        for i in range(SIGNATURE_SIZE - 1, -1, -1):
+            if bins[i] != _EMPTY:
+                nearest, distance = bins[i], 0
+            else:
+                bins[i] = (nearest + distance * 0x9E3779B1) & 0xFFFFFFFF
+            distance += 1
+    return bins
+
+
+def jaccard(a: set, b: set) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class _DisjointSet:
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, i: int) -> int:
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(self, a: int, b: int):
+        a, b = self.find(a), self.find(b)
+        if a != b:
+            self.parent[max(a, b)] = min(a, b)
+
+
+def find_near_duplicates(deck_id: Optional[int] = None,
+                         threshold: float = DEFAULT_THRESHOLD) -> list[DuplicateGroup]:
+    """Groups of cards with similar but not equal normalised texts.
+
+    Only cards of the same type are compared. Groups are transitive: A and
+    C end up together when both are similar to B.
+
+    Args:
+        deck_id: Deck to search (None for all decks)
+        threshold: Minimum Jaccard similarity of character shingles
+
+    Returns:
+        Groups of cards with at least two distinct normalised texts,
+        largest first
+    """
+    # Distinct normalised texts (per type) and the cards that have them
+    index: dict[tuple[str, str], int] = {}
+    texts: list[tuple[str, str]] = []
+    cards: list[list[tuple[int, int, str]]] = []
+    signatures = array("I")
+
+    with db.db_cursor() as cursor:
+        source, params, where = _ALL_CARDS, [], ""
+        if deck_id is not None:
+            source, params, _ = db.card_source(cursor, deck_id)
+            params.append(deck_id)
+            where = "WHERE deck_id = ?"
+
+        cursor.execute(f"""
+            SELECT id, deck_id, card_type, text FROM {source} AS cards {where} ORDER BY id
+        """, params)
+        for card_id, card_deck, card_type, text in cursor:
+            normalized = db.normalize_text(text)
+            position = index.get((card_type, normalized))
+            if position is None:
+                position = index[card_type, normalized] = len(texts)
+                texts.append((card_type, normalized))
+                cards.append([])
+                signatures.extend(signature(shingles(normalized)))
+            cards[position].append((card_id, card_deck, text))
+    del index
+
+    @lru_cache(maxsize=4096)
+    def text_shingles(position: int) -> frozenset:
+        return frozenset(shingles(texts[position][1]))
+
+    groups = _DisjointSet(len(texts))
+    weakest: dict[int, float] = {}
+
+    # Pairs already compared (a pair can share several bands)
+    compared: set[tuple[int, int]] = set()
+
+    def compare(a: int, b: int):
+        if groups.find(a) == groups.find(b) or texts[a][0] != texts[b][0]:
+            return
+        if (a, b) in compared:
+            return
+        compared.add((a, b))
+        # Cheap estimate first: the share of equal signature values
+        sig_a = signatures[a * SIGNATURE_SIZE:(a + 1) * SIGNATURE_SIZE]
+        sig_b = signatures[b * SIGNATURE_SIZE:(b + 1) * SIGNATURE_SIZE]
+        estimate = sum(map(operator.eq, sig_a, sig_b)) / SIGNATURE_SIZE
+        if estimate < threshold - ESTIMATE_MARGIN:
+            return
+        similarity = jaccard(text_shingles(a), text_shingles(b))
+        if similarity >= threshold:
+            lowest = min(similarity, weakest.get(groups.find(a), 1.0),
+                         weakest.get(groups.find(b), 1.0))
+            groups.union(a, b)
+            weakest[groups.find(a)] = lowest
+
+    def buckets(positions: Iterable[int], band: int) -> Iterable[list[int]]:
+        """Positions grouped by their signature rows in a band (two or more)."""
+        found: dict[int, list[int]] = {}
+        offset = band % BANDS * ROWS
+        for position in positions:
+            start = position * SIGNATURE_SIZE + offset
+            found.setdefault(hash(tuple(signatures[start:start + ROWS])), []).append(position)
+        return (members for members in found.values() if len(members) > 1)
+
+    def compare_bucket(members: list[int], band: int, splits: int = 0):
+        if len(members) <= MAX_PAIRWISE_BUCKET:
+            for i, a in enumerate(members):
+                for b in members[i + 1:]:
+                    compare(a, b)
+        elif splits < SPLIT_BANDS:
+            # Members that also agree on the next band are the likelier pairs
+            for part in buckets(members, band + splits + 1):
+                compare_bucket(part, band, splits + 1)
+        else:
+            for a, b in zip(members, members[1:]):
+                compare(a, b)
+
+    # One band at a time keeps only one band's buckets in memory
+    for band in range(BANDS):
+        for members in buckets(range(len(texts)), band):
+            compare_bucket(members, band)
+
+    found: dict[int, DuplicateGroup] = {}
+    for position, (card_type, _) in enumerate(texts):
+        root = groups.find(position)
+        if root == position and root not in weakest:
+            continue  # not joined to anything
+        group = found.get(root)
+        if group is None:
+            group = found[root] = DuplicateGroup(card_type, similarity=weakest.get(root, 1.0))
+        for card_id, card_deck, text in cards[position]:
+            group.add(card_id, card_deck, text)
+
+    result = []
+    for group in found.values():
+        order = sorted(range(len(group.card_ids)), key=group.card_ids.__getitem__)
+        group.card_ids = [group.card_ids[i] for i in order]
+        group.deck_ids = [group.deck_ids[i] for i in order]
+        result.append(group)
+    return sorted(result, key=lambda g: (-len(g.card_ids), g.card_ids[0]))
+
+
+def remove_duplicates(groups: Iterable[DuplicateGroup]) -> int:
+    """Delete all but the oldest card of each deck in each group.
+
+    Runs in one transaction; returns the number of cards deleted.
+    """
+    removed = [card for group in groups for card in group.redundant()]
+    with db.db_cursor():
+        for card_id, deck_id in removed:
+            db.delete_card(card_id, deck_id)
+    return len(removed)
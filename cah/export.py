@@ -1,13 +1,26 @@
 """Export cards to PDF."""
 
+import hashlib
+import importlib.util
+import json
+import os
+import tempfile
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from itertools import islice
 from pathlib import Path
-from reportlab.lib.pagesizes import A4
+from typing import Callable, Iterable, Iterator
+from reportlab.lib.pagesizes import A3, A4
 from reportlab.lib.units import mm
 from reportlab.pdfgen import canvas
 from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase.pdfmetrics import stringWidth
 from PIL import Image
 
-from .models import Card, CardType, Deck
+from . import db
+from .models import Card, CardType, Deck, DeckConfig
 
 
 # Card dimensions (playing card style)
@@ -23,6 +36,406 @@ CARDS_PER_ROW = 3
 CARDS_PER_COL = 3
 CARDS_PER_PAGE = CARDS_PER_ROW * CARDS_PER_COL
 
+# Sheet sizes (portrait) that layouts can be fitted to
+SRA3 = (320 * mm, 450 * mm)
+SHEET_SIZES = {"a4": A4, "a3": A3, "sra3": SRA3}
+
+# Trim marks: length, and distance from the card edge (plus bleed)
+CUT_MARK_LENGTH = 4 * mm
+CUT_MARK_OFFSET = 1 * mm
+
+# Logos
+LOGO_SIZE = 15 * mm        # Card face, bottom right
+BACK_LOGO_SIZE = 35 * mm   # Card back, centered
+LOGO_DPI = 300             # Logos are downscaled to this print resolution
+
+# Card text box: from the top text line down to just above the footer
+# (pick indicator and logo), font sizes tried in half-point steps
+TEXT_FONT = "Helvetica-Bold"
+TEXT_MAX_SIZE = 11
+TEXT_MIN_SIZE = 6
+TEXT_LINE_GAP = 3
+TEXT_TOP = 20 * mm - TEXT_MAX_SIZE        # From card top to top of the first line
+TEXT_BOTTOM = CARD_PADDING + LOGO_SIZE + 2 * mm
+TEXT_BOX_WIDTH = CARD_WIDTH - 2 * CARD_PADDING
+TEXT_BOX_HEIGHT = CARD_HEIGHT - TEXT_TOP - TEXT_BOTTOM
+LAYOUT_CACHE_SIZE = 65536
+
+# Fonts card pages use, registered in this order on every canvas so that
+# their PDF names (F1, F2, ...) are the same in every export
+PAGE_FONTS = ("Helvetica", "Helvetica-Bold", TEXT_FONT)
+
+# Rendered pages kept for re-exports (see PageCache)
+PAGE_CACHE_DIR = db.DATA_DIR / "page_cache"
+PAGE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+# Bump when drawing code changes, so pages cached before are not reused
+PAGE_CACHE_VERSION = 1
+
+
+class LogoCache:
+    """Logos decoded once per export and embedded as reusable PDF forms.
+
+    Each (logo, size) pair is decoded, downscaled to LOGO_DPI and converted
+    once, then drawn into a form XObject the first time it is used. Every
+    further card only references that form. A cache belongs to a single
+    canvas (one export).
+    """
+
+    def __init__(self, dpi: int = LOGO_DPI):
+        self.dpi = dpi
+        self._images: dict[tuple[str, float], ImageReader | None] = {}
+        self._forms: dict[tuple[str, float], str] = {}
+
+    def image(self, logo_path: str | None, size: float) -> ImageReader | None:
+        """Decoded logo for a drawing size in points, or None if unusable."""
+        if not logo_path:
+            return None
+
+        key = (logo_path, size)
+        if key not in self._images:
+            self._images[key] = self._load(logo_path, size)
+        return self._images[key]
+
+    def _load(self, logo_path: str, size: float) -> ImageReader | None:
+        if not Path(logo_path).exists():
+            return None
+        try:
+            with Image.open(logo_path) as img:
+                img = img.convert("RGBA")
+            max_px = max(1, round(size / 72 * self.dpi))
+            img.thumbnail((max_px, max_px), Image.LANCZOS)
+            return ImageReader(img)
+        except Exception:
+            return None
+
+    def form(self, c: canvas.Canvas, logo_path: str | None, size: float) -> str | None:
+        """Name of the logo's form on the canvas (defined on first use), or
+        None if the logo cannot be drawn.
+
+        The name depends only on the logo and size, so page content that
+        uses it can be replayed onto another canvas (see PageCache).
+        """
+        key = (logo_path, size)
+        name = self._forms.get(key)
+
+        if name is None:
+            img = self.image(logo_path, size)
+            if img is None:
+                return None
+            name = "logo" + hashlib.sha1(f"{logo_path}\0{size}".encode("utf-8")).hexdigest()[:16]
+            c.beginForm(name, 0, 0, size, size)
+            c.drawImage(img, 0, 0, width=size, height=size,
+                        preserveAspectRatio=True, mask='auto')
+            c.endForm()
+            self._forms[key] = name
+        return name
+
+    def form_keys(self, names: Iterable[str]) -> list[tuple[str, float]]:
+        """(logo, size) of forms by name."""
+        by_name = {name: key for key, name in self._forms.items()}
+        return [by_name[name] for name in dict.fromkeys(names) if name in by_name]
+
+    def draw(self, c: canvas.Canvas, logo_path: str | None,
+             x: float, y: float, size: float) -> bool:
+        """Draw a logo in a size x size box; False if it cannot be drawn."""
+        name = self.form(c, logo_path, size)
+        if name is None:
+            return False
+
+        c.saveState()
+        c.translate(x, y)
+        c.doForm(name)
+        c.restoreState()
+        return True
+
+
+@dataclass(frozen=True)
+class SheetLayout:
+    """Where cards go on a sheet: a grid of cols x rows card slots.
+
+    The grid is centred horizontally and starts at the top margin; slot
+    positions (fronts, and backs mirrored for double-sided printing) are
+    computed once per layout. bleed extends each card's background past
+    its cut line, cut_marks adds trim marks around the grid on front
+    sides, and with gang_run black and white cards share sheets (without
+    it each card type starts on a new sheet).
+
+    The default is the classic A4 sheet of 3 x 3 cards.
+    """
+    name: str = "a4"
+    page_size: tuple[float, float] = A4
+    cols: int = CARDS_PER_ROW
+    rows: int = CARDS_PER_COL
+    gap: float = CARD_MARGIN
+    margin: float = PAGE_MARGIN
+    bleed: float = 0.0
+    cut_marks: bool = False
+    gang_run: bool = True
+
+    @classmethod
+    def densest(cls, name: str, page_size: tuple[float, float] | None = None,
+                **options) -> "SheetLayout":
+        """The layout fitting most cards on a sheet, portrait or landscape.
+
+        Args:
+            name: Sheet name (a key of SHEET_SIZES unless page_size is given)
+            page_size: Portrait (width, height) in points
+            **options: gap, margin, bleed, cut_marks, gang_run
+        """
+        width, height = page_size or SHEET_SIZES[name]
+        best = None
+        for size in ((width, height), (height, width)):
+            layout = cls(name, size, 1, 1, **options)
+            cols, rows = layout._max_grid()
+            if cols and rows and (best is None or cols * rows > best.per_sheet):
+                best = cls(name, size, cols, rows, **options)
+        if best is None:
+            raise ValueError(f"No card fits on a {name} sheet")
+        return best
+
+    @property
+    def per_sheet(self) -> int:
+        return self.cols * self.rows
+
+    @property
+    def spacing(self) -> float:
+        """Space between neighbouring cards (their bleeds must not overlap)."""
+        return max(self.gap, 2 * self.bleed)
+
+    @property
+    def edge(self) -> float:
+        """Space between the grid and the sheet edge."""
+        marks = CUT_MARK_OFFSET + CUT_MARK_LENGTH if self.cut_marks else 0.0
+        return max(self.margin, self.bleed + marks)
+
+    def _max_grid(self) -> tuple[int, int]:
+        width, height = self.page_size
+        pitch_x, pitch_y = CARD_WIDTH + self.spacing, CARD_HEIGHT + self.spacing
+        cols = int((width - 2 * self.edge + self.spacing) // pitch_x)
+        rows = int((height - 2 * self.edge + self.spacing) // pitch_y)
+        return max(cols, 0), max(rows, 0)
+
+    def fits(self) -> bool:
+        cols, rows = self._max_grid()
+        return self.cols <= cols and self.rows <= rows
+
+    def sheets(self, black: int, white: int) -> int:
+        """Sheets (front sides) needed for a number of black and white cards."""
+        n = self.per_sheet
+        if self.gang_run:
+            return -(-(black + white) // n)
+        return -(-black // n) + -(-white // n)
+
+    @cached_property
+    def positions(self) -> tuple[tuple[float, float], ...]:
+        """Bottom-left corner of each card slot, row by row from the top left."""
+        width, height = self.page_size
+        grid_width = self.cols * CARD_WIDTH + (self.cols - 1) * self.spacing
+        start_x = (width - grid_width) / 2
+        start_y = height - self.edge - CARD_HEIGHT
+        return tuple(
+            (start_x + col * (CARD_WIDTH + self.spacing),
+             start_y - row * (CARD_HEIGHT + self.spacing))
+            for row in range(self.rows) for col in range(self.cols)
+        )
+
+    @cached_property
+    def back_positions(self) -> tuple[tuple[float, float], ...]:
+        """Slots of the backs: mirrored horizontally, so that each back
+        lands behind its front when the sheet is turned over left to right
+        (long-edge duplex on portrait sheets, short-edge on landscape)."""
+        width = self.page_size[0]
+        return tuple((width - x - CARD_WIDTH, y) for x, y in self.positions)
+
+    @cached_property
+    def cut_mark_lines(self) -> tuple[tuple[float, float, float, float], ...]:
+        """Trim marks (x1, y1, x2, y2) outside the grid, in line with the card edges."""
+        if not self.cut_marks:
+            return ()
+        xs = sorted({x for x, _ in self.positions} | {x + CARD_WIDTH for x, _ in self.positions})
+        ys = sorted({y for _, y in self.positions} | {y + CARD_HEIGHT for _, y in self.positions})
+        start = self.bleed + CUT_MARK_OFFSET
+        end = start + CUT_MARK_LENGTH
+        left, right, bottom, top = xs[0], xs[-1], ys[0], ys[-1]
+        lines = []
+        for x in xs:
+            lines.append((x, top + start, x, top + end))
+            lines.append((x, bottom - start, x, bottom - end))
+        for y in ys:
+            lines.append((left - start, y, left - end, y))
+            lines.append((right + start, y, right + end, y))
+        return tuple(lines)
+
+
+DEFAULT_LAYOUT = SheetLayout()
+
+
+def choose_layout(black: int, white: int, sheets: Iterable[str] | None = None,
+                  **options) -> SheetLayout:
+    """The densest layout of the sheet size that needs the fewest sheets.
+
+    Ties go to the smaller sheet, then to the order of sheets.
+
+    Args:
+        black: Number of black cards
+        white: Number of white cards
+        sheets: Sheet names to consider (default: all of SHEET_SIZES)
+        **options: Layout options (see SheetLayout.densest)
+    """
+    layouts = [SheetLayout.densest(name, **options) for name in (sheets or SHEET_SIZES)]
+    return min(layouts, key=lambda layout: (layout.sheets(black, white),
+                                            layout.page_size[0] * layout.page_size[1]))
+
+
+def resolve_layout(sheet: str, black: int, white: int, **options) -> SheetLayout:
+    """Layout for a sheet name, or the one needing the fewest sheets for "auto"."""
+    if sheet == "auto":
+        return choose_layout(black, white, **options)
+    if sheet not in SHEET_SIZES:
+        raise ValueError(f"Unknown sheet size '{sheet}' "
+                         f"(expected auto or one of: {', '.join(SHEET_SIZES)})")
+    return SheetLayout.densest(sheet, **options)
+
+
+class PageCache:
+    """Drawn card pages on disk, keyed by everything that affects them.
+
+    A page's key hashes its cards (text, type, pick), the deck config
+    (names, colors, logos including their file size and modification
+    time), whether backs are drawn and the layout constants. An entry
+    holds the PDF drawing operators of the page (and its back) plus the
+    logos and fonts they refer to, so a re-export appends the operators
+    of unchanged pages to the canvas instead of laying out and drawing
+    their cards again.
+
+    Entries are evicted least recently used first once the directory
+    grows past max_bytes. hits and misses count the pages exports
+    replayed from it and drew themselves.
+    """
+
+    def __init__(self, directory: Path | None = None, max_bytes: int = PAGE_CACHE_MAX_BYTES):
+        self.directory = Path(directory or PAGE_CACHE_DIR)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": round(self.hit_rate, 3)}
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> dict | None:
+        """A cached page (marked as recently used), or None."""
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return entry
+
+    def put(self, key: str, entry: dict):
+        """Store a page; a half-written entry is never visible."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f, separators=(",", ":"))
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits max_bytes."""
+        try:
+            scan = list(os.scandir(self.directory))
+        except FileNotFoundError:
+            return
+        entries = []
+        total = 0
+        for entry in scan:
+            if entry.name.endswith(".json") and entry.is_file():
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+
+def _file_stamp(path: str | None) -> tuple | None:
+    """Identify a logo file's contents cheaply (path, size, mtime)."""
+    if not path:
+        return None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return (path, None)
+    return (path, stat.st_size, stat.st_mtime_ns)
+
+
+def _page_key_base(config: DeckConfig, include_backs: bool,
+                   layout: SheetLayout) -> "hashlib._Hash":
+    """Hash of what every page of an export shares (copied per page)."""
+    import reportlab
+
+    layout = (PAGE_CACHE_VERSION, reportlab.Version, layout, CARD_WIDTH, CARD_HEIGHT,
+              CARD_PADDING, CORNER_RADIUS, CUT_MARK_LENGTH, CUT_MARK_OFFSET,
+              LOGO_SIZE, BACK_LOGO_SIZE, LOGO_DPI, PAGE_FONTS,
+              TEXT_MAX_SIZE, TEXT_MIN_SIZE, TEXT_LINE_GAP, TEXT_TOP, TEXT_BOTTOM)
+    deck = (config.name, config.short_name, config.primary_color, config.secondary_color,
+            _file_stamp(config.black_logo_path), _file_stamp(config.white_logo_path),
+            _file_stamp(config.black_back_logo_path), _file_stamp(config.white_back_logo_path),
+            include_backs)
+    return hashlib.sha256(repr((layout, deck)).encode("utf-8"))
+
+
+def _page_key(base: "hashlib._Hash", cards: list[Card]) -> str:
+    h = base.copy()
+    for card in cards:
+        h.update(repr((card.text, card.card_type.value, card.pick)).encode("utf-8"))
+    return h.hexdigest()
+
+
+def _drawn_page(c: canvas.Canvas, logos: LogoCache, code_start: int, forms_start: int) -> dict:
+    """Cache entry part for what was drawn on the current page since the given positions."""
+    return {"code": c._code[code_start:],
+            "forms": logos.form_keys(c._formsinuse[forms_start:])}
+
+
+def _replay_page(c: canvas.Canvas, entry: dict, logos: LogoCache) -> bool:
+    """Append a cached page to a canvas; False if it does not fit this canvas."""
+    fonts = c._doc.fontMapping
+    if any(fonts.get(font) != name for font, name in entry["fonts"].items()):
+        return False
+    pages = []
+    for page in entry["pages"]:
+        forms = [logos.form(c, logo_path, size) for logo_path, size in page["forms"]]
+        if None in forms:
+            return False  # a logo went missing since the page was drawn
+        pages.append((page["code"], forms))
+
+    for i, (code, forms) in enumerate(pages):
+        if i > 0:
+            c.showPage()
+        c._code.extend(code)
+        c._formsinuse.extend(forms)
+    return True
+
 
 def hex_to_rgb(hex_color: str) -> tuple:
     """Convert hex color to normalized RGB (0-1)."""
@@ -69,11 +482,148 @@ def wrap_text(text: str, max_chars: int = 25) -> list[str]:
     return lines
 
 
+@dataclass(frozen=True)
+class TextLayout:
+    """Card text broken into lines at a chosen font size."""
+    lines: tuple[str, ...]
+    font_size: float
+    line_height: float
+    overflow: bool  # True if the text does not fit even at the minimum size
+
+
+def break_lines(text: str, font: str, font_size: float, max_width: float) -> list[str]:
+    """Greedy line breaking using real glyph widths.
+
+    Words wider than a whole line are split between characters.
+    """
+    words = text.split()
+    # Glyph widths scale linearly with the font size: measure once at 1pt
+    widths = [stringWidth(word, font, 1) for word in words]
+    return _break_words(words, widths, stringWidth(" ", font, 1), font, font_size, max_width)
+
+
+def _break_words(words: list[str], widths: list[float], space: float,
+                 font: str, font_size: float, max_width: float) -> list[str]:
+    """break_lines on pre-measured words (widths at 1pt)."""
+    limit = max_width / font_size
+    lines = []
+    current, current_width = "", 0.0
+
+    for word, word_width in zip(words, widths):
+        if current and current_width + space + word_width <= limit:
+            current += " " + word
+            current_width += space + word_width
+            continue
+
+        if current:
+            lines.append(current)
+
+        # Hard-break words that cannot fit on a line of their own
+        while word_width > limit and len(word) > 1:
+            cut = len(word) - 1
+            while cut > 1 and stringWidth(word[:cut], font, 1) > limit:
+                cut -= 1
+            lines.append(word[:cut])
+            word = word[cut:]
+            word_width = stringWidth(word, font, 1)
+
+        current, current_width = word, word_width
+
+    if current:
+        lines.append(current)
+
+    return lines
+
+
+@lru_cache(maxsize=LAYOUT_CACHE_SIZE)
+def layout_text(text: str, font: str = TEXT_FONT,
+                box_width: float = TEXT_BOX_WIDTH,
+                box_height: float = TEXT_BOX_HEIGHT,
+                max_size: float = TEXT_MAX_SIZE,
+                min_size: float = TEXT_MIN_SIZE) -> TextLayout:
+    """Fit text into a box with the largest font size that fits.
+
+    Font sizes between min_size and max_size (half-point steps) are
+    binary-searched: a smaller size never needs more lines, so "fits" is
+    monotonic in the size. Results are memoised by (text, font, box), so
+    repeated cards cost nothing.
+    """
+    words = text.split()
+    widths = [stringWidth(word, font, 1) for word in words]
+    space = stringWidth(" ", font, 1)
+
+    def fit(size: float) -> tuple[list[str], bool]:
+        lines = _break_words(words, widths, space, font, size, box_width)
+        height = len(lines) * (size + TEXT_LINE_GAP) - TEXT_LINE_GAP
+        return lines, height <= box_height
+
+    # Most cards fit at the largest size
+    lines, fits = fit(max_size)
+    if fits:
+        return TextLayout(tuple(lines), float(max_size), max_size + TEXT_LINE_GAP, False)
+
+    lo, hi = 0, int((max_size - min_size) * 2) - 1
+    best = None
+
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        size = min_size + mid / 2
+        lines, fits = fit(size)
+        if fits:
+            best = (size, lines)
+            lo = mid + 1
+        else:
+            hi = mid - 1
+
+    if best is None:
+        lines, _ = fit(min_size)
+        return TextLayout(tuple(lines), float(min_size), min_size + TEXT_LINE_GAP, True)
+
+    size, lines = best
+    return TextLayout(tuple(lines), size, size + TEXT_LINE_GAP, False)
+
+
+def layout_report(cards: list[Card]) -> dict:
+    """Lay out card faces without drawing them.
+
+    Returns:
+        Dictionary with "total", "font_sizes" (size -> number of cards) and
+        "overflowing" (cards whose text does not fit the card)
+    """
+    font_sizes: dict[float, int] = {}
+    overflowing = []
+
+    for position, card in enumerate(cards):
+        layout = layout_text(card.text)
+        font_sizes[layout.font_size] = font_sizes.get(layout.font_size, 0) + 1
+        if layout.overflow:
+            overflowing.append({
+                "position": position,
+                "id": card.id,
+                "card_type": card.card_type.value,
+                "text": card.text,
+                "lines": len(layout.lines),
+            })
+
+    return {
+        "total": len(cards),
+        "font_sizes": dict(sorted(font_sizes.items(), reverse=True)),
+        "overflowing": overflowing,
+    }
+
+
 def draw_card(c: canvas.Canvas, card: Card, x: float, y: float,
               deck_name: str, short_name: str,
               black_logo_path: str | None = None,
-              white_logo_path: str | None = None):
-    """Draw a single card."""
+              white_logo_path: str | None = None,
+              logos: LogoCache | None = None):
+    """Draw a single card.
+
+    Pass the export's LogoCache as ``logos`` so logos are decoded once.
+    """
+    if logos is None:
+        logos = LogoCache()
+
     # Colors based on type
     if card.card_type == CardType.BLACK:
         bg_color = (0, 0, 0)
@@ -95,32 +645,22 @@ def draw_card(c: canvas.Canvas, card: Card, x: float, y: float,
     deck_name_width = c.stringWidth(deck_name, "Helvetica-Bold", 7)
     c.drawString(x + (CARD_WIDTH - deck_name_width) / 2, y + CARD_HEIGHT - CARD_PADDING - 7, deck_name)
 
-    # Card text
-    text_lines = wrap_text(card.text, 22)
-    font_size = 11 if len(text_lines) <= 4 else 9
-    c.setFont("Helvetica-Bold", font_size)
+    # Card text, sized to fit the text box
+    layout = layout_text(card.text)
+    c.setFont(TEXT_FONT, layout.font_size)
 
-    text_start_y = y + CARD_HEIGHT - 20 * mm
-    line_height = font_size + 3
+    text_start_y = y + CARD_HEIGHT - TEXT_TOP - layout.font_size
 
-    for i, line in enumerate(text_lines):
-        c.drawString(x + CARD_PADDING, text_start_y - (i * line_height), line)
+    for i, line in enumerate(layout.lines):
+        c.drawString(x + CARD_PADDING, text_start_y - (i * layout.line_height), line)
 
     # Logo or short name in bottom right
-    logo_size = 15 * mm
-    if logo_path and Path(logo_path).exists():
-        try:
-            img = Image.open(logo_path)
-            c.drawImage(ImageReader(img),
-                       x + CARD_WIDTH - CARD_PADDING - logo_size,
+    drawn = logos.draw(c, logo_path,
+                       x + CARD_WIDTH - CARD_PADDING - LOGO_SIZE,
                        y + CARD_PADDING,
-                       width=logo_size, height=logo_size,
-                       preserveAspectRatio=True, mask='auto')
-        except Exception:
-            # Fallback to short name
-            c.setFont("Helvetica-Bold", 8)
-            c.drawRightString(x + CARD_WIDTH - CARD_PADDING, y + CARD_PADDING, short_name)
-    else:
+                       LOGO_SIZE)
+    if not drawn:
+        # Fallback to short name
         c.setFont("Helvetica-Bold", 8)
         c.drawRightString(x + CARD_WIDTH - CARD_PADDING, y + CARD_PADDING, short_name)
 
@@ -132,8 +672,12 @@ def draw_card(c: canvas.Canvas, card: Card, x: float, y: float,
 
 
 def draw_card_back(c: canvas.Canvas, x: float, y: float,
-                   is_black: bool, logo_path: str | None = None):
+                   is_black: bool, logo_path: str | None = None,
+                   logos: LogoCache | None = None):
     """Draw the back of a card with centered logo."""
+    if logos is None:
+        logos = LogoCache()
+
     if is_black:
         bg_color = (0, 0, 0)
     else:
@@ -144,22 +688,337 @@ def draw_card_back(c: canvas.Canvas, x: float, y: float,
                       bg_color, (0.5, 0.5, 0.5))
 
     # Centered logo
-    if logo_path and Path(logo_path).exists():
-        try:
-            img = Image.open(logo_path)
-            logo_size = 35 * mm
-            c.drawImage(ImageReader(img),
-                       x + (CARD_WIDTH - logo_size) / 2,
-                       y + (CARD_HEIGHT - logo_size) / 2,
-                       width=logo_size, height=logo_size,
-                       preserveAspectRatio=True, mask='auto')
-        except Exception:
-            pass
+    logos.draw(c, logo_path,
+               x + (CARD_WIDTH - BACK_LOGO_SIZE) / 2,
+               y + (CARD_HEIGHT - BACK_LOGO_SIZE) / 2,
+               BACK_LOGO_SIZE)
+
+
+def _select_cards(deck: Deck, cards_type: str) -> list[Card]:
+    """Cards to export for a cards_type ("all", "black" or "white")."""
+    cards_to_export = []
+    if cards_type in ("all", "black"):
+        cards_to_export.extend(deck.black_cards)
+    if cards_type in ("all", "white"):
+        cards_to_export.extend(deck.white_cards)
+    return cards_to_export
+
+
+def _sheet_groups(cards: Iterable[Card], layout: SheetLayout) -> Iterator[list[Card]]:
+    """Cards per sheet, consumed one sheet at a time."""
+    cards = iter(cards)
+    if layout.gang_run:
+        while page_cards := list(islice(cards, layout.per_sheet)):
+            yield page_cards
+        return
+
+    # Each card type starts on a new sheet
+    page_cards = []
+    for card in cards:
+        if page_cards and (len(page_cards) == layout.per_sheet
+                           or card.card_type != page_cards[-1].card_type):
+            yield page_cards
+            page_cards = []
+        page_cards.append(card)
+    if page_cards:
+        yield page_cards
+
+
+def _draw_bleed(c: canvas.Canvas, card_type: CardType, x: float, y: float, bleed: float):
+    """Card background extended past the cut line."""
+    if card_type == CardType.BLACK:
+        c.setFillColorRGB(0, 0, 0)
+        c.rect(x - bleed, y - bleed, CARD_WIDTH + 2 * bleed, CARD_HEIGHT + 2 * bleed,
+               fill=1, stroke=0)
+
+
+def _draw_cut_marks(c: canvas.Canvas, layout: SheetLayout):
+    c.setStrokeColorRGB(0, 0, 0)
+    c.setLineWidth(0.25)
+    c.lines(layout.cut_mark_lines)
+
+
+def _render_pages(c: canvas.Canvas, cards: Iterable[Card], config: DeckConfig,
+                  include_backs: bool = False,
+                  progress: Callable[[int], None] | None = None,
+                  cache: PageCache | None = None,
+                  logos: LogoCache | None = None,
+                  layout: SheetLayout = DEFAULT_LAYOUT) -> int:
+    """Draw cards onto consecutive pages of a canvas.
+
+    Each page is a sheet of the layout; with include_backs every front
+    page is followed by its back page, mirrored for double-sided
+    printing. Cards are consumed one page at a time, so a generator is
+    never materialised. The caller creates the canvas with the layout's
+    page size and saves it.
+
+    With a cache, pages it holds are replayed instead of drawn and drawn
+    pages are added to it; old entries are evicted when done.
+
+    Args:
+        c: Target canvas
+        cards: Cards to draw, in order
+        config: Deck configuration (names and logos)
+        include_backs: If True, add back pages for double-sided printing
+        progress: Called with the number of card pages drawn so far after
+            each one is finished
+        cache: Cache of drawn pages to reuse and fill
+        logos: Decoded logos to reuse (a new cache by default)
+        layout: Sheet layout (positions, bleed, cut marks)
+
+    Returns:
+        Number of card pages drawn (front/back pairs count once)
+    """
+    logos = logos or LogoCache()
+    page_num = 0
+
+    base = None
+    if cache is not None:
+        for font in PAGE_FONTS:
+            c._doc.getInternalFontName(font)
+        base = _page_key_base(config, include_backs, layout)
+
+    for page_cards in _sheet_groups(cards, layout):
+        # Draw front page
+        if page_num > 0:
+            c.showPage()
+
+        key = None
+        if cache is not None:
+            key = _page_key(base, page_cards)
+            entry = cache.get(key)
+            if entry is not None and _replay_page(c, entry, logos):
+                cache.hits += 1
+                page_num += 1
+                if progress is not None:
+                    progress(page_num)
+                continue
+            cache.misses += 1
+            # Record the operators drawn from here on
+            drawn = []
+            code_start, forms_start = len(c._code), len(c._formsinuse)
+
+        for card, (x, y) in zip(page_cards, layout.positions):
+            if layout.bleed:
+                _draw_bleed(c, card.card_type, x, y, layout.bleed)
+            draw_card(c, card, x, y, config.name, config.short_name,
+                      config.black_logo_path, config.white_logo_path, logos)
+        if layout.cut_marks:
+            _draw_cut_marks(c, layout)
+
+        # Draw back page (mirrored horizontally for double-sided printing)
+        if include_backs:
+            if key is not None:
+                drawn.append(_drawn_page(c, logos, code_start, forms_start))
+                code_start = forms_start = 0
+            c.showPage()
+
+            for card, (x, y) in zip(page_cards, layout.back_positions):
+                if layout.bleed:
+                    _draw_bleed(c, card.card_type, x, y, layout.bleed)
+                is_black = card.card_type == CardType.BLACK
+                back_logo = config.black_back_logo_path if is_black else config.white_back_logo_path
+                draw_card_back(c, x, y, is_black, back_logo, logos)
+
+        if key is not None:
+            drawn.append(_drawn_page(c, logos, code_start, forms_start))
+            cache.put(key, {
+                "fonts": {font: c._doc.fontMapping[font] for font in PAGE_FONTS},
+                "pages": drawn
+            })
+
+        page_num += 1
+        if progress is not None:
+            progress(page_num)
+
+    if cache is not None:
+        cache.evict()
+    return page_num
+
+
+def _render_part(part_path: str, cards: list[tuple], config: DeckConfig,
+                 include_backs: bool, cache: PageCache | None = None,
+                 layout: SheetLayout = DEFAULT_LAYOUT) -> tuple[str, int, int]:
+    """Render one shard of an export to its own PDF (process pool worker).
+
+    Returns:
+        (part path, cache hits, cache misses)
+    """
+    part_cards = [
+        Card(text=text, card_type=CardType(card_type), pick=pick)
+        for text, card_type, pick in cards
+    ]
+    c = canvas.Canvas(part_path, pagesize=layout.page_size)
+    _render_pages(c, part_cards, config, include_backs, cache=cache, layout=layout)
+    c.save()
+    if cache is None:
+        return part_path, 0, 0
+    return part_path, cache.hits, cache.misses
+
+
+def _render_id_part(part_path: str, db_path: str, deck_id: int, card_type: str | None,
+                    after: tuple[int | None, str | None], count: int, config: DeckConfig,
+                    include_backs: bool, cache: PageCache | None = None,
+                    layout: SheetLayout = DEFAULT_LAYOUT) -> tuple[str, int, int]:
+    """Render the count cards after a keyset position to their own PDF
+    (process pool worker of export_deck_id_to_pdf).
+
+    Returns:
+        (part path, cache hits, cache misses)
+    """
+    db.DB_PATH = Path(db_path)
+    after_id, after_type = after
+    cards = islice(db.iter_cards(deck_id, card_type, chunk_size=layout.per_sheet,
+                                 after_id=after_id, after_type=after_type), count)
+    c = canvas.Canvas(part_path, pagesize=layout.page_size, pageCompression=1)
+    _render_pages(c, cards, config, include_backs, cache=cache, layout=layout)
+    c.save()
+    if cache is None:
+        return part_path, 0, 0
+    return part_path, cache.hits, cache.misses
+
+
+def _id_shards(card_ids: list[int], black: int, layout: SheetLayout,
+               workers: int) -> list[tuple[tuple, int, int]]:
+    """Split a deck's cards (IDs in page order, the first black ones
+    black) into runs of whole sheets, one per worker.
+
+    Returns:
+        (keyset position before the run, cards, sheets) per run
+    """
+    total = len(card_ids)
+    if layout.gang_run:
+        starts = list(range(0, total, layout.per_sheet))
+    else:
+        starts = [*range(0, black, layout.per_sheet), *range(black, total, layout.per_sheet)]
+    sheets_per_part = (len(starts) + workers - 1) // workers
+
+    shards = []
+    for n in range(0, len(starts), sheets_per_part):
+        start = starts[n]
+        end = starts[n + sheets_per_part] if n + sheets_per_part < len(starts) else total
+        if start == 0:
+            after = (None, None)
+        else:
+            after_type = CardType.BLACK if start - 1 < black else CardType.WHITE
+            after = (card_ids[start - 1], after_type.value)
+        shards.append((after, end - start, len(starts[n:n + sheets_per_part])))
+    return shards
+
+
+def _merge_pdfs(part_paths: list[str], output_path: Path):
+    """Concatenate PDF files in order."""
+    from pypdf import PdfWriter
+
+    writer = PdfWriter()
+    for part_path in part_paths:
+        writer.append(part_path)
+    with open(output_path, "wb") as f:
+        writer.write(f)
+
+
+def _export_parallel(cards: list[Card], output_path: Path, config: DeckConfig,
+                     include_backs: bool, workers: int, cache: PageCache | None = None,
+                     layout: SheetLayout = DEFAULT_LAYOUT):
+    """Shard the page range across a process pool and merge the parts."""
+    # Shard on sheet boundaries, so each part lays out its sheets exactly
+    # as a serial export would
+    sheets = list(_sheet_groups(cards, layout))
+    sheets_per_part = (len(sheets) + workers - 1) // workers
+
+    # Plain tuples pickle faster than Card objects
+    parts = [
+        [(card.text, card.card_type.value, card.pick)
+         for sheet in sheets[start:start + sheets_per_part] for card in sheet]
+        for start in range(0, len(sheets), sheets_per_part)
+    ]
+
+    with tempfile.TemporaryDirectory(dir=output_path.parent, prefix=".export-") as tmp:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(
+                    _render_part,
+                    os.path.join(tmp, f"part-{n:04d}.pdf"),
+                    rows,
+                    config,
+                    include_backs,
+                    # Each worker counts its own hits in a copy of the cache
+                    cache,
+                    layout
+                )
+                for n, rows in enumerate(parts)
+            ]
+            # Parts are whole front/back page pairs, so mirroring is unaffected
+            part_paths = []
+            for future in futures:
+                part_path, hits, misses = future.result()
+                part_paths.append(part_path)
+                if cache is not None:
+                    cache.hits += hits
+                    cache.misses += misses
+
+        _merge_pdfs(part_paths, output_path)
+
+
+def _export_id_parallel(deck_id: int, card_type: str | None, shards: list[tuple],
+                        output_path: Path, config: DeckConfig, include_backs: bool,
+                        cache: PageCache | None, layout: SheetLayout,
+                        progress: Callable[[int, int], None] | None, total_pages: int):
+    """Render runs of sheets (see _id_shards) in a process pool and merge them."""
+    with tempfile.TemporaryDirectory(dir=output_path.parent, prefix=".export-") as tmp:
+        with ProcessPoolExecutor(max_workers=len(shards)) as pool:
+            futures = [
+                pool.submit(
+                    _render_id_part,
+                    os.path.join(tmp, f"part-{n:04d}.pdf"),
+                    str(db.DB_PATH),
+                    deck_id,
+                    card_type,
+                    after,
+                    count,
+                    config,
+                    include_backs,
+                    cache,
+                    layout
+                )
+                for n, (after, count, _) in enumerate(shards)
+            ]
+            part_paths = []
+            pages_done = 0
+            for future, (_, _, sheets) in zip(futures, shards):
+                part_path, hits, misses = future.result()
+                part_paths.append(part_path)
+                if cache is not None:
+                    cache.hits += hits
+                    cache.misses += misses
+                pages_done += sheets
+                if progress is not None:
+                    progress(pages_done, total_pages)
+
+        _merge_pdfs(part_paths, output_path)
+
+
+def parallel_workers(workers: int, total_pages: int) -> int:
+    """Number of processes an export of total_pages sheets will use.
+
+    No more than one per sheet. Parallel parts are merged with the
+    optional pypdf dependency; without it the export runs serially and a
+    RuntimeWarning says so.
+    """
+    workers = max(1, min(workers, total_pages))
+    if workers > 1 and importlib.util.find_spec("pypdf") is None:
+        warnings.warn(f"pypdf is not installed, exporting with 1 worker instead of {workers} "
+                      "(install the 'parallel' extra)", RuntimeWarning, stacklevel=2)
+        return 1
+    return workers
 
 
 def export_deck_to_pdf(deck: Deck, output_path: Path,
                        cards_type: str = "all",
-                       include_backs: bool = False) -> Path:
+                       include_backs: bool = False,
+                       workers: int = 1,
+                       cache: PageCache | None = None,
+                       layout: SheetLayout | None = None) -> Path:
     """Export a deck to PDF.
 
     Args:
@@ -167,73 +1026,112 @@ def export_deck_to_pdf(deck: Deck, output_path: Path,
         output_path: PDF file path
         cards_type: "all", "black", or "white"
         include_backs: If True, add back pages for double-sided printing
+        workers: Number of processes rendering page ranges in parallel.
+            Values above 1 need the optional pypdf dependency to merge the
+            parts; without it the export runs serially (see parallel_workers).
+        cache: Reuse pages drawn by earlier exports and store new ones
+        layout: Sheet layout (defaults to DEFAULT_LAYOUT, A4 with 3 x 3 cards)
 
     Returns:
         Path of created file
     """
-    c = canvas.Canvas(str(output_path), pagesize=A4)
-    page_width, page_height = A4
+    output_path = Path(output_path)
+    layout = layout or DEFAULT_LAYOUT
 
     # Select cards to export
-    cards_to_export = []
-    if cards_type in ("all", "black"):
-        cards_to_export.extend(deck.black_cards)
-    if cards_type in ("all", "white"):
-        cards_to_export.extend(deck.white_cards)
+    cards_to_export = _select_cards(deck, cards_type)
 
     if not cards_to_export:
         raise ValueError("No cards to export")
 
-    deck_name = deck.config.name
-    short_name = deck.config.short_name
-    black_logo_path = deck.config.black_logo_path
-    white_logo_path = deck.config.white_logo_path
-    black_back_logo_path = deck.config.black_back_logo_path
-    white_back_logo_path = deck.config.white_back_logo_path
+    black = sum(card.card_type == CardType.BLACK for card in cards_to_export)
+    total_pages = layout.sheets(black, len(cards_to_export) - black)
+    workers = parallel_workers(workers, total_pages)
+
+    if workers > 1:
+        _export_parallel(cards_to_export, output_path, deck.config, include_backs, workers,
+                         cache, layout)
+        return output_path
 
-    # Calculate starting position
-    start_x = (page_width - (CARDS_PER_ROW * CARD_WIDTH + (CARDS_PER_ROW - 1) * CARD_MARGIN)) / 2
-    start_y = page_height - PAGE_MARGIN - CARD_HEIGHT
+    c = canvas.Canvas(str(output_path), pagesize=layout.page_size)
+    _render_pages(c, cards_to_export, deck.config, include_backs, cache=cache, layout=layout)
+    c.save()
+    return output_path
 
-    # Group cards by page
-    total_pages = (len(cards_to_export) + CARDS_PER_PAGE - 1) // CARDS_PER_PAGE
 
-    for page_num in range(total_pages):
-        page_start = page_num * CARDS_PER_PAGE
-        page_end = min(page_start + CARDS_PER_PAGE, len(cards_to_export))
-        page_cards = cards_to_export[page_start:page_end]
+def export_deck_id_to_pdf(deck_id: int, output_path: Path,
+                          cards_type: str = "all",
+                          include_backs: bool = False,
+                          config: DeckConfig | None = None,
+                          progress: Callable[[int, int], None] | None = None,
+                          cache: PageCache | None = None,
+                          layout: SheetLayout | None = None,
+                          workers: int = 1) -> Path:
+    """Export a deck straight from the database.
 
-        # Draw front page
-        if page_num > 0:
-            c.showPage()
+    Cards are read through db.iter_cards one page at a time and drawn as
+    they arrive, so no Card list for the whole deck is ever built. With
+    workers, each process streams its own run of sheets the same way;
+    only the deck's card IDs are loaded up front, to split it into runs.
+
+    Args:
+        deck_id: ID of the deck to export
+        output_path: PDF file path
+        cards_type: "all", "black", or "white"
+        include_backs: If True, add back pages for double-sided printing
+        config: Names and logos to print (defaults to the stored deck config)
+        progress: Called as progress(pages_done, total_pages) after each
+            card page is drawn
+        cache: Reuse pages drawn by earlier exports and store new ones
+        layout: Sheet layout (defaults to DEFAULT_LAYOUT, A4 with 3 x 3 cards)
+        workers: Number of processes rendering runs of sheets in parallel
+            (see parallel_workers). progress is then called as each run
+            finishes.
 
-        for i, card in enumerate(page_cards):
-            col = i % CARDS_PER_ROW
-            row = i // CARDS_PER_ROW
+    Returns:
+        Path of created file
+    """
+    output_path = Path(output_path)
+    layout = layout or DEFAULT_LAYOUT
 
-            x = start_x + col * (CARD_WIDTH + CARD_MARGIN)
-            y = start_y - row * (CARD_HEIGHT + CARD_MARGIN)
+    if config is None:
+        deck = db.get_deck(deck_id, include_cards=False)
+        if deck is None:
+            raise ValueError(f"Deck {deck_id} not found")
+        config = deck.config
 
-            draw_card(c, card, x, y, deck_name, short_name, black_logo_path, white_logo_path)
+    counts = db.count_cards(deck_id)
+    types = [t for t in (CardType.BLACK.value, CardType.WHITE.value)
+             if cards_type in ("all", t)]
+    selected = {t: (counts[t] if t in types else 0)
+                for t in (CardType.BLACK.value, CardType.WHITE.value)}
 
-        # Draw back page (mirrored horizontally for double-sided printing)
-        if include_backs:
-            c.showPage()
+    if not sum(selected.values()):
+        raise ValueError("No cards to export")
 
-            for i, card in enumerate(page_cards):
-                col = i % CARDS_PER_ROW
-                row = i // CARDS_PER_ROW
+    total_pages = layout.sheets(selected[CardType.BLACK.value], selected[CardType.WHITE.value])
+    card_type = None if cards_type == "all" else cards_type
+    workers = parallel_workers(workers, total_pages)
 
-                # Mirror column position for back side
-                mirrored_col = CARDS_PER_ROW - 1 - col
+    if workers > 1:
+        card_ids = db.get_card_ids(deck_id, card_type)
+        shards = _id_shards(card_ids, selected[CardType.BLACK.value], layout, workers)
+        del card_ids
+        _export_id_parallel(deck_id, card_type, shards, output_path, config, include_backs,
+                            cache, layout, progress, total_pages)
+        return output_path
 
-                x = start_x + mirrored_col * (CARD_WIDTH + CARD_MARGIN)
-                y = start_y - row * (CARD_HEIGHT + CARD_MARGIN)
+    cards = db.iter_cards(deck_id, card_type, chunk_size=layout.per_sheet)
 
-                is_black = card.card_type == CardType.BLACK
-                back_logo = black_back_logo_path if is_black else white_back_logo_path
-                draw_card_back(c, x, y, is_black, back_logo)
+    on_page = None
+    if progress is not None:
+        def on_page(pages_done: int):
+            progress(pages_done, total_pages)
 
+    # reportlab keeps finished pages until save(); compressing them keeps
+    # that buffer a fraction of the raw content streams
+    c = canvas.Canvas(str(output_path), pagesize=layout.page_size, pageCompression=1)
+    _render_pages(c, cards, config, include_backs, on_page, cache, layout=layout)
     c.save()
     return output_path
 
@@ -244,20 +1142,11 @@ def export_cards_preview(cards: list[Card], output_path: Path,
                          black_logo_path: str | None = None,
                          white_logo_path: str | None = None) -> Path:
     """Export a preview of selected cards."""
-    c = canvas.Canvas(str(output_path), pagesize=A4)
-    page_width, page_height = A4
-
-    start_x = (page_width - (CARDS_PER_ROW * CARD_WIDTH + (CARDS_PER_ROW - 1) * CARD_MARGIN)) / 2
-    start_y = page_height - PAGE_MARGIN - CARD_HEIGHT
-
-    for i, card in enumerate(cards[:CARDS_PER_PAGE]):
-        col = i % CARDS_PER_ROW
-        row = i // CARDS_PER_ROW
-
-        x = start_x + col * (CARD_WIDTH + CARD_MARGIN)
-        y = start_y - row * (CARD_HEIGHT + CARD_MARGIN)
+    c = canvas.Canvas(str(output_path), pagesize=DEFAULT_LAYOUT.page_size)
+    logos = LogoCache()
 
-        draw_card(c, card, x, y, deck_name, short_name, black_logo_path, white_logo_path)
+    for card, (x, y) in zip(cards, DEFAULT_LAYOUT.positions):
+        draw_card(c, card, x, y, deck_name, short_name, black_logo_path, white_logo_path, logos)
 
     c.save()
     return output_path
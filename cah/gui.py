@@ -3,60 +3,68 @@
 import customtkinter as ctk
 from tkinter import filedialog, messagebox
 from pathlib import Path
-import random
-import subprocess
+import queue
 import platform
+import threading
 
 from .models import CardType, DeckConfig, Card, Deck
 from . import db
-from .export import export_deck_to_pdf
+from .combos import ComboEngine, fill_blanks
+from .deck_model import DELETED, UPDATED, DeckModel
+from .jobs import DONE, FAILED, RUNNING, ExportJobManager
+from .storage import SQLiteDeckStore
 
 # Theme configuration
 ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("blue")
 
 EXPORTS_DIR = Path(__file__).parent.parent / "exports"
-EXPORTS_DIR.mkdir(exist_ok=True)
+
+# Search box: wait this long after the last keystroke before querying
+SEARCH_DEBOUNCE_MS = 250
+# How often the Tk thread checks for finished background work
+POLL_INTERVAL_MS = 30
+# How often the export window refreshes job progress
+EXPORT_POLL_MS = 200
+
+
+_fonts: dict[tuple, ctk.CTkFont] = {}
+
+
+def _font(size: int, weight: str = "normal") -> ctk.CTkFont:
+    """Shared font instance (fonts are created once, not per widget)."""
+    key = (size, weight)
+    if key not in _fonts:
+        _fonts[key] = ctk.CTkFont(size=size, weight=weight)
+    return _fonts[key]
 
 
 class CardFrame(ctk.CTkFrame):
-    """Frame representing a clickable card."""
+    """Frame representing a clickable card.
+
+    Frames are recycled: bind_card() shows a different card in place,
+    reconfiguring text, colors and index instead of rebuilding widgets.
+    """
 
     def __init__(self, master, card: Card, on_click=None, index=None, **kwargs):
-        is_black = card.card_type == CardType.BLACK
-        fg_color = "#1a1a1a" if is_black else "#f5f5f5"
-        hover_color = "#333333" if is_black else "#e0e0e0"
-        super().__init__(master, fg_color=fg_color, corner_radius=10, **kwargs)
+        super().__init__(master, corner_radius=10, **kwargs)
 
-        self.card = card
         self.on_click = on_click
-        self.default_color = fg_color
-        self.hover_color = hover_color
-        text_color = "white" if is_black else "black"
-        index_color = "#666666" if is_black else "#999999"
-
-        # Header with index
-        if index is not None:
-            header = ctk.CTkFrame(self, fg_color="transparent")
-            header.pack(fill="x", padx=10, pady=(8, 0))
-
-            self.index_label = ctk.CTkLabel(
-                header,
-                text=f"#{index}",
-                text_color=index_color,
-                font=ctk.CTkFont(size=10)
-            )
-            self.index_label.pack(side="left")
+        self.index = None
+        self._has_index = None
+
+        # Header with index (packed only when an index is shown)
+        self.header = ctk.CTkFrame(self, fg_color="transparent")
+        self.index_label = ctk.CTkLabel(self.header, text="", font=_font(10))
+        self.index_label.pack(side="left")
 
         self.label = ctk.CTkLabel(
             self,
-            text=card.text,
-            text_color=text_color,
-            font=ctk.CTkFont(size=12, weight="bold"),
+            text="",
+            font=_font(12, "bold"),
             wraplength=180,
             justify="left"
         )
-        self.label.pack(padx=15, pady=(5 if index else 15, 15), fill="both", expand=True)
 
         # Bind click events
         if on_click:
@@ -67,6 +75,36 @@ class CardFrame(ctk.CTkFrame):
             self.label.configure(cursor="hand2")
             self.configure(cursor="hand2")
 
+        self.bind_card(card, index)
+
+    def bind_card(self, card: Card, index=None):
+        """Show another card in this frame."""
+        self.card = card
+        self.index = index
+        is_black = card.card_type == CardType.BLACK
+        self.default_color = "#1a1a1a" if is_black else "#f5f5f5"
+        self.hover_color = "#333333" if is_black else "#e0e0e0"
+
+        self.configure(fg_color=self.default_color)
+        self.label.configure(text=card.text, text_color="white" if is_black else "black")
+
+        has_index = index is not None
+        if has_index:
+            self.index_label.configure(
+                text=f"#{index}",
+                text_color="#666666" if is_black else "#999999"
+            )
+
+        # Repack only when the layout changes (index shown or hidden)
+        if has_index != self._has_index:
+            self._has_index = has_index
+            self.label.pack_forget()
+            if has_index:
+                self.header.pack(fill="x", padx=10, pady=(8, 0))
+            else:
+                self.header.pack_forget()
+            self.label.pack(padx=15, pady=(5 if has_index else 15, 15), fill="both", expand=True)
+
     def _handle_click(self, event):
         if self.on_click:
             self.on_click(self.card)
@@ -78,6 +116,219 @@ class CardFrame(ctk.CTkFrame):
         self.configure(fg_color=self.default_color)
 
 
+class VirtualCardGrid(ctk.CTkFrame):
+    """Continuously scrollable card grid that only renders the visible rows.
+
+    The grid knows the ordered card IDs of the whole view but only fetches
+    and draws the rows in the viewport, reusing one pool of CardFrames
+    while scrolling.
+    """
+
+    ROW_HEIGHT = 130
+
+    def __init__(self, master, on_click=None, cols: int = 3, **kwargs):
+        super().__init__(master, fg_color="transparent", **kwargs)
+        self.on_click = on_click
+        self.cols = cols
+
+        self._card_ids: list[int] = []
+        self._deck_id: int | None = None
+        self._index_for = lambda position: position + 1
+        self._first_row = 0
+        self._visible_rows = 1
+        self._frames: list[CardFrame] = []
+        self._render_pending = False
+
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.body = ctk.CTkFrame(self, fg_color="transparent")
+        self.body.pack(side="left", fill="both", expand=True)
+        for col in range(cols):
+            self.body.columnconfigure(col, weight=1, uniform="card")
+
+        self.body.bind("<Configure>", self._on_resize)
+
+    def set_cards(self, card_ids: list[int], index_for=None, deck_id: int | None = None):
+        """Show a new view: ordered card IDs and a position -> display index map."""
+        self._card_ids = card_ids
+        self._deck_id = deck_id
+        if index_for:
+            self._index_for = index_for
+        self._first_row = 0
+        self._render()
+
+    def insert_card(self, position: int, card_id: int):
+        """Insert one card into the view."""
+        self._card_ids.insert(position, card_id)
+        self._schedule_render()
+
+    def append_card(self, card_id: int):
+        """Add one card at the end of the view."""
+        self.insert_card(self.card_count, card_id)
+
+    def remove_card(self, card_id: int):
+        """Drop one card from the view."""
+        if card_id in self._card_ids:
+            self._card_ids.remove(card_id)
+            self._schedule_render()
+
+    def _schedule_render(self):
+        # Several changes in a row (e.g. a batch add) redraw once
+        if not self._render_pending:
+            self._render_pending = True
+            self.after_idle(self._render)
+
+    def frames(self) -> list[CardFrame]:
+        """The frames showing cards (they are reused while scrolling)."""
+        return list(self._frames)
+
+    @property
+    def card_count(self) -> int:
+        return len(self._card_ids)
+
+    @property
+    def total_rows(self) -> int:
+        return (len(self._card_ids) + self.cols - 1) // self.cols
+
+    def scroll_rows(self, rows: int):
+        """Scroll by a number of rows (negative = up)."""
+        self.scroll_to_row(self._first_row + rows)
+
+    def scroll_to_row(self, row: int):
+        last_first = max(0, self.total_rows - self._visible_rows + 1)
+        row = max(0, min(row, last_first))
+        if row != self._first_row:
+            self._first_row = row
+            self._render()
+
+    def _on_scrollbar(self, action, value, unit=None):
+        if action == "moveto":
+            self.scroll_to_row(round(float(value) * self.total_rows))
+        elif action == "scroll":
+            step = self._visible_rows - 1 if unit == "pages" else 1
+            self.scroll_rows(int(value) * max(1, step))
+
+    def _on_resize(self, event):
+        visible = max(1, event.height // self.ROW_HEIGHT + 1)
+        if visible != self._visible_rows:
+            self._visible_rows = visible
+            self._render()
+
+    def _render(self):
+        """Fetch and draw only the rows currently in the viewport."""
+        self._render_pending = False
+        start = self._first_row * self.cols
+        visible_ids = self._card_ids[start:start + self._visible_rows * self.cols]
+        cards = db.get_cards_by_ids(visible_ids, self._deck_id) if visible_ids else []
+
+        for i, card in enumerate(cards):
+            index = self._index_for(start + i)
+            if i < len(self._frames):
+                frame = self._frames[i]
+                frame.bind_card(card, index)
+            else:
+                frame = CardFrame(self.body, card, on_click=self.on_click, index=index,
+                                  height=self.ROW_HEIGHT - 10)
+                frame.pack_propagate(False)
+                self._frames.append(frame)
+            frame.grid(row=i // self.cols, column=i % self.cols, padx=5, pady=5, sticky="nsew")
+
+        for frame in self._frames[len(cards):]:
+            frame.grid_remove()
+
+        total = max(1, self.total_rows)
+        self.scrollbar.set(self._first_row / total,
+                           min(1.0, (self._first_row + self._visible_rows) / total))
+
+
+class SearchController:
+    """Debounced, cancellable search that runs off the Tk thread.
+
+    submit() (re)starts the debounce window; when it expires the latest
+    request is run by ``run`` on a background worker thread. Results come
+    back through a queue that the Tk thread polls with after(), and only
+    the result of the most recent request is passed to ``deliver``:
+    anything superseded in the meantime is dropped.
+    """
+
+    def __init__(self, widget, run, deliver, delay_ms: int = SEARCH_DEBOUNCE_MS):
+        self.widget = widget
+        self.run = run
+        self.deliver = deliver
+        self.delay_ms = delay_ms
+
+        self._generation = 0
+        self._debounce_id = None
+        self._queued_generation = None
+        self._polling = False
+        self._requests: queue.Queue = queue.Queue()
+        self._results: queue.Queue = queue.Queue()
+
+        worker = threading.Thread(target=self._worker, name="cah-search", daemon=True)
+        worker.start()
+
+    def submit(self, request):
+        """Schedule a search, superseding any pending or running one."""
+        self.cancel()
+        generation = self._generation
+        self._debounce_id = self.widget.after(self.delay_ms, self._start, generation, request)
+
+    def cancel(self):
+        """Drop pending and in-flight searches."""
+        self._generation += 1
+        if self._debounce_id is not None:
+            self.widget.after_cancel(self._debounce_id)
+            self._debounce_id = None
+
+    def _start(self, generation: int, request):
+        self._debounce_id = None
+        if generation != self._generation:
+            return
+        self._requests.put((generation, request))
+        self._queued_generation = generation
+        if not self._polling:
+            self._polling = True
+            self.widget.after(POLL_INTERVAL_MS, self._poll)
+
+    def _worker(self):
+        while True:
+            generation, request = self._requests.get()
+            # Skip requests that went stale while waiting
+            if generation != self._generation:
+                self._results.put((generation, None, None))
+                continue
+            try:
+                self._results.put((generation, self.run(request), None))
+            except Exception as e:
+                self._results.put((generation, None, e))
+
+    def _poll(self):
+        latest = None
+        while True:
+            try:
+                generation, result, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if generation == self._generation:
+                latest = (result, error)
+
+        if latest is not None:
+            self._polling = False
+            self._queued_generation = None
+            result, error = latest
+            if error is not None:
+                messagebox.showerror("Error", f"Search error:\n{error}")
+            else:
+                self.deliver(result)
+        elif self._queued_generation != self._generation:
+            # Cancelled with nothing current left to wait for; stale results
+            # still on the way are drained by the next search's polling
+            self._polling = False
+        else:
+            self.widget.after(POLL_INTERVAL_MS, self._poll)
+
+
 class CAHApp(ctk.CTk):
     """Main application."""
 
@@ -88,25 +339,41 @@ class CAHApp(ctk.CTk):
         self.geometry("1200x800")
         self.minsize(900, 650)
 
-        # Initialize database
-        db.ensure_db()
+        # Initialize database; whole-deck operations go through the store
+        self.store = SQLiteDeckStore()
 
         # Load default deck or first available
+        # The model holds the deck config and counts; cards are read page by page
         deck_id = db.get_default_deck_id()
-        if deck_id:
-            self.current_deck = db.get_deck(deck_id)
-        else:
+        self.model = DeckModel.load(deck_id) if deck_id else None
+        if self.model is None:
             # Create empty deck if none exists
-            deck_id = db.create_deck("Cards Against Humanity", "CAH")
-            self.current_deck = db.get_deck(deck_id)
-
-        # Pagination
+            self.model = DeckModel.create(DeckConfig(name="Cards Against Humanity", short_name="CAH"))
+        self.model.subscribe(self._on_deck_event)
+        self._reload_pending = False
+        # Random combo sampler for the current deck (built on first use)
+        self._combos = None
+        # Background PDF exports (workers start with the first export)
+        self._export_jobs = None
+        self._export_window = None
+
+        # Pagination (keyset cursors: last card before each page start)
         self._page = 0
+        self._page_starts = [None]
         self._cards_per_page = 30
 
         self._create_layout()
+        self._search = SearchController(self, self._query_view, self._render_view)
         self._refresh_cards_view()
 
+    @property
+    def current_deck(self) -> Deck:
+        return self.model.deck
+
+    @property
+    def _counts(self) -> dict:
+        return self.model.counts
+
     def _create_layout(self):
         """Create the main layout."""
         # Sidebar
@@ -256,6 +523,16 @@ class CAHApp(ctk.CTk):
         )
         self.btn_export.pack(side="bottom", pady=(0, 10))
 
+        self.btn_export_jobs = ctk.CTkButton(
+            self.sidebar,
+            text="Exports",
+            command=self._show_export_jobs,
+            width=160,
+            fg_color="transparent",
+            border_width=1
+        )
+        self.btn_export_jobs.pack(side="bottom", pady=(0, 10))
+
         # Main area
         self.main_frame = ctk.CTkFrame(self, fg_color="transparent")
         self.main_frame.pack(side="right", fill="both", expand=True, padx=10, pady=10)
@@ -271,6 +548,16 @@ class CAHApp(ctk.CTk):
         )
         self.title_label.pack(side="left")
 
+        # Continuous (virtualized) scroll instead of pages
+        self.continuous_var = ctk.BooleanVar(value=False)
+        self.continuous_switch = ctk.CTkSwitch(
+            self.header_frame,
+            text="Continuous",
+            variable=self.continuous_var,
+            command=self._toggle_continuous
+        )
+        self.continuous_switch.pack(side="right", padx=(10, 0))
+
         # Search
         self.search_var = ctk.StringVar()
         self.search_var.trace_add("write", lambda *args: self._filter_cards())
@@ -283,9 +570,13 @@ class CAHApp(ctk.CTk):
         )
         self.search_entry.pack(side="right")
 
-        # Scrollable card area
+        # Scrollable card area (paged mode)
         self.cards_scroll = ctk.CTkScrollableFrame(self.main_frame)
         self.cards_scroll.pack(fill="both", expand=True)
+        self._card_pool: list[CardFrame] = []
+
+        # Virtualized card area (continuous mode, shown instead of cards_scroll)
+        self.virtual_grid = VirtualCardGrid(self.main_frame, on_click=self._edit_card)
 
         # Pagination at bottom
         self.pagination_frame = ctk.CTkFrame(self.main_frame, fg_color="transparent")
@@ -327,20 +618,36 @@ class CAHApp(ctk.CTk):
         self._scroll_canvas = canvas
 
         # Keyboard scroll (always works)
-        self.bind_all("<Up>", lambda e: canvas.yview_scroll(-3, "units"))
-        self.bind_all("<Down>", lambda e: canvas.yview_scroll(3, "units"))
-        self.bind_all("<Prior>", lambda e: canvas.yview_scroll(-10, "units"))  # Page Up
-        self.bind_all("<Next>", lambda e: canvas.yview_scroll(10, "units"))    # Page Down
-        self.bind_all("<Home>", lambda e: canvas.yview_moveto(0))
-        self.bind_all("<End>", lambda e: canvas.yview_moveto(1))
+        self.bind_all("<Up>", lambda e: self._scroll_units(-3))
+        self.bind_all("<Down>", lambda e: self._scroll_units(3))
+        self.bind_all("<Prior>", lambda e: self._scroll_units(-10))  # Page Up
+        self.bind_all("<Next>", lambda e: self._scroll_units(10))    # Page Down
+        self.bind_all("<Home>", lambda e: self._scroll_to(0))
+        self.bind_all("<End>", lambda e: self._scroll_to(1))
 
         # Page change with left/right arrows (not in text fields)
         self.bind_all("<Left>", self._on_left_key)
         self.bind_all("<Right>", self._on_right_key)
 
         # Mouse wheel - use Enter/Leave to bind/unbind
-        self.cards_scroll.bind("<Enter>", self._on_enter_scroll_area)
-        self.cards_scroll.bind("<Leave>", self._on_leave_scroll_area)
+        for area in (self.cards_scroll, self.virtual_grid):
+            area.bind("<Enter>", self._on_enter_scroll_area)
+            area.bind("<Leave>", self._on_leave_scroll_area)
+
+    def _scroll_units(self, units: int):
+        """Scroll the active card area (3 units = one row in continuous mode)."""
+        if self.continuous_var.get():
+            rows = units // 3 if abs(units) >= 3 else (1 if units > 0 else -1)
+            self.virtual_grid.scroll_rows(rows)
+        else:
+            self._scroll_canvas.yview_scroll(units, "units")
+
+    def _scroll_to(self, fraction: float):
+        """Jump to the start (0) or end (1) of the active card area."""
+        if self.continuous_var.get():
+            self.virtual_grid.scroll_to_row(0 if fraction == 0 else self.virtual_grid.total_rows)
+        else:
+            self._scroll_canvas.yview_moveto(fraction)
 
     def _on_enter_scroll_area(self, event):
         """Enable scroll when mouse enters the area."""
@@ -360,77 +667,174 @@ class CAHApp(ctk.CTk):
 
     def _on_mousewheel_mac(self, event):
         """Scroll on macOS."""
-        self._scroll_canvas.yview_scroll(-event.delta, "units")
+        if event.delta:
+            self._scroll_units(-event.delta)
 
     def _on_mousewheel_other(self, event):
         """Scroll on Windows/Linux."""
-        self._scroll_canvas.yview_scroll(int(-event.delta / 120), "units")
+        units = int(-event.delta / 120)
+        if units:
+            self._scroll_units(units)
 
     def _on_scroll_up(self, event):
-        self._scroll_canvas.yview_scroll(-3, "units")
+        self._scroll_units(-3)
 
     def _on_scroll_down(self, event):
-        self._scroll_canvas.yview_scroll(3, "units")
+        self._scroll_units(3)
 
     def _on_left_key(self, event):
         """Previous page if not in text field."""
+        if self.continuous_var.get():
+            return
         if not isinstance(event.widget, (ctk.CTkEntry, ctk.CTkTextbox)):
             self._prev_page()
 
     def _on_right_key(self, event):
         """Next page if not in text field."""
+        if self.continuous_var.get():
+            return
         if not isinstance(event.widget, (ctk.CTkEntry, ctk.CTkTextbox)):
             self._next_page()
 
+    def _toggle_continuous(self):
+        """Switch between paged and continuous (virtualized) scrolling."""
+        self._apply_scroll_mode()
+        current_type = getattr(self, '_current_view_type', 'all')
+        self._refresh_cards_view(current_type)
+
+    def _apply_scroll_mode(self):
+        """Show the card area matching the continuous switch."""
+        if self.continuous_var.get():
+            self.cards_scroll.pack_forget()
+            self.pagination_frame.pack_forget()
+            self.virtual_grid.pack(fill="both", expand=True)
+        else:
+            self.virtual_grid.pack_forget()
+            self.cards_scroll.pack(fill="both", expand=True)
+            self.pagination_frame.pack(fill="x", pady=(10, 0))
+
+    def _clear_cards_area(self):
+        """Remove everything but the recycled card frames from the card area."""
+        pool = set(self._card_pool)
+        for widget in self.cards_scroll.winfo_children():
+            if widget in pool:
+                widget.grid_remove()
+            else:
+                widget.destroy()
+
     def _refresh_cards_view(self, card_type: str = "all", reset_page: bool = True):
         """Refresh the cards display."""
+        # A direct refresh supersedes any search still in flight
+        self._search.cancel()
+        self._render_view(self._query_view(self._begin_view(card_type, reset_page)))
+
+    def _begin_view(self, card_type: str, reset_page: bool) -> dict:
+        """Update view state and describe the cards to query for it."""
         # Save current type for subsequent refreshes
         self._current_view_type = card_type
 
         # Reset page when view or search changes
         if reset_page:
             self._page = 0
+            self._page_starts = [None]
+        self._page = min(self._page, len(self._page_starts) - 1)
+
+        search_term = self.search_var.get().strip() or None
+        return {
+            "deck_id": self.current_deck.id,
+            "card_type": card_type,
+            "search": search_term,
+            "continuous": self.continuous_var.get(),
+            "after": self._page_starts[self._page],
+            "limit": self._cards_per_page,
+            # Unfiltered totals are already known
+            "counts": None if search_term else dict(self._counts),
+        }
+
+    @staticmethod
+    def _query_view(view: dict) -> dict:
+        """Run the database queries for a view (safe on a worker thread)."""
+        type_filter = None if view["card_type"] == "all" else view["card_type"]
+        counts = view["counts"] or db.count_cards(view["deck_id"], view["search"])
+
+        if view["continuous"]:
+            card_ids = db.get_card_ids(view["deck_id"], type_filter, view["search"])
+            return {**view, "counts": counts, "card_ids": card_ids}
+
+        after = view["after"]
+        cards = db.get_cards_page(
+            view["deck_id"],
+            type_filter,
+            view["search"],
+            after_id=after[1] if after else None,
+            limit=view["limit"],
+            after_type=after[0] if after else None
+        )
+        return {**view, "counts": counts, "cards": cards}
 
-        # Clear
-        for widget in self.cards_scroll.winfo_children():
-            widget.destroy()
+    def _render_view(self, result: dict):
+        """Show the result of _query_view (Tk thread)."""
+        card_type = result["card_type"]
+        counts = result["counts"]
+
+        # Remove leftovers of other views (e.g. random combo)
+        self._clear_cards_area()
 
-        # Select cards
         if card_type == "black":
-            all_cards = self.current_deck.black_cards
             self.title_label.configure(text="Black Cards (Questions)")
         elif card_type == "white":
-            all_cards = self.current_deck.white_cards
             self.title_label.configure(text="White Cards (Answers)")
         else:
-            all_cards = self.current_deck.black_cards + self.current_deck.white_cards
             self.title_label.configure(text="All Cards")
 
-        # Filter by search
-        search_term = self.search_var.get().lower()
-        if search_term:
-            all_cards = [c for c in all_cards if search_term in c.text.lower()]
+        if card_type == "all":
+            total_cards = counts["black"] + counts["white"]
+        else:
+            total_cards = counts[card_type]
+
+        if result["continuous"]:
+            search_counts = counts if result["search"] else None
+
+            def index_for(position: int) -> int:
+                # Black cards come first in the "all" view. Deck events add
+                # and remove cards of an unfiltered view in place, so its
+                # black count is read when the numbers are drawn
+                black_total = (search_counts or self._counts)["black"]
+                if card_type == "all" and position >= black_total:
+                    return position - black_total + 1
+                return position + 1
+
+            self.virtual_grid.set_cards(result["card_ids"], index_for, result["deck_id"])
+            return
+
+        # Edits then reach the very objects shown on this page
+        cards = self.model.remember(result["cards"])
 
         # Calculate pagination
-        total_cards = len(all_cards)
         total_pages = max(1, (total_cards + self._cards_per_page - 1) // self._cards_per_page)
-        self._page = min(self._page, total_pages - 1)
 
-        start_idx = self._page * self._cards_per_page
-        end_idx = min(start_idx + self._cards_per_page, total_cards)
-        cards = all_cards[start_idx:end_idx]
+        # Remember where the next page starts
+        has_next = self._page < total_pages - 1 and len(cards) == self._cards_per_page
+        if has_next and len(self._page_starts) == self._page + 1:
+            last = cards[-1]
+            self._page_starts.append((last.card_type.value, last.id))
 
         # Update pagination UI
         self.page_label.configure(text=f"Page {self._page + 1}/{total_pages} ({total_cards} cards)")
         self.btn_prev_page.configure(state="normal" if self._page > 0 else "disabled")
-        self.btn_next_page.configure(state="normal" if self._page < total_pages - 1 else "disabled")
+        self.btn_next_page.configure(state="normal" if has_next else "disabled")
 
-        # Calculate base indices for this page
-        # Count how many black/white cards before this page
-        black_before = sum(1 for c in all_cards[:start_idx] if c.card_type == CardType.BLACK)
-        white_before = sum(1 for c in all_cards[:start_idx] if c.card_type == CardType.WHITE)
+        # Base indices for this page: black cards come first in the "all" view
+        start_idx = self._page * self._cards_per_page
+        if card_type == "black":
+            black_before, white_before = start_idx, 0
+        elif card_type == "white":
+            black_before, white_before = 0, start_idx
+        else:
+            black_before = min(start_idx, counts["black"])
+            white_before = start_idx - black_before
 
-        # Card grid
+        # Card grid: reuse pooled frames, create only what the pool lacks
         cols = 3
         black_idx = black_before
         white_idx = white_before
@@ -446,9 +850,17 @@ class CAHApp(ctk.CTk):
                 white_idx += 1
                 display_idx = white_idx
 
-            card_frame = CardFrame(self.cards_scroll, card, on_click=self._edit_card, index=display_idx)
+            if i < len(self._card_pool):
+                card_frame = self._card_pool[i]
+                card_frame.bind_card(card, display_idx)
+            else:
+                card_frame = CardFrame(self.cards_scroll, card, on_click=self._edit_card, index=display_idx)
+                self._card_pool.append(card_frame)
             card_frame.grid(row=row, column=col, padx=5, pady=5, sticky="nsew")
 
+        for card_frame in self._card_pool[len(cards):]:
+            card_frame.grid_remove()
+
         # Configure grid
         for i in range(cols):
             self.cards_scroll.columnconfigure(i, weight=1)
@@ -469,14 +881,15 @@ class CAHApp(ctk.CTk):
 
     def _next_page(self):
         """Go to next page."""
-        self._page += 1
-        current_type = getattr(self, '_current_view_type', 'all')
-        self._refresh_cards_view(current_type, reset_page=False)
+        if self._page < len(self._page_starts) - 1:
+            self._page += 1
+            current_type = getattr(self, '_current_view_type', 'all')
+            self._refresh_cards_view(current_type, reset_page=False)
 
     def _filter_cards(self):
-        """Filter cards based on search."""
+        """Filter cards based on search (debounced, queried in the background)."""
         current_type = getattr(self, '_current_view_type', 'all')
-        self._refresh_cards_view(current_type)  # reset_page=True by default
+        self._search.submit(self._begin_view(current_type, reset_page=True))
 
     def _edit_card(self, card: Card):
         """Open dialog to edit a card."""
@@ -486,36 +899,67 @@ class CAHApp(ctk.CTk):
         if dialog.result:
             action, new_text, new_pick = dialog.result
 
-            if action == "delete":
-                # Remove card from database
-                if card.id:
-                    db.delete_card(card.id)
-                # Remove from local list
-                if card.card_type == CardType.BLACK:
-                    self.current_deck.black_cards.remove(card)
+            # The model saves the change and notifies _on_deck_event
+            if action == "delete" and card.id:
+                self.model.delete_card(card.id)
+            elif action == "save" and card.id:
+                self.model.update_card(card.id, new_text, new_pick)
+
+    def _on_deck_event(self, kind: str, card: Card):
+        """Patch the view after a card was added, updated or deleted."""
+        self._update_stats()
+        # Card IDs or picks changed
+        self._combos = None
+        searching = bool(self.search_var.get().strip())
+        current_type = getattr(self, '_current_view_type', 'all')
+
+        if kind == UPDATED and not searching:
+            # Only the frames showing this card change
+            for frame in self._card_pool + self.virtual_grid.frames():
+                if frame.card.id == card.id:
+                    frame.bind_card(card, frame.index)
+            return
+
+        if self.continuous_var.get() and not searching:
+            if kind == DELETED:
+                self.virtual_grid.remove_card(card.id)
+            elif current_type in ("all", card.card_type.value):
+                # New cards have the highest ID: last of their type
+                if current_type == "all" and card.card_type == CardType.BLACK:
+                    self.virtual_grid.insert_card(self._counts["black"] - 1, card.id)
                 else:
-                    self.current_deck.white_cards.remove(card)
-            elif action == "save":
-                # Update card in database
-                if card.id:
-                    db.update_card(card.id, new_text, new_pick)
-                # Update locally
-                card.text = new_text
-                card.pick = new_pick
-
-            self._update_stats()
-            current_type = getattr(self, '_current_view_type', 'all')
-            self._refresh_cards_view(current_type)
+                    self.virtual_grid.append_card(card.id)
+            return
+
+        # Paged view: re-query only the current page, once per batch of events
+        if not self._reload_pending:
+            self._reload_pending = True
+            self.after_idle(self._reload_page)
+
+    def _reload_page(self):
+        """Show the current page again (its content shifted)."""
+        self._reload_pending = False
+        # Cursors of the following pages may have moved
+        del self._page_starts[self._page + 1:]
+        current_type = getattr(self, '_current_view_type', 'all')
+        self._refresh_cards_view(current_type, reset_page=False)
 
     def _show_random_combo(self):
         """Show a random combination."""
+        # The combo is drawn in the paged card area
+        if self.continuous_var.get():
+            self.continuous_var.set(False)
+            self._apply_scroll_mode()
+
         # Clear
-        for widget in self.cards_scroll.winfo_children():
-            widget.destroy()
+        self._clear_cards_area()
 
         self.title_label.configure(text="Random Combination")
 
-        if not self.current_deck.black_cards or not self.current_deck.white_cards:
+        # Sample IDs from the cached engine, then fetch just those cards
+        if self._combos is None:
+            self._combos = ComboEngine.from_db(self.current_deck.id)
+        if not self._combos.can_draw:
             ctk.CTkLabel(
                 self.cards_scroll,
                 text="Need black and white cards to generate combinations",
@@ -523,11 +967,9 @@ class CAHApp(ctk.CTk):
             ).pack(pady=50)
             return
 
-        black_card = random.choice(self.current_deck.black_cards)
-        white_cards = random.sample(
-            self.current_deck.white_cards,
-            min(black_card.pick, len(self.current_deck.white_cards))
-        )
+        black_id, white_ids = self._combos.draw()
+        black_card, *white_cards = db.get_cards_by_ids([black_id, *white_ids],
+                                                       self.current_deck.id)
 
         # Center container
         combo_frame = ctk.CTkFrame(self.cards_scroll, fg_color="transparent")
@@ -570,20 +1012,7 @@ class CAHApp(ctk.CTk):
             white_frame.pack(side="left")
 
         # Result - build the phrase
-        result = black_card.text
-        blanks_count = result.count("_____")
-
-        if blanks_count >= len(white_cards):
-            # Replace blanks with cards
-            for wc in white_cards:
-                result = result.replace("_____", f"[{wc.text}]", 1)
-        else:
-            # Not enough blanks, add answers at the end
-            for i, wc in enumerate(white_cards):
-                if "_____" in result:
-                    result = result.replace("_____", f"[{wc.text}]", 1)
-                else:
-                    result += f" [{wc.text}]"
+        result = fill_blanks(black_card.text, [wc.text for wc in white_cards], "[{}]")
 
         result_label = ctk.CTkLabel(
             combo_frame,
@@ -610,20 +1039,15 @@ class CAHApp(ctk.CTk):
 
         if dialog.result:
             name, short_name, black_logo, white_logo, import_default = dialog.result
-            # Create deck in database
-            deck_id = db.create_deck(name, short_name, black_logo, white_logo)
-
-            if import_default:
-                # Copy cards from default deck
-                default_id = db.get_default_deck_id()
-                if default_id and default_id != deck_id:
-                    default_deck = db.get_deck(default_id)
-                    for card in default_deck.black_cards + default_deck.white_cards:
-                        db.add_card(deck_id, card.text, card.card_type, card.pick)
-
-            self.current_deck = db.get_deck(deck_id)
-            self._update_stats()
-            self._refresh_cards_view()
+            config = DeckConfig(name=name, short_name=short_name,
+                                black_logo_path=black_logo, white_logo_path=white_logo)
+
+            # Copy cards from default deck, streamed from the database
+            default_id = db.get_default_deck_id()
+            cards = db.iter_cards(default_id) if import_default and default_id else ()
+
+            # The new model already knows its config and counts
+            self._set_model(DeckModel.create(config, cards))
             messagebox.showinfo("Success", f"Deck '{name}' created!")
 
     def _set_as_default(self):
@@ -637,20 +1061,35 @@ class CAHApp(ctk.CTk):
 
     def _load_deck_dialog(self):
         """Open dialog to load a deck."""
-        decks = db.list_decks()
+        decks = self.store.list_decks()
 
         if not decks:
             messagebox.showinfo("Info", "No saved decks.")
             return
 
-        dialog = LoadDeckDialog(self, decks)
+        dialog = LoadDeckDialog(self, decks, self.store)
         self.wait_window(dialog)
 
         if dialog.result:
-            deck_id = dialog.result
-            self.current_deck = db.get_deck(deck_id)
-            self._update_stats()
-            self._refresh_cards_view()
+            # The listing already has the counts
+            summary = dialog.result
+            self._open_deck(summary["key"], {"black": summary["black_count"],
+                                             "white": summary["white_count"]})
+
+    def _open_deck(self, deck_id: int, counts: dict | None = None):
+        """Make a stored deck current and show its first page."""
+        model = DeckModel.load(deck_id, counts)
+        if model is not None:
+            self._set_model(model)
+
+    def _set_model(self, model: DeckModel):
+        """Switch to another deck model and show its first page."""
+        self.model.unsubscribe(self._on_deck_event)
+        self.model = model
+        self.model.subscribe(self._on_deck_event)
+        self._combos = None
+        self._update_stats()
+        self._refresh_cards_view()
 
     def _add_card_dialog(self):
         """Open dialog to add a card."""
@@ -659,16 +1098,7 @@ class CAHApp(ctk.CTk):
 
         if dialog.result:
             card_type, text, pick = dialog.result
-            # Save to database
-            card_id = db.add_card(self.current_deck.id, text, card_type, pick)
-            # Add locally
-            card = Card(text=text, card_type=card_type, pick=pick, id=card_id)
-            if card_type == CardType.BLACK:
-                self.current_deck.black_cards.append(card)
-            else:
-                self.current_deck.white_cards.append(card)
-            self._update_stats()
-            self._refresh_cards_view()
+            self.model.add_card(text, card_type, pick)
             messagebox.showinfo("Success", "Card added!")
 
     def _add_batch_dialog(self):
@@ -678,56 +1108,68 @@ class CAHApp(ctk.CTk):
 
         if dialog.result:
             black_cards, white_cards = dialog.result
-            count = 0
-
-            for text in black_cards:
-                if text.strip():
-                    card_id = db.add_card(self.current_deck.id, text.strip(), CardType.BLACK, 1)
-                    card = Card(text=text.strip(), card_type=CardType.BLACK, pick=1, id=card_id)
-                    self.current_deck.black_cards.append(card)
-                    count += 1
-
-            for text in white_cards:
-                if text.strip():
-                    card_id = db.add_card(self.current_deck.id, text.strip(), CardType.WHITE, 1)
-                    card = Card(text=text.strip(), card_type=CardType.WHITE, pick=1, id=card_id)
-                    self.current_deck.white_cards.append(card)
-                    count += 1
+            cards = [
+                Card(text=text.strip(), card_type=CardType.BLACK, pick=1)
+                for text in black_cards if text.strip()
+            ] + [
+                Card(text=text.strip(), card_type=CardType.WHITE, pick=1)
+                for text in white_cards if text.strip()
+            ]
+
+            count = len(self.model.add_cards(cards))
 
             if count > 0:
-                self._update_stats()
-                self._refresh_cards_view()
                 messagebox.showinfo("Success", f"{count} cards added!")
 
     def _update_stats(self):
         """Update displayed statistics."""
         self.stats_label.configure(
-            text=f"Cards: {len(self.current_deck.black_cards)} black, "
-                 f"{len(self.current_deck.white_cards)} white"
+            text=f"Cards: {self._counts['black']} black, "
+                 f"{self._counts['white']} white"
         )
 
     def _export_pdf(self):
         """Export deck to PDF."""
-        dialog = ExportDialog(self, self.current_deck)
+        dialog = ExportDialog(self, db.get_deck(self.current_deck.id, include_cards=False))
         self.wait_window(dialog)
+        if dialog.job is not None:
+            self._show_export_jobs()
+
+    @property
+    def export_jobs(self):
+        """The export job manager, created on first use."""
+        if self._export_jobs is None:
+            self._export_jobs = ExportJobManager()
+        return self._export_jobs
+
+    def _show_export_jobs(self):
+        """Open (or raise) the window listing export jobs."""
+        if self._export_window is None or not self._export_window.winfo_exists():
+            self._export_window = ExportJobsWindow(self, self.export_jobs)
+        else:
+            self._export_window.lift()
 
     def _copy_as_text(self):
         """Copy deck as text to clipboard."""
+        cards = db.get_card_store(self.current_deck.id)
+        black_count = cards.count(CardType.BLACK)
+        white_count = len(cards) - black_count
+
         lines = []
         lines.append(f"# {self.current_deck.config.name}")
-        lines.append(f"# Black cards: {len(self.current_deck.black_cards)}, White cards: {len(self.current_deck.white_cards)}")
+        lines.append(f"# Black cards: {black_count}, White cards: {white_count}")
         lines.append("")
 
         lines.append("## BLACK CARDS (Questions)")
         lines.append("")
-        for i, card in enumerate(self.current_deck.black_cards, 1):
+        for i, card in enumerate(cards.cards(CardType.BLACK), 1):
             pick_info = f" [PICK {card.pick}]" if card.pick > 1 else ""
             lines.append(f"{i}. {card.text}{pick_info}")
 
         lines.append("")
         lines.append("## WHITE CARDS (Answers)")
         lines.append("")
-        for i, card in enumerate(self.current_deck.white_cards, 1):
+        for i, card in enumerate(cards.cards(CardType.WHITE), 1):
             lines.append(f"{i}. {card.text}")
 
         text = "\n".join(lines)
@@ -739,8 +1181,8 @@ class CAHApp(ctk.CTk):
         messagebox.showinfo(
             "Copied!",
             f"Deck copied to clipboard!\n\n"
-            f"{len(self.current_deck.black_cards)} black cards\n"
-            f"{len(self.current_deck.white_cards)} white cards"
+            f"{black_count} black cards\n"
+            f"{white_count} white cards"
         )
 
 
@@ -842,10 +1284,11 @@ class NewDeckDialog(ctk.CTkToplevel):
 class LoadDeckDialog(ctk.CTkToplevel):
     """Dialog to load a saved deck."""
 
-    def __init__(self, parent, decks: list):
+    def __init__(self, parent, decks: list, store):
         super().__init__(parent)
         self.result = None
         self.decks = decks
+        self.store = store
 
         self.title("Load Deck")
         self.geometry("400x380")
@@ -895,13 +1338,13 @@ class LoadDeckDialog(ctk.CTkToplevel):
 
     def _load(self):
         idx = self.selected_idx.get()
-        self.result = self.decks[idx]["id"]
+        self.result = self.decks[idx]
         self.destroy()
 
     def _delete(self):
         idx = self.selected_idx.get()
         if messagebox.askyesno("Confirm", f"Delete '{self.decks[idx]['name']}'?"):
-            db.delete_deck(self.decks[idx]["id"])
+            self.store.delete_deck(self.decks[idx]["key"])
             self.destroy()
 
 
@@ -1183,9 +1626,10 @@ class ExportDialog(ctk.CTkToplevel):
     def __init__(self, parent, deck):
         super().__init__(parent)
         self.deck = deck
+        self.job = None
 
         self.title("Export PDF")
-        self.geometry("400x680")
+        self.geometry("400x730")
         self.resizable(False, False)
 
         ctk.CTkLabel(
@@ -1297,6 +1741,25 @@ class ExportDialog(ctk.CTkToplevel):
                 value=value
             ).pack(side="left", padx=10)
 
+        # Sheet size (as many cards as fit on it)
+        sheet_frame = ctk.CTkFrame(self, fg_color="transparent")
+        sheet_frame.pack(pady=(15, 0))
+        ctk.CTkLabel(sheet_frame, text="Sheet:").pack(side="left", padx=5)
+        self.sheet = ctk.StringVar(value="A4")
+        ctk.CTkOptionMenu(
+            sheet_frame,
+            values=["A4", "A3", "SRA3", "Auto"],
+            variable=self.sheet,
+            width=90
+        ).pack(side="left", padx=5)
+
+        self.cut_marks = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(
+            sheet_frame,
+            text="Cut marks",
+            variable=self.cut_marks
+        ).pack(side="left", padx=10)
+
         # Export button
         ctk.CTkButton(
             self,
@@ -1338,36 +1801,123 @@ class ExportDialog(ctk.CTkToplevel):
         self.deck.config.black_back_logo_path = black_back_logo if black_back_logo and Path(black_back_logo).exists() else None
         self.deck.config.white_back_logo_path = white_back_logo if white_back_logo and Path(white_back_logo).exists() else None
 
-        # Output path
-        filename = f"{self.deck.config.short_name.lower()}_{self.export_type.get()}.pdf"
+        # Output path (exports of different options may run at the same time)
+        EXPORTS_DIR.mkdir(exist_ok=True)
+        backs = "_backs" if self.include_backs.get() else ""
+        sheet = self.sheet.get().lower()
+        size = "" if sheet == "a4" else f"_{sheet}"
+        filename = f"{self.deck.config.short_name.lower()}_{self.export_type.get()}{backs}{size}.pdf"
         output_path = EXPORTS_DIR / filename
 
+        # The export runs in the background; progress shows in the export window
         try:
-            export_deck_to_pdf(
-                self.deck,
+            self.job = self.master.export_jobs.submit(
+                self.deck.id,
                 output_path,
                 self.export_type.get(),
-                include_backs=self.include_backs.get()
+                include_backs=self.include_backs.get(),
+                config=self.deck.config,
+                sheet=sheet,
+                cut_marks=self.cut_marks.get()
             )
-            self.destroy()
-            # Open file manager and select file
-            self._reveal_in_file_manager(output_path)
-        except Exception as e:
-            messagebox.showerror("Error", f"Export error:\n{e}")
-
-    def _reveal_in_file_manager(self, path: Path):
-        """Open file manager showing the file."""
-        system = platform.system()
-        try:
-            if system == "Darwin":  # macOS
-                subprocess.run(["open", "-R", str(path)])
-            elif system == "Windows":
-                subprocess.run(["explorer", "/select,", str(path)])
-            else:  # Linux
-                subprocess.run(["xdg-open", str(path.parent)])
-        except Exception:
-            # Fallback: show message with path
-            messagebox.showinfo("Success", f"PDF created:\n{path}")
+        except queue.Full:
+            messagebox.showerror("Error", "Too many exports waiting, try again later.")
+            return
+        self.destroy()
+
+
+class ExportJobsWindow(ctk.CTkToplevel):
+    """Progress of running, queued and recent exports."""
+
+    def __init__(self, parent, manager):
+        super().__init__(parent)
+        self.manager = manager
+        self._rows: dict[int, dict] = {}
+
+        self.title("Exports")
+        self.geometry("520x360")
+
+        ctk.CTkLabel(
+            self,
+            text="PDF Exports",
+            font=ctk.CTkFont(size=16, weight="bold")
+        ).pack(pady=(15, 10))
+
+        self.list_frame = ctk.CTkScrollableFrame(self, width=480, height=260)
+        self.list_frame.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+
+        self._poll()
+
+    def _add_row(self, job) -> dict:
+        frame = ctk.CTkFrame(self.list_frame)
+        first = next(iter(self._rows.values()), None)
+        if first is not None:
+            frame.pack(fill="x", pady=4, before=first["frame"])  # newest on top
+        else:
+            frame.pack(fill="x", pady=4)
+
+        ctk.CTkLabel(frame, text=job.label, anchor="w").pack(fill="x", padx=10, pady=(6, 2))
+        bar = ctk.CTkProgressBar(frame)
+        bar.set(0)
+        bar.pack(fill="x", padx=10)
+
+        bottom = ctk.CTkFrame(frame, fg_color="transparent")
+        bottom.pack(fill="x", padx=10, pady=(2, 6))
+        status = ctk.CTkLabel(bottom, text="", text_color="gray", anchor="w")
+        status.pack(side="left")
+        button = ctk.CTkButton(bottom, text="Cancel", width=70, fg_color="#c0392b",
+                               command=lambda: self.manager.cancel(job.id))
+        button.pack(side="right")
+
+        row = {"frame": frame, "bar": bar, "status": status, "button": button, "state": None}
+        # Newest first, matching the packing order
+        self._rows = {job.id: row, **self._rows}
+        return row
+
+    def _update_row(self, row: dict, job):
+        row["bar"].set(job.fraction)
+        if job.state == RUNNING and job.pages_total:
+            row["status"].configure(text=f"{job.pages_done}/{job.pages_total} pages")
+        elif job.state == FAILED:
+            row["status"].configure(text=f"failed: {job.error}")
+        elif job.state == DONE and job.cache_stats and job.cache_stats["hits"]:
+            row["status"].configure(text=f"done, {job.cache_stats['hit_rate']:.0%} of pages reused")
+        else:
+            row["status"].configure(text=job.state)
+
+        if job.state == row["state"]:
+            return
+        row["state"] = job.state
+        if job.state == DONE:
+            row["button"].configure(text="Show", fg_color="#27ae60",
+                                    command=lambda: _reveal_in_file_manager(job.output_path))
+        elif job.finished:
+            row["button"].pack_forget()
+
+    def _poll(self):
+        if not self.winfo_exists():
+            return
+        for job in self.manager.jobs():
+            row = self._rows.get(job.id) or self._add_row(job)
+            self._update_row(row, job)
+        self.after(EXPORT_POLL_MS, self._poll)
+
+
+def _reveal_in_file_manager(path: Path):
+    """Open file manager showing the file."""
+    import subprocess
+
+    system = platform.system()
+    try:
+        if system == "Darwin":  # macOS
+            subprocess.run(["open", "-R", str(path)])
+        elif system == "Windows":
+            subprocess.run(["explorer", "/select,", str(path)])
+        else:  # Linux
+            subprocess.run(["xdg-open", str(path.parent)])
+    except Exception:
+        # Fallback: show message with path
+        messagebox.showinfo("Success", f"PDF created:\n{path}")
 
 
 def run_gui():
@@ -0,0 +1,218 @@
+"""Background PDF exports with progress reporting and cancellation.
+
+An ExportJobManager runs exports on a small pool of worker threads fed by
+a bounded queue. Each job records its progress (card pages drawn out of
+the total) as it runs, so a UI can poll the jobs instead of blocking on
+an export. Finished, failed and cancelled jobs stay in a short history.
+"""
+
+import itertools
+import queue
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .models import DeckConfig
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED_STATES = (DONE, FAILED, CANCELLED)
+
+
+class JobCancelled(Exception):
+    """Raised from an export's progress callback to stop it."""
+
+
+@dataclass
+class ExportJob:
+    """One export and its progress.
+
+    Workers update the state and page counts; readers (the GUI) only look
+    at them.
+    """
+    id: int
+    deck_id: int
+    output_path: Path
+    cards_type: str = "all"
+    include_backs: bool = False
+    config: DeckConfig | None = None
+    sheet: str = "a4"
+    cut_marks: bool = False
+    state: str = QUEUED
+    pages_done: int = 0
+    pages_total: int = 0
+    error: str | None = None
+    cache_stats: dict | None = None
+    submitted_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    finished_at: float | None = None
+    _cancel: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    @property
+    def label(self) -> str:
+        backs = " + backs" if self.include_backs else ""
+        return f"{self.output_path.name} ({self.cards_type}{backs}, {self.sheet.upper()})"
+
+    @property
+    def finished(self) -> bool:
+        return self.state in FINISHED_STATES
+
+    @property
+    def fraction(self) -> float:
+        """Share of pages drawn, 0 to 1."""
+        if self.state == DONE:
+            return 1.0
+        return self.pages_done / self.pages_total if self.pages_total else 0.0
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel.is_set()
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "deck_id": self.deck_id,
+            "output": str(self.output_path),
+            "cards_type": self.cards_type,
+            "include_backs": self.include_backs,
+            "sheet": self.sheet,
+            "cut_marks": self.cut_marks,
+            "state": self.state,
+            "pages_done": self.pages_done,
+            "pages_total": self.pages_total,
+            "error": self.error,
+            "page_cache": self.cache_stats
+        }
+
+
+class ExportJobManager:
+    """Runs PDF exports on worker threads.
+
+    Exports share the process, so a worker pool mainly keeps several
+    exports moving (and the caller responsive) rather than making one
+    export faster; use export_deck_to_pdf's workers for that.
+
+    Args:
+        workers: Number of exports running at the same time
+        max_queued: Jobs that may wait for a worker; submit() refuses more
+        history: Finished jobs to remember
+        use_cache: Reuse pages drawn by earlier exports (see PageCache)
+    """
+
+    def __init__(self, workers: int = 2, max_queued: int = 8, history: int = 20,
+                 use_cache: bool = True):
+        self.use_cache = use_cache
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queued)
+        self._active: dict[int, ExportJob] = {}
+        self._history: deque[ExportJob] = deque(maxlen=history)
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._workers = [
+            threading.Thread(target=self._work, name=f"cah-export-{n}", daemon=True)
+            for n in range(workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, deck_id: int, output_path: Path, cards_type: str = "all",
+               include_backs: bool = False, config: DeckConfig | None = None,
+               sheet: str = "a4", cut_marks: bool = False) -> ExportJob:
+        """Queue an export (arguments as for export_deck_id_to_pdf; sheet
+        and cut_marks as for resolve_layout).
+
+        Raises:
+            queue.Full: max_queued jobs are already waiting
+        """
+        job = ExportJob(next(self._ids), deck_id, Path(output_path), cards_type,
+                        include_backs, config, sheet, cut_marks)
+        with self._lock:
+            self._queue.put_nowait(job)
+            self._active[job.id] = job
+        return job
+
+    def cancel(self, job_id: int) -> bool:
+        """Stop a job: a queued one never starts, a running one stops after
+        its current page. Returns False if the job already finished."""
+        with self._lock:
+            job = self._active.get(job_id)
+            if job is None:
+                return False
+            job._cancel.set()
+            if job.state == QUEUED:
+                self._finish(job, CANCELLED)
+        return True
+
+    def cancel_all(self):
+        for job in self.jobs():
+            self.cancel(job.id)
+
+    def get(self, job_id: int) -> ExportJob | None:
+        with self._lock:
+            job = self._active.get(job_id)
+            if job is not None:
+                return job
+            return next((job for job in self._history if job.id == job_id), None)
+
+    def jobs(self) -> list[ExportJob]:
+        """Running and queued jobs, then the history, newest first."""
+        with self._lock:
+            active = sorted(self._active.values(), key=lambda job: -job.id)
+            return active + list(reversed(self._history))
+
+    def _finish(self, job: ExportJob, state: str, error: str | None = None):
+        """Move a job to the history (called with the lock held)."""
+        job.state = state
+        job.error = error
+        job.finished_at = time.time()
+        self._active.pop(job.id, None)
+        self._history.append(job)
+
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            # reportlab and Pillow load with the first export
+            from . import db
+            from .export import PageCache, export_deck_id_to_pdf, resolve_layout
+
+            with self._lock:
+                if job.finished:
+                    continue  # cancelled while queued
+                job.state = RUNNING
+                job.started_at = time.time()
+
+            def progress(pages_done: int, pages_total: int, job=job):
+                job.pages_done, job.pages_total = pages_done, pages_total
+                if job.cancel_requested:
+                    raise JobCancelled()
+
+            cache = PageCache() if self.use_cache else None
+            try:
+                counts = db.count_cards(job.deck_id)
+                layout = resolve_layout(
+                    job.sheet,
+                    counts["black"] if job.cards_type in ("all", "black") else 0,
+                    counts["white"] if job.cards_type in ("all", "white") else 0,
+                    cut_marks=job.cut_marks
+                )
+                export_deck_id_to_pdf(job.deck_id, job.output_path, job.cards_type,
+                                      include_backs=job.include_backs, config=job.config,
+                                      progress=progress, cache=cache, layout=layout)
+            except JobCancelled:
+                # Nothing was written: the canvas only writes the file on save
+                state, error = CANCELLED, None
+            except Exception as e:
+                state, error = FAILED, str(e)
+            else:
+                state, error = DONE, None
+
+            if cache is not None:
+                job.cache_stats = cache.stats()
+            with self._lock:
+                self._finish(job, state, error)
@@ -1,8 +1,9 @@
 """Data models for cards."""
 
+from array import array
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 import json
 from pathlib import Path
 
@@ -13,7 +14,7 @@ class CardType(Enum):
     WHITE = "white"  # Answer cards (white)
 
 
-@dataclass
+@dataclass(slots=True)
 class Card:
     """Represents a single card."""
     text: str
@@ -37,7 +38,221 @@ class Card:
         )
 
 
-@dataclass
+# Column codes used by CardStore
+_TYPES = (CardType.BLACK, CardType.WHITE)
+_TYPE_CODES = {CardType.BLACK: 0, CardType.WHITE: 1}
+
+# Texts appended or replaced since the last compact() that trigger the next
+# one (at least this many, and at least as many as are already packed)
+COMPACT_MIN_TEXTS = 1024
+
+
+def _text_width(text: str) -> int:
+    """Storage width of a str (0: 1 byte per character, 1: 2 bytes, 2: 4 bytes)."""
+    if not text or text.isascii():
+        return 0
+    widest = ord(max(text))
+    return 0 if widest < 0x100 else 1 if widest < 0x10000 else 2
+
+
+class CardStore:
+    """Columnar storage for many cards.
+
+    IDs, types and picks live in typed arrays and the texts in shared
+    string tables, so a card costs a few dozen bytes plus its text instead
+    of a full object. Indexing and iteration give CardView objects that
+    offer the Card API.
+
+    Texts are packed into the tables by compact(), one table per string
+    width, so a single wide character does not widen every other text.
+    Texts appended or replaced since then are kept as separate strings;
+    compact() runs by itself once there are as many of those as packed
+    texts, which keeps appends and edits amortised O(1).
+    """
+
+    __slots__ = ("ids", "types", "picks", "_starts", "_lengths", "_widths", "_tables",
+                 "_dead", "_packed", "_tail", "_replaced")
+
+    def __init__(self, cards: Iterable["Card"] = ()):
+        self.ids = array("q")
+        self.types = array("b")
+        self.picks = array("b")
+        # Where each packed text is: table (by width), offset and length
+        self._widths = array("b")
+        self._starts = array("q")
+        self._lengths = array("l")
+        self._tables = ("", "", "")
+        self._dead = 0  # Characters of replaced texts still in the tables
+        # Cards [0, _packed) have packed texts, unless replaced since;
+        # later cards' texts are in _tail
+        self._packed = 0
+        self._tail: list[str] = []
+        self._replaced: dict[int, str] = {}
+        self.extend(cards)
+
+    def append(self, text: str, card_type: CardType, pick: int = 1,
+               card_id: Optional[int] = None) -> int:
+        """Add a card; returns its index."""
+        self._tail.append(text)
+        self.types.append(_TYPE_CODES[card_type])
+        self.picks.append(pick)
+        self.ids.append(-1 if card_id is None else card_id)
+        self._compact_if_due()
+        return len(self.ids) - 1
+
+    def extend(self, cards: Iterable["Card"]):
+        """Add Card (or CardView) objects."""
+        for card in cards:
+            self.append(card.text, card.card_type, card.pick, card.id)
+
+    def text(self, index: int) -> str:
+        if index >= self._packed:
+            return self._tail[index - self._packed]
+        text = self._replaced.get(index)
+        if text is not None:
+            return text
+        start = self._starts[index]
+        return self._tables[self._widths[index]][start:start + self._lengths[index]]
+
+    def set_text(self, index: int, text: str):
+        if index >= self._packed:
+            self._tail[index - self._packed] = text
+        else:
+            self._replaced[index] = text
+            self._compact_if_due()
+
+    def _compact_if_due(self):
+        if len(self._tail) + len(self._replaced) >= max(COMPACT_MIN_TEXTS, self._packed):
+            self.compact()
+
+    def compact(self):
+        """Pack the texts kept as separate strings into the string tables.
+
+        New texts are appended to the tables; they are rebuilt from scratch
+        only once replaced texts take up half of them.
+        """
+        for index, text in self._replaced.items():
+            self._dead += self._lengths[index]
+        if self._dead * 2 > sum(len(table) for table in self._tables):
+            texts = [self.text(index) for index in range(len(self.ids))]
+            self._tables = ("", "", "")
+            self._widths, self._starts, self._lengths = array("b"), array("q"), array("l")
+            self._dead = 0
+            replaced = {}
+        else:
+            texts = self._tail
+            replaced = self._replaced
+
+        parts: tuple[list[str], list[str], list[str]] = ([], [], [])
+        offsets = [len(table) for table in self._tables]
+
+        def pack(text: str) -> tuple[int, int]:
+            width = _text_width(text)
+            parts[width].append(text)
+            offsets[width] += len(text)
+            return width, offsets[width] - len(text)
+
+        for index, text in replaced.items():
+            self._widths[index], self._starts[index] = pack(text)
+            self._lengths[index] = len(text)
+        for text in texts:
+            width, start = pack(text)
+            self._widths.append(width)
+            self._starts.append(start)
+            self._lengths.append(len(text))
+
+        self._tables = tuple(table + "".join(part) if part else table
+                             for table, part in zip(self._tables, parts))
+        self._packed = len(self.ids)
+        self._tail = []
+        self._replaced = {}
+
+    def count(self, card_type: Optional[CardType] = None) -> int:
+        if card_type is None:
+            return len(self.ids)
+        return self.types.count(_TYPE_CODES[card_type])
+
+    def cards(self, card_type: Optional[CardType] = None) -> Iterator["CardView"]:
+        """Views of all cards, or of one type, in insertion order."""
+        code = None if card_type is None else _TYPE_CODES[card_type]
+        for index, type_code in enumerate(self.types):
+            if code is None or type_code == code:
+                yield CardView(self, index)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, index: int) -> "CardView":
+        if index < 0:
+            index += len(self.ids)
+        if not 0 <= index < len(self.ids):
+            raise IndexError("card index out of range")
+        return CardView(self, index)
+
+    def __iter__(self) -> Iterator["CardView"]:
+        return self.cards()
+
+
+class CardView:
+    """A card inside a CardStore, with the same attributes as Card."""
+
+    __slots__ = ("store", "index")
+
+    def __init__(self, store: CardStore, index: int):
+        self.store = store
+        self.index = index
+
+    @property
+    def text(self) -> str:
+        return self.store.text(self.index)
+
+    @text.setter
+    def text(self, value: str):
+        self.store.set_text(self.index, value)
+
+    @property
+    def card_type(self) -> CardType:
+        return _TYPES[self.store.types[self.index]]
+
+    @property
+    def pick(self) -> int:
+        return self.store.picks[self.index]
+
+    @pick.setter
+    def pick(self, value: int):
+        self.store.picks[self.index] = value
+
+    @property
+    def id(self) -> Optional[int]:
+        card_id = self.store.ids[self.index]
+        return None if card_id < 0 else card_id
+
+    def to_card(self) -> "Card":
+        return Card(text=self.text, card_type=self.card_type, pick=self.pick, id=self.id)
+
+    def to_dict(self) -> dict:
+        return {
+            "text": self.text,
+            "card_type": self.card_type.value,
+            "pick": self.pick
+        }
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (Card, CardView)):
+            return (self.text, self.card_type, self.pick, self.id) == \
+                (other.text, other.card_type, other.pick, other.id)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        # By value, like __eq__: changes if the card is edited
+        return hash((self.text, self.card_type, self.pick, self.id))
+
+    def __repr__(self) -> str:
+        return (f"CardView(text={self.text!r}, card_type={self.card_type}, "
+                f"pick={self.pick}, id={self.id})")
+
+
+@dataclass(slots=True)
 class DeckConfig:
     """Custom deck configuration."""
     name: str = "Cards Against Humanity"
@@ -66,7 +281,7 @@ class DeckConfig:
         return cls(**data)
 
 
-@dataclass
+@dataclass(slots=True)
 class Deck:
     """Represents a custom card deck."""
     config: DeckConfig
@@ -108,10 +323,10 @@ class Deck:
 
     @classmethod
     def load(cls, path: Path) -> "Deck":
-        """Load deck from file."""
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        return cls.from_dict(data)
+        """Load deck from file (streamed, see cardfile.read_deck)."""
+        from .cardfile import read_deck
+
+        return read_deck(path)
 
     @property
     def total_cards(self) -> int:
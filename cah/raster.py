@@ -0,0 +1,376 @@
+"""Export cards as images: one file per card and sprite sheets.
+
+Card faces are drawn with Pillow using the same layout as the PDF export
+(export.layout_text breaks the lines and picks the font size), so a card
+looks the same on paper and on screen. Sprite sheets are rendered by a
+process pool, one sheet per task; each worker writes its sheet and card
+images as soon as they are drawn and only returns the sheet's index
+entries, so memory stays bounded however large the deck is.
+
+The output directory gets:
+
+    index.json            Sheets, and each card's sheet and rectangle
+    sheet-0000.png ...    Sprite sheets (texture atlases)
+    cards/000000.png ...  Card faces, in export order (with card_files)
+    back-black.png ...    Card backs (with include_backs)
+"""
+
+import json
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+from PIL import Image, ImageDraw, ImageFont, features
+
+from . import db
+from .export import (
+    BACK_LOGO_SIZE, CARD_HEIGHT, CARD_PADDING, CARD_WIDTH, CORNER_RADIUS, LOGO_SIZE,
+    TEXT_BOX_WIDTH, TEXT_TOP, _select_cards, layout_text
+)
+from .models import Card, CardType, Deck, DeckConfig
+
+IMAGE_FORMATS = ("png", "webp")
+RASTER_DPI = 150
+SHEET_MAX_SIZE = 4096   # Common GPU texture size limit, in pixels
+SHEET_PADDING = 2       # Pixels between cards, so textures do not bleed
+INDEX_VERSION = 1
+
+# Bold sans-serif fonts to draw with, best match for Helvetica-Bold first
+# (Liberation Sans and Arial share its metrics). Pillow looks the file names
+# up in the system font directories.
+FONT_FILES = (
+    "LiberationSans-Bold.ttf",
+    "Arial Bold.ttf",
+    "arialbd.ttf",
+    "Helvetica.ttc",
+    "DejaVuSans-Bold.ttf",
+)
+
+
+@dataclass(frozen=True)
+class RasterOptions:
+    """How cards are drawn and packed (pickled to the workers)."""
+    dpi: int = RASTER_DPI
+    image_format: str = "png"
+    sheet_max_size: int = SHEET_MAX_SIZE
+    padding: int = SHEET_PADDING
+    card_files: bool = True
+
+    @property
+    def scale(self) -> float:
+        """Pixels per point."""
+        return self.dpi / 72
+
+    @property
+    def card_size(self) -> tuple[int, int]:
+        return round(CARD_WIDTH * self.scale), round(CARD_HEIGHT * self.scale)
+
+    @property
+    def grid(self) -> tuple[int, int]:
+        """Columns and rows of cards on a sprite sheet."""
+        width, height = self.card_size
+        cols = (self.sheet_max_size + self.padding) // (width + self.padding)
+        rows = (self.sheet_max_size + self.padding) // (height + self.padding)
+        if not cols or not rows:
+            raise ValueError(f"A card ({width}x{height} px) does not fit on a "
+                             f"{self.sheet_max_size} px sheet")
+        return cols, rows
+
+    @property
+    def per_sheet(self) -> int:
+        cols, rows = self.grid
+        return cols * rows
+
+
+@lru_cache(maxsize=64)
+def _font(size_px: int) -> ImageFont.FreeTypeFont:
+    """Card font at a pixel size (Pillow's bundled font if none is installed)."""
+    for name in FONT_FILES:
+        try:
+            # Helvetica.ttc holds Helvetica Bold at index 1
+            return ImageFont.truetype(name, size_px, index=1 if name.endswith(".ttc") else 0)
+        except OSError:
+            continue
+    return ImageFont.load_default(size_px)
+
+
+@lru_cache(maxsize=32)
+def _logo(logo_path: str | None, size_px: int) -> Image.Image | None:
+    """Logo scaled to fit a size_px square, or None if unusable."""
+    if not logo_path or not Path(logo_path).exists():
+        return None
+    try:
+        with Image.open(logo_path) as img:
+            img = img.convert("RGBA")
+        img.thumbnail((size_px, size_px), Image.LANCZOS)
+        return img
+    except Exception:
+        return None
+
+
+def _paste_logo(img: Image.Image, logo_path: str | None, x: float, y: float,
+                size: float, scale: float) -> bool:
+    """Paste a logo centred in a size x size box (points, top-left origin)."""
+    logo = _logo(logo_path, round(size * scale))
+    if logo is None:
+        return False
+    left = round(x * scale + (size * scale - logo.width) / 2)
+    top = round(y * scale + (size * scale - logo.height) / 2)
+    img.alpha_composite(logo, (left, top))
+    return True
+
+
+def _card_base(is_black: bool, options: RasterOptions) -> tuple[Image.Image, ImageDraw.ImageDraw]:
+    """Blank card: rounded background with a grey outline, transparent corners."""
+    img = Image.new("RGBA", options.card_size, (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    scale = options.scale
+    draw.rounded_rectangle(
+        (0, 0, img.width - 1, img.height - 1),
+        radius=round(CORNER_RADIUS * scale),
+        fill=(0, 0, 0) if is_black else (255, 255, 255),
+        outline=(128, 128, 128),
+        width=max(1, round(0.5 * scale))
+    )
+    return img, draw
+
+
+def render_card(card: Card, config: DeckConfig,
+                options: RasterOptions = RasterOptions()) -> Image.Image:
+    """Draw a card face as an RGBA image, laid out like export.draw_card.
+
+    Positions are those of the PDF export, converted from points measured
+    from the card's bottom-left corner to pixels from its top-left corner.
+    """
+    scale = options.scale
+    is_black = card.card_type == CardType.BLACK
+    img, draw = _card_base(is_black, options)
+    text_color = (255, 255, 255) if is_black else (0, 0, 0)
+    logo_path = config.black_logo_path if is_black else config.white_logo_path
+
+    def baseline(y: float) -> float:
+        return (CARD_HEIGHT - y) * scale
+
+    # Deck name at top, centered
+    draw.text((img.width / 2, baseline(CARD_HEIGHT - CARD_PADDING - 7)), config.name,
+              font=_font(round(7 * scale)), fill=text_color, anchor="ms")
+
+    # Card text: the PDF layout's lines and size, shrunk if the installed
+    # font runs wider than Helvetica
+    layout = layout_text(card.text)
+    font = _font(round(layout.font_size * scale))
+    widest = max((font.getlength(line) for line in layout.lines), default=0)
+    shrink = min(1.0, TEXT_BOX_WIDTH * scale / widest) if widest else 1.0
+    if shrink < 1.0:
+        font = _font(max(1, int(layout.font_size * scale * shrink)))
+
+    first = CARD_HEIGHT - TEXT_TOP - layout.font_size
+    for i, line in enumerate(layout.lines):
+        draw.text((CARD_PADDING * scale, baseline(first - i * layout.line_height)), line,
+                  font=font, fill=text_color, anchor="ls")
+
+    # Logo or short name in bottom right
+    drawn = _paste_logo(img, logo_path, CARD_WIDTH - CARD_PADDING - LOGO_SIZE,
+                        CARD_HEIGHT - CARD_PADDING - LOGO_SIZE, LOGO_SIZE, scale)
+    if not drawn:
+        draw.text(((CARD_WIDTH - CARD_PADDING) * scale, baseline(CARD_PADDING)),
+                  config.short_name, font=_font(round(8 * scale)), fill=text_color, anchor="rs")
+
+    # "Pick X" indicator for black cards with pick > 1 (bottom left)
+    if is_black and card.pick > 1:
+        draw.text((CARD_PADDING * scale, baseline(CARD_PADDING)), f"PICK {card.pick}",
+                  font=_font(round(8 * scale)), fill=text_color, anchor="ls")
+
+    return img
+
+
+def render_card_back(is_black: bool, logo_path: str | None = None,
+                     options: RasterOptions = RasterOptions()) -> Image.Image:
+    """Draw a card back with its centered logo."""
+    img, _ = _card_base(is_black, options)
+    _paste_logo(img, logo_path, (CARD_WIDTH - BACK_LOGO_SIZE) / 2,
+                (CARD_HEIGHT - BACK_LOGO_SIZE) / 2, BACK_LOGO_SIZE, options.scale)
+    return img
+
+
+def _save(img: Image.Image, path: Path, image_format: str):
+    """Write an image atomically, so readers never see half a file."""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-", suffix=path.suffix)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            if image_format == "webp":
+                img.save(f, "WEBP", lossless=True)
+            else:
+                img.save(f, "PNG")
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _render_sheet(sheet: int, first: int, cards: list[tuple], config: DeckConfig,
+                  options: RasterOptions, output_dir: str) -> tuple[dict, list[dict]]:
+    """Render one sprite sheet and its card images (process pool worker).
+
+    Returns:
+        (sheet entry, card entries) for the index
+    """
+    output_dir = Path(output_dir)
+    cols, _ = options.grid
+    width, height = options.card_size
+    pitch_x, pitch_y = width + options.padding, height + options.padding
+    rows = -(-len(cards) // cols)
+    sheet_img = Image.new("RGBA", (min(len(cards), cols) * pitch_x - options.padding,
+                                   rows * pitch_y - options.padding), (0, 0, 0, 0))
+    ext = options.image_format
+    entries = []
+
+    for i, (card_id, text, card_type, pick) in enumerate(cards):
+        card = Card(text=text, card_type=CardType(card_type), pick=pick, id=card_id)
+        img = render_card(card, config, options)
+        x, y = (i % cols) * pitch_x, (i // cols) * pitch_y
+        sheet_img.paste(img, (x, y))
+
+        entry = {"id": card_id, "card_type": card_type, "pick": pick,
+                 "sheet": sheet, "x": x, "y": y, "w": width, "h": height}
+        if options.card_files:
+            name = f"cards/{first + i:06d}.{ext}"
+            _save(img, output_dir / name, ext)
+            entry["file"] = name
+        entries.append(entry)
+
+    name = f"sheet-{sheet:04d}.{ext}"
+    _save(sheet_img, output_dir / name, ext)
+    return {"file": name, "w": sheet_img.width, "h": sheet_img.height, "cards": len(cards)}, entries
+
+
+def export_images(cards: Iterable[Card], output_dir: Path, config: DeckConfig,
+                  options: RasterOptions = RasterOptions(),
+                  include_backs: bool = False, workers: int | None = None,
+                  progress: Callable[[int], None] | None = None) -> dict:
+    """Render cards to sprite sheets (and card files) with a process pool.
+
+    Cards are consumed one sheet at a time and at most two sheets per
+    worker are in flight, so a generator (e.g. db.iter_cards) is never
+    materialised. index.json is written last, once every image exists.
+
+    Args:
+        cards: Cards to render, in order
+        output_dir: Directory to write to (created if missing)
+        config: Deck name, short name and logos to draw
+        options: Resolution, format and sheet size
+        include_backs: Also write back-black and back-white images
+        workers: Processes to render with (default: one per CPU)
+        progress: Called with the number of cards written after each sheet
+
+    Returns:
+        The index written to index.json
+    """
+    if options.image_format not in IMAGE_FORMATS:
+        raise ValueError(f"Unknown image format '{options.image_format}' "
+                         f"(expected one of: {', '.join(IMAGE_FORMATS)})")
+    if options.image_format == "webp" and not features.check("webp"):
+        raise ValueError("This Pillow build cannot write WebP images")
+
+    per_sheet = options.per_sheet
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    if options.card_files:
+        (output_dir / "cards").mkdir(exist_ok=True)
+
+    workers = workers or os.cpu_count() or 1
+    sheets, entries = [], []
+
+    def sheet_tasks() -> Iterator[tuple[int, int, list[tuple]]]:
+        it = iter(cards)
+        sheet = 0
+        # Plain tuples pickle faster than Card objects
+        while chunk := [(card.id, card.text, card.card_type.value, card.pick)
+                        for card in islice(it, per_sheet)]:
+            yield sheet, sheet * per_sheet, chunk
+            sheet += 1
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = []
+        for sheet, first, chunk in sheet_tasks():
+            pending.append(pool.submit(_render_sheet, sheet, first, chunk, config,
+                                       options, str(output_dir)))
+            if len(pending) >= 2 * workers:
+                _collect(pending.pop(0), sheets, entries, progress)
+        for future in pending:
+            _collect(future, sheets, entries, progress)
+
+    if not entries:
+        raise ValueError("No cards to export")
+
+    backs = {}
+    if include_backs:
+        for card_type in (CardType.BLACK, CardType.WHITE):
+            is_black = card_type == CardType.BLACK
+            logo = config.black_back_logo_path if is_black else config.white_back_logo_path
+            name = f"back-{card_type.value}.{options.image_format}"
+            _save(render_card_back(is_black, logo, options), output_dir / name,
+                  options.image_format)
+            backs[card_type.value] = name
+
+    width, height = options.card_size
+    index = {
+        "version": INDEX_VERSION,
+        "deck": {"name": config.name, "short_name": config.short_name},
+        "dpi": options.dpi,
+        "format": options.image_format,
+        "card_size": {"w": width, "h": height},
+        "sheets": sheets,
+        "backs": backs,
+        "cards": entries,
+    }
+    fd, tmp = tempfile.mkstemp(dir=output_dir, prefix=".tmp-", suffix=".json")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False)
+    os.replace(tmp, output_dir / "index.json")
+    return index
+
+
+def _collect(future, sheets: list[dict], entries: list[dict],
+             progress: Callable[[int], None] | None):
+    sheet, sheet_entries = future.result()
+    sheets.append(sheet)
+    entries.extend(sheet_entries)
+    if progress is not None:
+        progress(len(entries))
+
+
+def export_deck_images(deck: Deck, output_dir: Path, cards_type: str = "all",
+                       **kwargs) -> dict:
+    """Render a deck's cards to images (keyword arguments as for export_images)."""
+    return export_images(_select_cards(deck, cards_type), output_dir, deck.config, **kwargs)
+
+
+def export_deck_id_images(deck_id: int, output_dir: Path, cards_type: str = "all",
+                          config: DeckConfig | None = None, **kwargs) -> dict:
+    """Render a deck straight from the database, streaming its cards.
+
+    Args:
+        deck_id: ID of the deck to export
+        output_dir: Directory to write to
+        cards_type: "all", "black", or "white"
+        config: Names and logos to draw (defaults to the stored deck config)
+        **kwargs: As for export_images
+
+    Returns:
+        The index written to index.json
+    """
+    if config is None:
+        deck = db.get_deck(deck_id, include_cards=False)
+        if deck is None:
+            raise ValueError(f"Deck {deck_id} not found")
+        config = deck.config
+
+    card_type = None if cards_type == "all" else cards_type
+    cards = db.iter_cards(deck_id, card_type)
+    return export_images(cards, output_dir, config, **kwargs)
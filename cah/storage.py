@@ -0,0 +1,214 @@
+"""Deck storage backends behind a common interface.
+
+Two backends implement DeckStore: SQLiteDeckStore (the database used by
+the GUI, see db.py) and FileDeckStore (one JSON file per deck in decks/,
+used by the CLI). Both cache deck metadata so listing decks does not load
+every deck's cards.
+
+Deck summaries are dictionaries with at least "key", "name",
+"short_name", "black_count" and "white_count"; "key" is what the other
+methods take to address a deck.
+"""
+
+import json
+import os
+from itertools import chain
+from pathlib import Path
+from typing import Protocol
+
+from . import db
+from . import decks
+from .models import Deck
+
+
+class DeckStore(Protocol):
+    """Storage for whole decks."""
+
+    def list_decks(self) -> list[dict]:
+        """Summaries of all stored decks."""
+        ...
+
+    def get_deck(self, key) -> Deck | None:
+        """Load a deck with its cards, or None if it does not exist."""
+        ...
+
+    def save_deck(self, deck: Deck, key=None):
+        """Store a deck, replacing the one at key if given; returns its key."""
+        ...
+
+    def delete_deck(self, key) -> bool:
+        """Delete a deck; returns False if it did not exist."""
+        ...
+
+
+class SQLiteDeckStore:
+    """Decks stored in the SQLite database, keyed by deck ID.
+
+    The deck list is cached until db.data_version() changes, so writes made
+    anywhere (this store, the db functions or another process) refresh it.
+    """
+
+    def __init__(self):
+        db.ensure_db()
+        self._summaries: list[dict] | None = None
+        self._version = None
+
+    def list_decks(self) -> list[dict]:
+        version = db.data_version()
+        if self._summaries is None or version != self._version:
+            self._summaries = [
+                {"key": row["id"], **row} for row in db.list_decks()
+            ]
+            self._version = version
+        return [dict(summary) for summary in self._summaries]
+
+    def get_deck(self, key: int) -> Deck | None:
+        return db.get_deck(key)
+
+    def save_deck(self, deck: Deck, key: int | None = None) -> int:
+        config = deck.config
+        cards = chain(deck.black_cards, deck.white_cards)
+
+        # One transaction for the deck row and its cards
+        with db.db_cursor():
+            if key is None:
+                key = db.create_deck(config.name, config.short_name,
+                                     config.black_logo_path, config.white_logo_path)
+                db.bulk_add_cards(key, cards)
+            else:
+                db.update_deck(key, config.name, config.short_name,
+                               config.black_logo_path, config.white_logo_path)
+                db.replace_cards(key, cards)
+        return key
+
+    def delete_deck(self, key: int) -> bool:
+        if db.get_deck(key, include_cards=False) is None:
+            return False
+        db.delete_deck(key)
+        return True
+
+
+class FileDeckStore:
+    """Decks stored as JSON files, keyed by file name.
+
+    Summaries are kept in an index file in the deck directory, keyed by
+    the mtime and size of each deck file and its journal (see decks.py).
+    Only decks that are new or changed since they were indexed are read,
+    so listing decks in a new process costs a stat() per file rather than
+    a full parse. Reading one stops at the card counts of its header
+    where the file has them.
+    """
+
+    INDEX_NAME = ".index.json"
+
+    def __init__(self, directory: Path | None = None):
+        self.directory = Path(directory) if directory else decks.DECKS_DIR
+        self._index: dict[str, dict] | None = None
+
+    @property
+    def index_path(self) -> Path:
+        return self.directory / self.INDEX_NAME
+
+    def _load_index(self) -> dict[str, dict]:
+        if self._index is None:
+            try:
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    self._index = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                self._index = {}
+        return self._index
+
+    def _write_index(self):
+        # Write-then-rename so a concurrent reader never sees half a file
+        tmp_path = self.index_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._index, f, ensure_ascii=False)
+        os.replace(tmp_path, self.index_path)
+
+    @staticmethod
+    def _stamp(path: Path) -> dict:
+        stat = path.stat()
+        try:
+            journal = decks.journal_path(path).stat()
+            journal_stamp = [journal.st_mtime_ns, journal.st_size]
+        except FileNotFoundError:
+            journal_stamp = None
+        return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "journal": journal_stamp}
+
+    @classmethod
+    def _entry(cls, path: Path, config: dict, black_count: int, white_count: int) -> dict:
+        return {
+            **cls._stamp(path),
+            "name": config.get("name", "Unnamed"),
+            "short_name": config.get("short_name", "???"),
+            "black_count": black_count,
+            "white_count": white_count
+        }
+
+    def _summary(self, filename: str, entry: dict) -> dict:
+        return {
+            "key": filename,
+            "filename": filename,
+            "path": self.directory / filename,
+            "name": entry["name"],
+            "short_name": entry["short_name"],
+            "black_count": entry["black_count"],
+            "white_count": entry["white_count"]
+        }
+
+    def list_decks(self) -> list[dict]:
+        self.directory.mkdir(exist_ok=True)
+        index = self._load_index()
+        changed = False
+        summaries = []
+        seen = set()
+
+        for deck_file in self.directory.glob("*.json"):
+            if deck_file.name == self.INDEX_NAME:
+                continue
+            seen.add(deck_file.name)
+            stamp = self._stamp(deck_file)
+            entry = index.get(deck_file.name)
+
+            if entry is None or any(entry.get(key) != value for key, value in stamp.items()):
+                try:
+                    summary = decks.read_deck_summary(deck_file)
+                    entry = self._entry(deck_file, summary["config"],
+                                        summary["black_count"], summary["white_count"])
+                except (json.JSONDecodeError, KeyError, AttributeError, TypeError):
+                    continue
+                index[deck_file.name] = entry
+                changed = True
+
+            summaries.append(self._summary(deck_file.name, entry))
+
+        for filename in set(index) - seen:
+            del index[filename]
+            changed = True
+
+        if changed:
+            self._write_index()
+        return summaries
+
+    def get_deck(self, key: str) -> Deck | None:
+        try:
+            return decks.load_deck(key, self.directory)
+        except FileNotFoundError:
+            return None
+
+    def save_deck(self, deck: Deck, key: str | None = None) -> str:
+        path = decks.save_deck(deck, key, self.directory)
+
+        # Index the deck we just wrote instead of parsing it back
+        index = self._load_index()
+        index[path.name] = self._entry(path, deck.config.to_dict(),
+                                       len(deck.black_cards), len(deck.white_cards))
+        self._write_index()
+        return path.name
+
+    def delete_deck(self, key: str) -> bool:
+        deleted = decks.delete_deck(key, self.directory)
+        index = self._load_index()
+        if index.pop(decks.deck_filename(key), None) is not None:
+            self._write_index()
+        return deleted
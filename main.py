@@ -10,13 +10,14 @@ def main():
 
 
 def cli():
-    """CLI entry point."""
-    from cah.cli import menu
-    menu()
+    """CLI entry point (interactive menu, or a batch subcommand)."""
+    from cah.cli import main as cli_main
+    cli_main()
 
 
 if __name__ == "__main__":
     if "--cli" in sys.argv:
+        sys.argv.remove("--cli")
         cli()
     else:
         main()
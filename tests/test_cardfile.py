@@ -0,0 +1,49 @@
+"""Truncated card files fail with JSONDecodeError, not IndexError."""
+
+import json
+
+import pytest
+
+from cah import cardfile
+from cah.storage import FileDeckStore
+
+DECK = json.dumps({
+    "config": {"name": "Test", "short_name": "TEST"},
+    "counts": {"black": 1, "white": 2},
+    "black_cards": [{"text": "Why _?", "pick": 1}],
+    "white_cards": [{"text": "A"}, {"text": "B"}]
+})
+
+
+@pytest.mark.parametrize("cut", range(len(DECK)))
+def test_truncated_file(tmp_path, cut):
+    path = tmp_path / "deck.json"
+    path.write_text(DECK[:cut], encoding="utf-8")
+
+    with pytest.raises(json.JSONDecodeError):
+        list(cardfile.read_cards(path))
+    with pytest.raises(json.JSONDecodeError):
+        cardfile.read_deck(path)
+
+
+@pytest.mark.parametrize("text", [
+    '{"config": {}, "black_cards": [',
+    '{"config": {}, "black_cards": [{"text": "Why _?"},',
+    '{"config": {}, "black_cards": [], "white_cards": ["A", '
+])
+def test_unterminated_card_list(tmp_path, text):
+    path = tmp_path / "deck.json"
+    path.write_text(text, encoding="utf-8")
+
+    with pytest.raises(json.JSONDecodeError, match="Unterminated array"):
+        cardfile.read_header(path)
+
+
+def test_list_decks_skips_truncated_file(tmp_path):
+    (tmp_path / "good.json").write_text(DECK, encoding="utf-8")
+    (tmp_path / "bad.json").write_text('{"config": {}, "black_cards": [', encoding="utf-8")
+
+    summaries = FileDeckStore(tmp_path).list_decks()
+
+    assert [s["filename"] for s in summaries] == ["good.json"]
+    assert (summaries[0]["black_count"], summaries[0]["white_count"]) == (1, 2)
@@ -0,0 +1,77 @@
+"""Duplicated decks keep their cards, IDs and order when their parent goes away."""
+
+import pytest
+
+from cah import db
+from cah.models import Card, CardType
+
+
+@pytest.fixture(autouse=True)
+def database(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, "DB_PATH", tmp_path / "cards.db")
+    db.init_db()
+    yield
+    db.close_pool()
+
+
+def cards_of(deck_id):
+    return [(card.id, card.text) for card in db.get_cards_page(deck_id, "white", limit=100)]
+
+
+def make_deck(name, count):
+    deck_id = db.create_deck(name, "TEST")
+    db.bulk_add_cards(deck_id, [Card(f"{name} {i}", CardType.WHITE) for i in range(count)])
+    return deck_id
+
+
+def edit_duplicate(deck_id):
+    """Edit, delete and add a card in a duplicated deck."""
+    first, second = cards_of(deck_id)[:2]
+    db.update_card(first[0], "edited in the duplicate", deck_id=deck_id)
+    db.delete_card(second[0], deck_id=deck_id)
+    db.add_card(deck_id, "new in the duplicate", CardType.WHITE)
+
+
+@pytest.mark.parametrize("remove", ["delete", "replace"])
+def test_duplicates_keep_ids_and_order(remove):
+    parent = make_deck("parent", 5)
+    first = db.duplicate_deck(parent, "first")
+    second = db.duplicate_deck(parent, "second")
+    edit_duplicate(first)
+    edit_duplicate(second)
+    db.update_card(cards_of(parent)[2][0], "edited in the parent")
+    db.add_card(parent, "new in the parent", CardType.WHITE)
+    expected = {deck_id: cards_of(deck_id) for deck_id in (first, second)}
+
+    if remove == "delete":
+        db.delete_deck(parent)
+    else:
+        db.replace_cards(parent, [Card("replacement", CardType.WHITE)])
+
+    assert cards_of(first) == expected[first]
+    assert [text for _, text in cards_of(second)] == [text for _, text in expected[second]]
+    assert db.get_deck(first, include_cards=False) is not None
+    assert db.verify_deck_stats() == []
+
+
+def test_duplicate_of_a_duplicate_keeps_inheriting():
+    root = make_deck("root", 4)
+    middle = db.duplicate_deck(root, "middle")
+    edit_duplicate(middle)
+    child = db.duplicate_deck(middle, "child")
+    edit_duplicate(child)
+    grandchild = db.duplicate_deck(child, "grandchild")
+    expected = {deck_id: cards_of(deck_id) for deck_id in (child, grandchild)}
+
+    db.delete_deck(middle)
+
+    assert {deck_id: cards_of(deck_id) for deck_id in (child, grandchild)} == expected
+    assert [deck["parent_id"] for deck in db.list_decks() if deck["id"] == child] == [root]
+
+    # The root's later edits stay out of the duplicate, its own edits stay in
+    root_card = next(card_id for card_id, text in expected[child] if text.startswith("root"))
+    db.update_card(root_card, "edited in the root")
+    db.update_card(expected[child][0][0], "edited again", deck_id=child)
+    assert cards_of(child) == [(expected[child][0][0], "edited again"), *expected[child][1:]]
+    assert cards_of(grandchild) == expected[grandchild]
+    assert db.verify_deck_stats() == []